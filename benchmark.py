@@ -1,11 +1,14 @@
-from pylexique import Lexique383
-from time import time
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
 
-lexicon = Lexique383()
+"""
+Quick benchmark of pylexique on the shipped lexicon, emitting JSON results.
+Extra arguments are forwarded to ``python -m benchmarks.suite run``, e.g. ``python benchmark.py -o results.json``.
+"""
 
-var_1 = lexicon.lexique['abaissait']
-var_1_bis = lexicon.get_lex('abaissait')
-var_1_ter = lexicon.get_anagrams('abaisse')
-var_1_quart = lexicon.get_anagrams('abaisser')
+import sys
 
-print('OK')
+from benchmarks.suite import main
+
+if __name__ == "__main__":
+    sys.exit(main(['run', '--scales', '1', '--repeat', '1'] + sys.argv[1:]))
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Replays a Zipf-distributed query stream against Lexique383 with and without a query cache."""
+
+import argparse
+import random
+from time import perf_counter
+from typing import List, Optional
+
+from pylexique import Lexique383, QueryCache
+
+
+def zipf_stream(words: List[str], length: int, exponent: float = 1.1, seed: int = 0) -> List[str]:
+    """
+    Draws a stream of queries whose word ranks follow a Zipf law.
+
+    :param words:
+        Vocabulary to draw from, the first word being the most frequent.
+    :param length:
+        Number of queries in the stream.
+    :param exponent:
+        Exponent of the Zipf law.
+    :param seed:
+        Seed of the random generator.
+    :return:
+        List of words.
+    """
+    rng = random.Random(seed)
+    weights = [1 / rank ** exponent for rank in range(1, len(words) + 1)]
+    return rng.choices(words, weights=weights, k=length)
+
+
+def replay(lexicon: Lexique383, stream: List[str]) -> float:
+    t0 = perf_counter()
+    for word in stream:
+        lexicon.get_all_forms(word)
+        lexicon.get_anagrams(word)
+    return perf_counter() - t0
+
+
+def main(lexique_path: Optional[str] = None, length: int = 200000, maxsize: int = 4096) -> None:
+    lexicon = Lexique383(lexique_path)
+    words = list(lexicon.lexique)
+    random.Random(1).shuffle(words)
+    stream = zipf_stream(words, length)
+    print(f'Replaying {length} queries (get_all_forms + get_anagrams) over {len(words)} words')
+    baseline = replay(lexicon, stream)
+    print(f'{"no cache":>12}: {baseline:.3f}s')
+    for policy in ('lru', 'lfu'):
+        lexicon.cache = QueryCache(maxsize=maxsize, policy=policy)
+        elapsed = replay(lexicon, stream)
+        info = lexicon.cache_info()
+        print(f'{policy:>12}: {elapsed:.3f}s  speedup x{baseline / elapsed:.2f}  hit rate {info.hit_rate:.1%}'
+              f'  evictions {info.evictions}  cached bytes {info.currbytes}')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--lexique-path', default=None)
+    parser.add_argument('--length', type=int, default=200000)
+    parser.add_argument('--maxsize', type=int, default=4096)
+    args = parser.parse_args()
+    main(args.lexique_path, args.length, args.maxsize)
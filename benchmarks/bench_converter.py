@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Microbenchmark of the row converter against the per-field implementation it replaced.
+Both converters are run on the same rows and their outputs and error reports are checked to be identical.
+"""
+
+import argparse
+from collections import defaultdict
+from math import isnan
+from time import perf_counter
+from typing import Any, List, Optional, Sequence
+from typing import get_type_hints
+
+from pylexique.converters import RowConverter
+from pylexique.pylexique import LEXIQUE383_FIELD_NAMES, LexEntryTypes, _default_lexique_path
+from pylexique.validation import ValidationReport
+
+
+def legacy_convert_entries(row_fields: Sequence[Any], report: ValidationReport) -> List[Any]:
+    """
+    The per-field converter of pylexique 1.5.1, reporting to a ValidationReport.
+
+    """
+    errors = defaultdict(list)
+    converted_row_fields = []
+    for attr, value in zip(LEXIQUE383_FIELD_NAMES, row_fields):
+        if isinstance(value, float) and isnan(value):
+            value = ''
+        if attr in {'freqlemfilms2', 'freqlemlivres', 'freqfilms2', 'freqlivres', 'old20', 'pld20'}:
+            if not isinstance(value, float):
+                if (value != '' or value != ' ') and ',' in value:
+                    value = value.replace(',', '.')
+                    value = float(value)
+        if attr == 'islem':
+            if isinstance(value, str):
+                value = value.strip()
+            if value != '' and value not in ('0', '1', 0, 1):
+                value = 0
+            try:
+                value = bool(int(value))
+            except ValueError:
+                errors[row_fields[0]].append({attr: value})
+                report.record_value_error(row_fields[0], attr, value)
+        if attr in {'nbhomogr', 'nbhomoph', 'nblettres', 'nbphons',
+                    'voisorth', 'voisphon', 'puorth', 'puphon', 'nbsyll'}:
+            if value != '' or value != ' ':
+                try:
+                    value = int(value)
+                except ValueError:
+                    errors[row_fields[0]].append({attr: value})
+                    report.record_value_error(row_fields[0], attr, value)
+        converted_row_fields.append(value)
+    if len(converted_row_fields) != 35:
+        report.record_length_error(row_fields)
+        raise ValueError
+    return converted_row_fields
+
+
+def convert_rows(convert: Any, rows: List[List[str]]) -> List[Optional[List[Any]]]:
+    converted: List[Optional[List[Any]]] = []
+    for row in rows:
+        try:
+            converted.append(convert(row))
+        except ValueError:
+            converted.append(None)
+    return converted
+
+
+def main(lexique_path: Optional[str] = None, repeat: int = 3) -> None:
+    with open(lexique_path or _default_lexique_path(), 'r', encoding='iso-8859-1') as csv_file:
+        rows = [row.strip().split('\t') for row in csv_file.readlines()[1:]]
+
+    legacy_report = ValidationReport('collect')
+    legacy = convert_rows(lambda row: legacy_convert_entries(row, legacy_report), rows)
+    report = ValidationReport('collect')
+    converter = RowConverter(get_type_hints(LexEntryTypes), report)
+    planned = convert_rows(converter.convert, rows)
+    assert planned == legacy, 'The converters disagree'
+    assert report.to_dict() == legacy_report.to_dict(), 'The error reports disagree'
+    print(f'Identical output and error reports on {len(rows)} rows '
+          f'({report.value_error_count} value errors, {report.length_error_count} length errors)')
+
+    for name, make_convert in (('legacy _convert_entries', lambda: lambda row: legacy_convert_entries(
+            row, ValidationReport('collect'))), ('RowConverter', lambda: RowConverter(
+            get_type_hints(LexEntryTypes), ValidationReport('collect')).convert)):
+        best = float('inf')
+        for _ in range(repeat):
+            convert = make_convert()
+            t0 = perf_counter()
+            convert_rows(convert, rows)
+            best = min(best, perf_counter() - t0)
+        print(f'{name:>24}: {best:.3f}s  {len(rows) / best:,.0f} rows/s')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--lexique-path', default=None)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    main(args.lexique_path, args.repeat)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Compares the size, load time and I/O volume of the lexicon stored in the supported source formats."""
+
+import argparse
+import bz2
+import gzip
+import lzma
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Callable, Dict, Optional
+
+from pylexique.pylexique import _default_lexique_path
+
+_LOAD_SCRIPT = """
+import sys
+from time import perf_counter
+
+
+def read_bytes():
+    # Bytes read by the process, on Linux only.
+    try:
+        with open('/proc/self/io') as file:
+            return int(next(line for line in file if line.startswith('rchar')).split()[1])
+    except OSError:
+        return -1
+
+
+before = read_bytes()
+t0 = perf_counter()
+from pylexique import Lexique383
+lexicon = Lexique383(sys.argv[1], parser_type=sys.argv[2])
+print(perf_counter() - t0, read_bytes() - before, len(lexicon.lexique))
+"""
+
+
+def _compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    compressors = {
+        'gzip': gzip.compress,
+        'bz2': bz2.compress,
+        'xz': lzma.compress,
+    }  # type: Dict[str, Callable[[bytes], bytes]]
+    try:
+        from compression import zstd  # type: ignore[import-not-found]
+        compressors['zstd'] = zstd.compress
+    except ImportError:
+        try:
+            import zstandard
+            compressors['zstd'] = zstandard.ZstdCompressor().compress
+        except ImportError:
+            print('zstd skipped: neither compression.zstd nor zstandard is available')
+    return compressors
+
+
+def main(lexique_path: Optional[str] = None, parser_type: str = 'csv', repeat: int = 3) -> None:
+    with open(lexique_path or _default_lexique_path(), 'rb') as file:
+        raw = file.read()
+    utf8 = raw.decode('iso-8859-1').encode('utf-8')
+    sources = {'iso-8859-1': raw, 'utf-8': utf8}
+    for name, compress in _compressors().items():
+        sources[name] = compress(raw)
+        sources[f'{name} utf-8'] = compress(utf8)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get('PYTHONPATH')])))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, content in sources.items():
+            path = os.path.join(tmp_dir, name.replace(' ', '_'))
+            with open(path, 'wb') as file:
+                file.write(content)
+            runs = []
+            for _ in range(repeat):
+                output = subprocess.run([sys.executable, '-c', _LOAD_SCRIPT, path, parser_type], env=env,
+                                        check=True, capture_output=True, text=True).stdout.split()
+                runs.append((float(output[0]), int(output[1]), int(output[2])))
+            seconds, read, rows = min(runs)
+            print(f'{name:>12}: {len(content) / 2 ** 20:7.2f}MiB on disk, {read / 2 ** 20:7.2f}MiB read,'
+                  f' loaded {rows} words in {seconds:.2f}s')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--lexique-path', default=None)
+    parser.add_argument('--parser-type', default='csv', choices=['csv', 'pandas_csv'])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    main(args.lexique_path, args.parser_type, args.repeat)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Measures the import time of pylexique with ``python -X importtime`` in fresh interpreters,
+and fails when it exceeds a budget or imports a module which should only be loaded on demand.
+
+Run it with ``python -m benchmarks.bench_import --max-ms 100``.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from functools import lru_cache
+from statistics import median
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import pylexique
+
+STATEMENTS = ('import pylexique', 'from pylexique import Lexique383')
+#: Modules which must not be imported until a feature needing them is used.
+FORBIDDEN_MODULES = ('pandas', 'numpy', 'pkg_resources')
+
+
+def _importtime(statement: str) -> List[Tuple[str, float, bool]]:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.path.dirname(os.path.dirname(
+        pylexique.__file__)), os.environ.get('PYTHONPATH')])))
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], env=env, check=True,
+                            capture_output=True, text=True).stderr
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # The modules imported directly by the statement are not indented.
+        imports.append((name.strip(), int(cumulative) / 1e6, not name[1:].startswith(' ')))
+    return imports
+
+
+@lru_cache(maxsize=None)
+def _startup_modules() -> FrozenSet[str]:
+    # Modules imported by the interpreter itself, before the statement runs.
+    return frozenset(name for name, _, _ in _importtime('pass'))
+
+
+def measure_import(statement: str = 'import pylexique') -> Dict[str, Any]:
+    """
+    Runs an import statement in a fresh interpreter with ``-X importtime``.
+
+    :param statement:
+        Python statement to run.
+    :return:
+        Total import time in seconds, cumulative import time of each module in seconds, and imported modules.
+        The modules imported at the startup of the interpreter are left out.
+    """
+    startup = _startup_modules()
+    modules: Dict[str, float] = {}
+    total = 0.0
+    for name, seconds, top_level in _importtime(statement):
+        if name in startup:
+            continue
+        modules[name] = seconds
+        if top_level:
+            total += seconds
+    return {'seconds': total, 'modules': modules}
+
+
+def bench_import(repeat: int, statements: Sequence[str] = STATEMENTS) -> List[Dict[str, Any]]:
+    """
+    Measures the import statements, in the result format of benchmarks.suite.
+
+    """
+    results = []
+    for statement in statements:
+        samples = [measure_import(statement)['seconds'] for _ in range(repeat)]
+        results.append({'name': 'import', 'params': {'statement': statement}, 'unit': 's', 'value': median(samples),
+                        'samples': len(samples), 'stats': {'min': min(samples), 'median': median(samples),
+                                                           'mean': sum(samples) / len(samples),
+                                                           'max': max(samples)}})
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, default=None, help='Import time budget of each statement.')
+    parser.add_argument('--forbid', default=','.join(FORBIDDEN_MODULES),
+                        help='Comma separated modules which must not be imported.')
+    args = parser.parse_args(argv)
+    forbidden = [module for module in args.forbid.split(',') if module]
+    failures = []
+    for statement in STATEMENTS:
+        measures = [measure_import(statement) for _ in range(args.repeat)]
+        seconds = median(measure['seconds'] for measure in measures)
+        slowest = sorted(measures[0]['modules'].items(), key=lambda item: item[1], reverse=True)[:5]
+        print(f'{statement!r}: {seconds * 1000:.1f}ms (median of {args.repeat})')
+        for module, module_seconds in slowest:
+            print(f'    {module:<40} {module_seconds * 1000:8.1f}ms')
+        if args.max_ms is not None and seconds * 1000 > args.max_ms:
+            failures.append(f'{statement!r} takes {seconds * 1000:.1f}ms, over the budget of {args.max_ms}ms')
+        imported = [module for module in forbidden if module in measures[0]['modules']]
+        if imported:
+            failures.append(f'{statement!r} imports {", ".join(imported)}')
+    for failure in failures:
+        print(f'FAILED: {failure}')
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Compares the size, load time, lookup time and false positive rate of the membership filters of the lexicon."""
+
+import argparse
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+from time import perf_counter
+from typing import Optional
+
+from pylexique import Lexique383
+from pylexique.membership import load_filter
+
+_COLD_SCRIPT = """
+import sys
+from time import perf_counter
+t0 = perf_counter()
+from pylexique.membership import load_filter
+words = load_filter(sys.argv[1])
+found = 'manger' in words
+print(perf_counter() - t0)
+"""
+
+
+def main(lexique_path: Optional[str] = None, lookups: int = 100000) -> None:
+    t0 = perf_counter()
+    lexicon = Lexique383(lexique_path)
+    print(f'Lexique383 loaded in {perf_counter() - t0:.2f}s')
+    words = list(lexicon.lexique)
+    rng = random.Random(0)
+    queries = [rng.choice(words) for _ in range(lookups)]
+    others = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10))) for _ in range(lookups)]
+    others = [other for other in others if other not in lexicon.lexique]
+
+    t0 = perf_counter()
+    for word in queries:
+        word in lexicon.lexique
+    print(f'{"dict":>22}: lookup {(perf_counter() - t0) / lookups * 1e9:.0f}ns')
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get('PYTHONPATH')])))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, kwargs in (('perfect_hash', {}), ('perfect_hash (8 bits)', {'fingerprint_bits': 8}),
+                             ('bloom (1%)', {'kind': 'bloom'}),
+                             ('bloom (0.1%)', {'kind': 'bloom', 'false_positive_rate': 0.001})):
+            t0 = perf_counter()
+            words_filter = lexicon.to_membership_filter(**kwargs)  # type: ignore[arg-type]
+            build = perf_counter() - t0
+            path = os.path.join(tmp_dir, 'words.bin')
+            words_filter.save(path)
+            t0 = perf_counter()
+            words_filter = load_filter(path)
+            load = perf_counter() - t0
+            cold = float(subprocess.run([sys.executable, '-c', _COLD_SCRIPT, path], env=env, check=True,
+                                        capture_output=True, text=True).stdout)
+            t0 = perf_counter()
+            for word in queries:
+                word in words_filter
+            lookup = (perf_counter() - t0) / lookups
+            false_positives = sum(other in words_filter for other in others) / len(others)
+            print(f'{name:>22}: {os.path.getsize(path) / len(words):.2f} bytes/key, build {build:.2f}s,'
+                  f' load {load * 1000:.2f}ms, import + load + lookup {cold * 1000:.1f}ms,'
+                  f' lookup {lookup * 1e9:.0f}ns, false positives {false_positives:.4%}')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--lexique-path', default=None)
+    parser.add_argument('--lookups', type=int, default=100000)
+    args = parser.parse_args()
+    main(args.lexique_path, args.lookups)
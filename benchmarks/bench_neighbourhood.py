@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Times the neighbourhood metrics of a batch of words and pseudowords, and checks them against the fields of Lexique383.
+"""
+
+import argparse
+import math
+import random
+from time import perf_counter
+from typing import List, Optional
+
+from pylexique import Lexique383
+
+
+def pseudowords(words: List[str], count: int, seed: int = 0) -> List[str]:
+    """
+    Makes strings which are mostly not words by substituting one letter of random words by another one.
+
+    :param words:
+        Words to alter.
+    :param count:
+        Number of strings.
+    :param seed:
+        Seed of the random generator.
+    :return:
+        List of strings.
+    """
+    rng = random.Random(seed)
+    letters = sorted(set(''.join(words)))
+    strings = []
+    for word in rng.choices(words, k=count):
+        position = rng.randrange(len(word))
+        strings.append(word[:position] + rng.choice(letters) + word[position + 1:])
+    return strings
+
+
+def main(lexique_path: Optional[str] = None, count: int = 10000, processes: Optional[int] = None) -> None:
+    lexicon = Lexique383(lexique_path)
+    items = [item for item in lexicon._iter_items() if item.ortho and item.phon]
+    sample = random.Random(1).sample(items, min(count, len(items)))
+    t0 = perf_counter()
+    lexicon.neighbourhood('ortho'), lexicon.neighbourhood('phon')
+    print(f'Indexes of {len(lexicon.neighbourhood("ortho"))} orthographic and {len(lexicon.neighbourhood("phon"))}'
+          f' phonological forms built in {perf_counter() - t0:.2f}s')
+
+    t0 = perf_counter()
+    metrics = lexicon.get_neighbourhood_metrics([item.ortho for item in sample], [item.phon for item in sample],
+                                                processes=processes)
+    elapsed = perf_counter() - t0
+    print(f'{len(sample)} words: {elapsed:.2f}s ({elapsed / len(sample) * 1000:.2f}ms per word, orthographic'
+          f' and phonological metrics)')
+    for field in ('old20', 'pld20', 'voisorth', 'voisphon'):
+        pairs = [(getattr(item, field), metric[field]) for item, metric in zip(sample, metrics)
+                 if isinstance(getattr(item, field), (int, float)) and not math.isnan(metric[field])]
+        agreeing = sum(abs(expected - value) < 0.005 for expected, value in pairs)
+        print(f'{field:>9}: {agreeing}/{len(pairs)} equal to the field of Lexique383')
+
+    strings = pseudowords([item.ortho for item in sample], len(sample))
+    t0 = perf_counter()
+    lexicon.get_neighbourhood_metrics(strings, processes=processes)
+    elapsed = perf_counter() - t0
+    print(f'{len(strings)} pseudowords: {elapsed:.2f}s ({elapsed / len(strings) * 1000:.2f}ms per string,'
+          f' orthographic metrics)')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--lexique-path', default=None)
+    parser.add_argument('--count', type=int, default=10000)
+    parser.add_argument('--processes', type=int, default=None)
+    args = parser.parse_args()
+    main(args.lexique_path, args.count, args.processes)
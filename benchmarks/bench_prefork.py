@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Measures the private and shared memory of workers forked after Lexique383 is loaded,
+as in a pre-forking server, with and without Lexique383(prefork=True). Linux only.
+
+Run it with ``python -m benchmarks.bench_prefork --workers 4 --lookups 200000``.
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from pylexique import Lexique383
+from pylexique.prefork import memory_usage
+
+MODES = ('default', 'prefork')
+
+
+def worker(lexicon: Lexique383, words: List[str], lookups: int, seed: int) -> Dict[str, Any]:
+    """
+    Runs random lookups and a full garbage collection, like a worker serving requests, and reports its memory.
+
+    :param lexicon:
+        Lexicon inherited from the parent process.
+    :param words:
+        Words to look up.
+    :param lookups:
+        Number of lookups.
+    :param seed:
+        Seed of the random generator.
+    :return:
+        Memory usage of the worker before and after the lookups, in bytes.
+    """
+    before = memory_usage()
+    rng = random.Random(seed)
+    t0 = perf_counter()
+    for word in rng.choices(words, k=lookups):
+        lexicon.get_lex(word)
+        lexicon.get_all_forms(word)
+        lexicon.get_anagrams(word)
+    elapsed = perf_counter() - t0
+    gc.collect()
+    return {'before': before, 'after': memory_usage(), 'seconds': elapsed}
+
+
+def fork_workers(lexicon: Lexique383, workers: int, lookups: int) -> List[Dict[str, Any]]:
+    """
+    Forks workers running lookups on the lexicon and collects their reports.
+
+    :param lexicon:
+        Loaded lexicon, shared with the workers.
+    :param workers:
+        Number of workers.
+    :param lookups:
+        Number of lookups per worker.
+    :return:
+        List of the reports of the workers.
+    """
+    words = list(lexicon.lexique)
+    pipes = []
+    for seed in range(workers):
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            os.close(read_end)
+            try:
+                report = json.dumps(worker(lexicon, words, lookups, seed)).encode()
+                with os.fdopen(write_end, 'wb') as pipe:
+                    pipe.write(report)
+            finally:
+                os._exit(0)
+        os.close(write_end)
+        pipes.append((pid, read_end))
+    reports = []
+    for pid, read_end in pipes:
+        with os.fdopen(read_end, 'rb') as pipe:
+            reports.append(json.loads(pipe.read()))
+        os.waitpid(pid, 0)
+    return reports
+
+
+def run_mode(lexique_path: Optional[str], mode: str, workers: int, lookups: int) -> Dict[str, Any]:
+    """
+    Loads the lexicon in a fresh process, since freezing the heap cannot be undone, then forks the workers from it.
+
+    :return:
+        Memory of the parent after the load and reports of the workers.
+    """
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        os.close(read_end)
+        try:
+            t0 = perf_counter()
+            lexicon = Lexique383(lexique_path, prefork=mode == 'prefork')
+            result = {'load_seconds': perf_counter() - t0, 'parent': memory_usage(),
+                      'workers': fork_workers(lexicon, workers, lookups)}
+            with os.fdopen(write_end, 'wb') as pipe:
+                pipe.write(json.dumps(result).encode())
+        finally:
+            os._exit(0)
+    os.close(write_end)
+    with os.fdopen(read_end, 'rb') as pipe:
+        result = json.loads(pipe.read())
+    os.waitpid(pid, 0)
+    return result  # type: ignore[no-any-return]
+
+
+def main(lexique_path: Optional[str] = None, workers: int = 4, lookups: int = 100000) -> None:
+    mb = 1024 * 1024
+    print(f'{workers} workers, {lookups} lookups each')
+    for mode in MODES:
+        result = run_mode(lexique_path, mode, workers, lookups)
+        reports = result['workers']
+        print(f'{mode:>8}: load {result["load_seconds"]:.2f}s, parent RSS {result["parent"]["rss"] / mb:.0f}MB')
+        for moment in ('before', 'after'):
+            private = sum(report[moment]['private'] for report in reports) / len(reports) / mb
+            shared = sum(report[moment]['shared'] for report in reports) / len(reports) / mb
+            pss = sum(report[moment]['pss'] for report in reports) / mb
+            print(f'{moment:>16}: private {private:.0f}MB  shared {shared:.0f}MB per worker, '
+                  f'total PSS {pss:.0f}MB')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--lexique-path', default=None)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--lookups', type=int, default=100000)
+    args = parser.parse_args()
+    main(args.lexique_path, args.workers, args.lookups)
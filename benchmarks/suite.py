@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark suite covering the import, load, lookup and query hot paths of pylexique.
+
+Run it with ``python -m benchmarks.suite run -o results.json`` and compare two runs with
+``python -m benchmarks.suite compare baseline.json results.json``.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from statistics import mean, median
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import pylexique
+from pylexique import Lexique383
+
+from .bench_import import bench_import
+from .synthetic import make_synthetic_lexique
+
+PARSERS = ('csv', 'pandas_csv')
+# Logged by Lexique383 when a parser fails and the file is parsed again with the csv parser.
+_FALLBACK_MESSAGE = 'Trying again with built-in csv parser'
+
+_COLD_LOAD_SCRIPT = """
+import json, resource, sys
+from time import perf_counter
+t0 = perf_counter()
+from pylexique import Lexique383
+lexicon = Lexique383(sys.argv[1], parser_type=sys.argv[2])
+elapsed = perf_counter() - t0
+maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({'seconds': elapsed, 'maxrss': maxrss, 'entries': len(lexicon)}))
+"""
+
+
+def _summary(samples: Sequence[float]) -> Dict[str, float]:
+    return {'min': min(samples), 'median': median(samples), 'mean': mean(samples), 'max': max(samples)}
+
+
+def _result(name: str, params: Dict[str, Any], unit: str, samples: Sequence[float]) -> Dict[str, Any]:
+    return {'name': name, 'params': params, 'unit': unit, 'value': median(samples), 'samples': len(samples),
+            'stats': _summary(samples)}
+
+
+def _time_per_op(func: Callable[[], Any], number: int, repeat: int) -> List[float]:
+    """
+    Times `number` calls of `func`, `repeat` times, and returns the mean duration of one call for each repetition.
+
+    """
+    samples = []
+    for _ in range(repeat):
+        t0 = perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((perf_counter() - t0) / number)
+    return samples
+
+
+def _maxrss_bytes(maxrss: int) -> int:
+    # ru_maxrss is expressed in bytes on macOS and in kilobytes everywhere else.
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+def _check_fallback(messages: str, parser_type: str) -> None:
+    if _FALLBACK_MESSAGE in messages:
+        raise RuntimeError(f"The {parser_type} parser fell back on the csv parser, so its load time would "
+                           f"measure the csv parser instead.")
+
+
+class _LogCapture(logging.Handler):
+
+    def __init__(self) -> None:
+        super().__init__(logging.WARNING)
+        self.messages: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+@contextmanager
+def _no_fallback(parser_type: str) -> Iterator[None]:
+    """
+    Fails if the lexicons loaded in the block fell back on the csv parser.
+
+    """
+    capture = _LogCapture()
+    logger = logging.getLogger('pylexique.utils')
+    logger.addHandler(capture)
+    try:
+        yield
+    finally:
+        logger.removeHandler(capture)
+    _check_fallback('\n'.join(capture.messages), parser_type)
+
+
+def bench_cold_load(path: str, parser_type: str, scale: int, repeat: int) -> List[Dict[str, Any]]:
+    """
+    Loads the lexicon in fresh interpreters, measuring import + parse time and peak RSS.
+    Fails if the parser falls back on the csv parser.
+
+    """
+    seconds, rss = [], []
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.path.dirname(os.path.dirname(
+        pylexique.__file__)), os.environ.get('PYTHONPATH')])))
+    for _ in range(repeat):
+        process = subprocess.run([sys.executable, '-c', _COLD_LOAD_SCRIPT, path, parser_type], env=env,
+                                 check=True, capture_output=True, text=True)
+        _check_fallback(process.stderr, parser_type)
+        measure = json.loads(process.stdout.strip().splitlines()[-1])
+        seconds.append(measure['seconds'])
+        rss.append(_maxrss_bytes(measure['maxrss']))
+    params = {'parser': parser_type, 'scale': scale}
+    return [_result('load.cold', params, 's', seconds), _result('load.peak_rss', params, 'bytes', rss)]
+
+
+def bench_warm_load(path: str, parser_type: str, scale: int, repeat: int) -> List[Dict[str, Any]]:
+    """
+    Loads the lexicon repeatedly in the current interpreter, with modules imported and the file in the page cache.
+    Fails if the parser falls back on the csv parser.
+
+    """
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        with _no_fallback(parser_type):
+            t0 = perf_counter()
+            Lexique383(path, parser_type=parser_type)
+            samples.append(perf_counter() - t0)
+    return [_result('load.warm', {'parser': parser_type, 'scale': scale}, 's', samples)]
+
+
+def bench_queries(lexicon: Lexique383, scale: int, repeat: int, sample_size: int,
+                  batch_size: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Measures the lookup and derived query methods on a fixed random sample of words.
+
+    """
+    rng = random.Random(seed)
+    keys = [word for word in lexicon.lexique if word == word.lower()]
+    words = rng.sample(keys, min(sample_size, len(keys)))
+    items = []
+    for word in words:
+        entry = lexicon.lexique[word]
+        items.extend(entry if isinstance(entry, list) else [entry])
+    batch = tuple(rng.choice(words) for _ in range(batch_size))
+    params = {'scale': scale, 'sample': len(words)}
+    cycle = iter(())
+
+    def next_word() -> str:
+        nonlocal cycle
+        try:
+            return next(cycle)
+        except StopIteration:
+            cycle = iter(words)
+            return next(cycle)
+
+    results = [
+        _result('get_lex.single', params, 's/op',
+                _time_per_op(lambda: lexicon.get_lex(next_word()), len(words), repeat)),
+        _result('get_lex.batch', dict(params, batch=batch_size), 's/word',
+                [sample / batch_size for sample in _time_per_op(lambda: lexicon.get_lex(batch), 1, repeat)]),
+        _result('get_all_forms', params, 's/op',
+                _time_per_op(lambda: lexicon.get_all_forms(next_word()), len(words), repeat)),
+        _result('get_anagrams', params, 's/op',
+                _time_per_op(lambda: lexicon.get_anagrams(next_word()), len(words), repeat)),
+    ]
+    item_params = {'scale': scale, 'items': len(items)}
+    results.append(_result('to_dict', item_params, 's/item', [
+        sample / len(items) for sample in _time_per_op(lambda: [item.to_dict() for item in items], 1, repeat)]))
+    results.append(_result('to_json', item_params, 's/item', [
+        sample / len(items) for sample in _time_per_op(
+            lambda: json.dumps([item.to_dict() for item in items], ensure_ascii=False), 1, repeat)]))
+    # The columns are extracted by the first aggregation, which is left out.
+    lexicon.aggregate('freqfilms2', by='cgram', stats=('mean', 'median'))
+    rows_params = {'scale': scale, 'rows': len(lexicon.columns)}
+    results.append(_result('aggregate.by_cgram', rows_params, 's/op', _time_per_op(
+        lambda: lexicon.aggregate('freqfilms2', by='cgram', stats=('mean', 'median')), 1, repeat)))
+    results.append(_result('quantiles.deciles', rows_params, 's/op', _time_per_op(
+        lambda: lexicon.quantiles('freqlemfilms2', [i / 10 for i in range(11)], where={'cgram': 'VER'}), 1, repeat)))
+    # The sublexical statistics are computed by the first generation, which is left out.
+    lexicon.generate_pseudowords(1)
+    results.append(_result('generate_pseudowords', {'scale': scale, 'count': 1000}, 's/op', _time_per_op(
+        lambda: lexicon.generate_pseudowords(1000, length=(5, 9), nbsyll=2), 1, repeat)))
+    return results
+
+
+def run(scales: Sequence[int] = (1, 10), parsers: Sequence[str] = PARSERS, repeat: int = 3,
+        sample_size: int = 10000, batch_size: int = 1000, source: Optional[str] = None,
+        work_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Runs the whole suite and returns its results as a JSON-serializable dictionary.
+
+    :param scales:
+        Sizes of the synthetic lexicons, as multiples of the source lexicon.
+    :param parsers:
+        Parsers to benchmark the load with.
+    :param repeat:
+        Number of repetitions of each measure.
+    :param sample_size:
+        Number of words used by the query benchmarks.
+    :param batch_size:
+        Number of words passed to a single get_lex() call for the batch benchmark.
+    :param source:
+        Path to the Lexique38X file to scale. Defaults to the Lexique383 file shipped with pylexique.
+    :param work_dir:
+        Directory where the synthetic lexicons are written. Defaults to a temporary directory.
+    :return:
+        Dictionary with the metadata of the run and the list of results.
+    """
+    results: List[Dict[str, Any]] = bench_import(repeat)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        work_dir = work_dir or tmp_dir
+        for scale in scales:
+            path = make_synthetic_lexique(scale, work_dir, source)
+            for parser_type in parsers:
+                results.extend(bench_cold_load(path, parser_type, scale, repeat))
+                results.extend(bench_warm_load(path, parser_type, scale, repeat))
+            lexicon = Lexique383(path)
+            results.extend(bench_queries(lexicon, scale, repeat, sample_size, batch_size))
+            del lexicon
+            gc.collect()
+    metadata = {
+        'pylexique_version': pylexique.__version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'scales': list(scales),
+        'repeat': repeat,
+    }
+    return {'metadata': metadata, 'results': results}
+
+
+def _key(result: Dict[str, Any]) -> str:
+    params = ','.join('{0}={1}'.format(k, v) for k, v in sorted(result['params'].items()))
+    return '{0}[{1}]'.format(result['name'], params)
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1) -> List[str]:
+    """
+    Compares two runs and returns the keys of the measures that regressed by more than `threshold`.
+
+    """
+    base = {_key(result): result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        key = _key(result)
+        if key not in base:
+            continue
+        ratio = result['value'] / base[key]['value'] if base[key]['value'] else float('inf')
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  REGRESSION'
+            regressions.append(key)
+        elif ratio < 1 - threshold:
+            flag = '  improvement'
+        print('{0:<60} {1:>12.4g} -> {2:>12.4g} {3} (x{4:.2f}){5}'.format(
+            key, base[key]['value'], result['value'], result['unit'], ratio, flag))
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark suite for pylexique.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='Run the benchmarks and emit the results as JSON.')
+    run_parser.add_argument('--scales', default='1,10', help='Comma separated multiples of the source lexicon.')
+    run_parser.add_argument('--parsers', default=','.join(PARSERS))
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--sample-size', type=int, default=10000)
+    run_parser.add_argument('--batch-size', type=int, default=1000)
+    run_parser.add_argument('--source', default=None, help='Lexique38X file to scale.')
+    run_parser.add_argument('--work-dir', default=None, help='Directory where the synthetic lexicons are kept.')
+    run_parser.add_argument('-o', '--output', default=None, help='Path of the JSON results. Defaults to stdout.')
+    compare_parser = commands.add_parser('compare', help='Compare two JSON results.')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        with open(args.current, encoding='utf-8') as file:
+            current = json.load(file)
+        return 1 if compare(baseline, current, args.threshold) else 0
+
+    results = run(scales=[int(scale) for scale in args.scales.split(',')], parsers=args.parsers.split(','),
+                  repeat=args.repeat, sample_size=args.sample_size, batch_size=args.batch_size,
+                  source=args.source, work_dir=args.work_dir)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=4)
+    else:
+        print(json.dumps(results, indent=4))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
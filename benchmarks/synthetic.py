@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+"""Builds synthetic lexicons by scaling up a Lexique38X file."""
+
+import os
+from typing import Optional
+
+from pylexique.pylexique import _default_lexique_path
+
+
+def make_synthetic_lexique(scale: int, dest_dir: str, source: Optional[str] = None) -> str:
+    """
+    | Writes a lexicon holding `scale` copies of the rows of `source`.
+    | Every copy after the first one gets its ortho and lemme suffixed with the copy number,
+    | so that the lookup tables grow linearly instead of piling up homographs.
+
+    :param scale:
+        Number of copies of the source rows.
+    :param dest_dir:
+        Directory where the synthetic lexicon is written.
+    :param source:
+        Path to the Lexique38X file to scale. Defaults to the Lexique383 file shipped with pylexique.
+    :return:
+        Path to the synthetic lexicon.
+    """
+    if scale < 1:
+        raise ValueError(f"Argument 'scale' must be a positive integer, not {scale}")
+    source = source or _default_lexique_path()
+    dest = os.path.join(dest_dir, 'Lexique383_x{0}.txt'.format(scale))
+    if os.path.isfile(dest):
+        return dest
+    with open(source, 'r', encoding='iso-8859-1') as src:
+        header = src.readline()
+        rows = [line.rstrip('\n').split('\t') for line in src]
+    with open(dest, 'w', encoding='iso-8859-1') as out:
+        out.write(header)
+        for copy in range(scale):
+            for fields in rows:
+                if copy and len(fields) > 2:
+                    fields = [fields[0] + str(copy), fields[1], fields[2] + str(copy)] + fields[3:]
+                out.write('\t'.join(fields))
+                out.write('\n')
+    return dest
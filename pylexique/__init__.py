@@ -11,11 +11,56 @@ __license__ = "MIT"
 __maintainer__ = "SekouDiaoNlp"
 __status__ = "Production"
 
-__all__ = ['Lexique383', 'LexItem', 'LexEntryTypes']
+__all__ = ['Lexique383', 'LexItem', 'LexEntryTypes', 'QueryCache', 'Instrumentation', 'ValidationReport',
+           'LexiqueValidationError', 'SharedLexicon', 'ColumnStore', 'NeighbourhoodIndex',
+           'PseudowordGenerator', 'SublexicalStatistics', 'PerfectHashSet', 'BloomFilter']
 
-import pkg_resources
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
 
-from .pylexique import Lexique383, LexItem, LexEntryTypes
+if TYPE_CHECKING:  # pragma: no cover
+    from .pylexique import Lexique383, LexItem, LexEntryTypes
+    from .cache import QueryCache
+    from .instrumentation import Instrumentation
+    from .validation import ValidationReport, LexiqueValidationError
+    from .shared import SharedLexicon
+    from .aggregation import ColumnStore
+    from .neighbourhood import NeighbourhoodIndex
+    from .pseudowords import PseudowordGenerator, SublexicalStatistics
+    from .membership import PerfectHashSet, BloomFilter
 
 _RESOURCE_PACKAGE = 'pylexique'
-_RESOURCE_PATH = pkg_resources.resource_filename(_RESOURCE_PACKAGE, 'Lexique383/Lexique383.txt')
+
+# The public names are imported from their submodule on first access (PEP 562),
+# so that importing pylexique stays cheap until a lexicon is actually needed.
+_LAZY_EXPORTS = {
+    'Lexique383': 'pylexique',
+    'LexItem': 'pylexique',
+    'LexEntryTypes': 'pylexique',
+    'QueryCache': 'cache',
+    'Instrumentation': 'instrumentation',
+    'ValidationReport': 'validation',
+    'LexiqueValidationError': 'validation',
+    'SharedLexicon': 'shared',
+    'ColumnStore': 'aggregation',
+    'NeighbourhoodIndex': 'neighbourhood',
+    'PseudowordGenerator': 'pseudowords',
+    'SublexicalStatistics': 'pseudowords',
+    'PerfectHashSet': 'membership',
+    'BloomFilter': 'membership',
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name == '_RESOURCE_PATH':
+        return import_module('.pylexique', __name__)._default_lexique_path()
+    submodule = _LAZY_EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module('.' + submodule, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,468 @@
+# -*- coding: utf-8 -*-
+
+"""Group-by aggregations and distribution statistics over columnar copies of the fields of Lexique383."""
+
+from collections.abc import Collection
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union, cast
+from typing import Collection as CollectionType
+
+import numpy as np
+
+from .utils import gc_paused
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .pylexique import LexItem
+
+__all__ = ['ColumnStore', 'AGGREGATIONS']
+
+#: Statistics computed by ColumnStore.aggregate(). 'std' and 'var' are sample statistics (ddof=1).
+AGGREGATIONS = ('count', 'sum', 'mean', 'std', 'var', 'min', 'max', 'median')
+
+_DTYPES = {float: np.float64, int: np.int64, bool: np.bool_}
+# Statistics needing the values of each group in order.
+_ORDER_STATISTICS = frozenset({'min', 'max', 'median'})
+# Up to this number of groups, the rows are sorted by group with a radix sort of 16 bit group numbers.
+_RADIX_GROUPS = 1 << 16
+
+Filter = Union[Any, CollectionType[Any], Callable[[Any], Any]]
+GroupKey = Union[Any, Tuple[Any, ...]]
+
+
+class ColumnStore:
+    """
+    | Columnar copy of the fields of a set of LexItems, for aggregations which run on numpy arrays
+    | instead of the LexItem objects. Each row is one LexItem, homographs included.
+    | The columns are extracted the first time they are used: numerical fields become arrays of their type,
+    | and string fields are factorized into integer codes indexing their sorted distinct values.
+
+    :param items: Iterable.
+        LexItems of the lexicon.
+    :param field_types: Mapping.
+        Mapping of the field names to their type, as in the LexEntryTypes annotations.
+    """
+
+    def __init__(self, items: Iterable['LexItem'], field_types: Mapping[str, type]) -> None:
+        self._items = list(items)
+        self.field_types = dict(field_types)
+        self._columns: Dict[str, np.ndarray] = {}
+        self._factors: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._orders: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        return '{0}(rows={1}, columns={2})'.format(self.__class__.__name__, len(self), sorted(self._columns))
+
+    def _check_field(self, field: str) -> type:
+        try:
+            return self.field_types[field]
+        except KeyError:
+            raise ValueError(f"The field {field} is not a field of the lexicon.") from None
+
+    def is_numeric(self, field: str) -> bool:
+        """
+        | Tells whether a field holds numbers or booleans, which can be aggregated.
+
+        :param field:
+            Name of the field.
+        :return: bool.
+        :raises: ValueError.
+            If the field does not exist.
+        """
+        return self._check_field(field) in _DTYPES
+
+    def column(self, field: str) -> np.ndarray:
+        """
+        | Gets the values of a field for all the rows.
+        | Numerical columns are cached, and hold NaN for the values which are not numbers.
+        | String columns are rebuilt from their codes as arrays of objects.
+
+        :param field:
+            Name of the field.
+        :return:
+            Numpy array with one value per row.
+        :raises: ValueError.
+            If the field does not exist.
+        """
+        field_type = self._check_field(field)
+        if field_type not in _DTYPES:
+            codes, keys = self.factorize(field)
+            return cast(np.ndarray, keys[codes])
+        column = self._columns.get(field)
+        if column is None:
+            column = self._columns[field] = _numeric_column(list(map(attrgetter(field), self._items)), field_type)
+        return column
+
+    def factorize(self, field: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        | Encodes the values of a field as integer codes. The factorization is cached.
+
+        :param field:
+            Name of the field.
+        :return:
+            Codes of the rows, and array of the sorted distinct values indexed by the codes.
+        :raises: ValueError.
+            If the field does not exist.
+        """
+        factors = self._factors.get(field)
+        if factors is None:
+            if self.is_numeric(field):
+                keys, codes = np.unique(self.column(field), return_inverse=True)
+            else:
+                values = list(map(attrgetter(field), self._items))
+                distinct = sorted(set(values))
+                code_of = {value: code for code, value in enumerate(distinct)}
+                codes = np.fromiter(map(code_of.__getitem__, values), dtype=np.intp, count=len(values))
+                keys = np.empty(len(distinct), dtype=object)
+                keys[:] = distinct
+            factors = self._factors[field] = (codes, keys)
+        return factors
+
+    def select(self, where: Optional[Mapping[str, Filter]] = None) -> np.ndarray:
+        """
+        | Computes the rows matching all the filters.
+        | A filter is either a value, matched by equality, a list, tuple or set of values, matched by membership,
+        | or a callable. The callable receives the whole column of a numerical field and returns a boolean array,
+        | eg lambda freq: freq > 10, and is called on each distinct value of a string field, eg str.isalpha.
+
+        :param where:
+            Mapping of field names to filters.
+        :return:
+            Boolean numpy array, True for the matching rows.
+        :raises: ValueError.
+            If a field does not exist.
+        """
+        mask = np.ones(len(self._items), dtype=bool)
+        for field, condition in (where or {}).items():
+            if self.is_numeric(field):
+                column = self.column(field)
+                if callable(condition):
+                    matches = np.asarray(condition(column), dtype=bool)
+                elif isinstance(condition, Collection) and not isinstance(condition, str):
+                    matches = np.isin(column, list(condition))
+                else:
+                    matches = column == condition
+            else:
+                codes, keys = self.factorize(field)
+                if callable(condition):
+                    accepted = np.fromiter(map(condition, keys), dtype=bool, count=len(keys))
+                else:
+                    values = condition if isinstance(condition, Collection) and not isinstance(condition, str) \
+                        else (condition,)
+                    accepted = np.isin(keys, list(values))
+                matches = accepted[codes]
+            mask &= matches
+        return mask
+
+    def _groups(self, by: Sequence[str], mask: np.ndarray) -> Tuple[np.ndarray, List[GroupKey]]:
+        """
+        | Numbers the groups of the selected rows, in the order of their keys.
+
+        :return:
+            Group number of each selected row, and key of each group.
+        """
+        factors = [self.factorize(field) for field in by]
+        if len(factors) == 1:
+            codes, keys = factors[0]
+            used, inverse = _compact(codes[mask], len(keys))
+            return inverse, keys[used].tolist()
+        shape = tuple(len(keys) for _, keys in factors)
+        used, inverse = _compact(np.ravel_multi_index(tuple(codes[mask] for codes, _ in factors), shape),
+                                 int(np.prod(shape, dtype=np.float64)))
+        positions = np.unravel_index(used, shape)
+        return inverse, list(zip(*(keys[position].tolist() for (_, keys), position in zip(factors, positions))))
+
+    def _sorted_by_group(self, field: str, mask: np.ndarray, groups: np.ndarray,
+                         counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        | Sorts the values of the selected rows by group, then by value, reusing a sort of the column
+        | computed the first time. The missing values come last in their group.
+
+        :return:
+            Sorted values, and position of the first value of each group.
+        """
+        order = self._orders.get(field)
+        if order is None:
+            order = self._orders[field] = np.argsort(self.column(field), kind='stable')
+        selected = order[mask[order]]
+        if len(counts) > 1:
+            row_groups = np.empty(len(mask), dtype=np.intp)
+            row_groups[mask] = groups
+            group_of = row_groups[selected]
+            if len(counts) <= _RADIX_GROUPS:
+                group_of = group_of.astype(np.uint16)
+            selected = selected[np.argsort(group_of, kind='stable')]
+        return self.column(field)[selected].astype(np.float64), np.cumsum(counts) - counts
+
+    def aggregate(self, values: Union[str, Sequence[str]] = (), by: Union[str, Sequence[str], None] = None,
+                  stats: Sequence[str] = ('mean',), where: Optional[Mapping[str, Filter]] = None,
+                  as_frame: bool = False) -> Any:
+        """
+        | Aggregates numerical fields over the rows matching the filters, optionally grouped by the values of
+        | one or more fields. The number of rows is always included as 'count', and the statistics of a field
+        | are named '<field>_<statistic>', eg 'freqfilms2_mean'. The missing values of a field are left out
+        | of its statistics.
+
+        :param values:
+            Name or sequence of names of the numerical fields to aggregate.
+        :param by:
+            Name or sequence of names of the fields to group by. The rows are not grouped by default.
+        :param stats:
+            Statistics to compute, among AGGREGATIONS.
+        :param where:
+            Filters of the rows, see select().
+        :param as_frame: bool.
+            Whether to return a pandas DataFrame, indexed by the group keys.
+        :return:
+            Dictionary of the statistics if the rows are not grouped, else dictionary of the group keys to the
+            dictionaries of their statistics, sorted by key. The keys are tuples when grouping by several fields.
+        :raises: ValueError.
+            If a field does not exist or is not numerical, or if a statistic is unknown.
+        """
+        values = (values,) if isinstance(values, str) else tuple(values)
+        by_fields = (by,) if isinstance(by, str) else tuple(by or ())
+        unknown = [stat for stat in stats if stat not in AGGREGATIONS]
+        if unknown:
+            raise ValueError(f"Unknown statistics {unknown}. Valid statistics are {AGGREGATIONS}.")
+        for field in values:
+            if not self.is_numeric(field):
+                raise ValueError(f"The field {field} is not numerical and cannot be aggregated.")
+        mask = self.select(where)
+        if by_fields:
+            groups, keys = self._groups(by_fields, mask)
+        else:
+            groups, keys = np.zeros(int(mask.sum()), dtype=np.intp), [None]
+        size = len(keys)
+        counts = np.bincount(groups, minlength=size)
+        table: Dict[str, np.ndarray] = {'count': counts}
+        for field in values:
+            ordered = self._sorted_by_group(field, mask, groups, counts) if _ORDER_STATISTICS.intersection(stats) \
+                else None
+            for stat, result in _aggregate_column(self.column(field)[mask], groups, counts, stats, ordered).items():
+                table[f'{field}_{stat}'] = result
+        if as_frame:
+            import pandas as pd
+            index = None
+            if by_fields:
+                index = pd.MultiIndex.from_tuples(keys, names=by_fields) if len(by_fields) > 1 \
+                    else pd.Index(keys, name=by_fields[0])
+            return pd.DataFrame(table, index=index)
+        names = tuple(table)
+        with gc_paused():
+            rows = [dict(zip(names, row)) for row in zip(*(column.tolist() for column in table.values()))]
+            return dict(zip(keys, rows)) if by_fields else rows[0]
+
+    def quantiles(self, field: str, q: Union[float, Sequence[float]] = (0.25, 0.5, 0.75),
+                  by: Union[str, Sequence[str], None] = None,
+                  where: Optional[Mapping[str, Filter]] = None) -> Any:
+        """
+        | Computes quantiles of a numerical field, with linear interpolation like numpy.quantile().
+
+        :param field:
+            Name of the numerical field.
+        :param q:
+            Quantile or sequence of quantiles, between 0 and 1.
+        :param by:
+            Name or sequence of names of the fields to group by. The rows are not grouped by default.
+        :param where:
+            Filters of the rows, see select().
+        :return:
+            Quantile or list of quantiles, or dictionary of the group keys to them when the rows are grouped.
+            The quantiles of an empty selection are NaN.
+        :raises: ValueError.
+            If a field does not exist or is not numerical, or if a quantile is not between 0 and 1.
+        """
+        if not self.is_numeric(field):
+            raise ValueError(f"The field {field} is not numerical.")
+        probabilities = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if ((probabilities < 0) | (probabilities > 1)).any():
+            raise ValueError("The quantiles must be between 0 and 1.")
+        by_fields = (by,) if isinstance(by, str) else tuple(by or ())
+        mask = self.select(where)
+        if by_fields:
+            groups, keys = self._groups(by_fields, mask)
+        else:
+            groups, keys = np.zeros(int(mask.sum()), dtype=np.intp), [None]
+        counts = np.bincount(groups, minlength=len(keys))
+        ordered, starts = self._sorted_by_group(field, mask, groups, counts)
+        present = ~np.isnan(self.column(field)[mask].astype(np.float64))
+        results = _sorted_quantiles(ordered, starts, np.bincount(groups[present], minlength=len(keys)), probabilities)
+        shaped = [row[0] if np.ndim(q) == 0 else row for row in results.T.tolist()]
+        return dict(zip(keys, shaped)) if by_fields else shaped[0]
+
+    def histogram(self, field: str, bins: Union[int, Sequence[float]] = 10,
+                  range: Optional[Tuple[float, float]] = None, by: Union[str, Sequence[str], None] = None,
+                  where: Optional[Mapping[str, Filter]] = None) -> Dict[Any, Any]:
+        """
+        | Counts the values of a numerical field in bins, like numpy.histogram().
+        | When the rows are grouped, all the groups share the same bins. To count each distinct value,
+        | eg the number of words per syllable count, use aggregate(by=field) instead.
+
+        :param field:
+            Name of the numerical field.
+        :param bins:
+            Number of bins of equal width, or sequence of the edges of the bins.
+        :param range:
+            Lower and upper bounds of the bins when their number is given. The range of the selected values
+            by default.
+        :param by:
+            Name or sequence of names of the fields to group by. The rows are not grouped by default.
+        :param where:
+            Filters of the rows, see select().
+        :return:
+            Dictionary with the 'edges' of the bins and the 'counts' of the values in each bin.
+            When the rows are grouped, 'counts' is a dictionary of the group keys to their counts.
+        :raises: ValueError.
+            If a field does not exist or is not numerical.
+        """
+        if not self.is_numeric(field):
+            raise ValueError(f"The field {field} is not numerical.")
+        mask = self.select(where)
+        # The missing values are not counted.
+        mask &= ~np.isnan(self.column(field).astype(np.float64))
+        column = self.column(field)[mask].astype(np.float64)
+        edges = np.histogram_bin_edges(column, bins=bins, range=range)
+        nbins = len(edges) - 1
+        # Like numpy.histogram(), the last bin includes its upper edge and the values out of the bins are ignored.
+        positions = np.searchsorted(edges, column, side='right') - 1
+        positions[column == edges[-1]] = nbins - 1
+        inside = (positions >= 0) & (positions < nbins)
+        by_fields = (by,) if isinstance(by, str) else tuple(by or ())
+        if not by_fields:
+            return {'edges': edges.tolist(), 'counts': np.bincount(positions[inside], minlength=nbins).tolist()}
+        groups, keys = self._groups(by_fields, mask)
+        counts = np.bincount(groups[inside] * nbins + positions[inside], minlength=len(keys) * nbins)
+        return {'edges': edges.tolist(), 'counts': dict(zip(keys, counts.reshape(len(keys), nbins).tolist()))}
+
+
+def _to_number(value: Any) -> float:
+    if value.__class__ is str:
+        value = value.strip().replace(',', '.')
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _numeric_column(values: List[Any], field_type: type) -> np.ndarray:
+    """
+    | Builds the array of a numerical field. The values which were not converted when the lexicon was loaded,
+    | eg the fields in converters.UNCOERCED_FIELDS or the malformed values kept by the validation,
+    | are parsed again, and the column is then made of floats, with NaN for the missing values.
+
+    :param values:
+        Values of the field.
+    :param field_type:
+        Type of the field.
+    :return:
+        Numpy array.
+    """
+    if all(value.__class__ is field_type for value in values):
+        return np.fromiter(values, dtype=_DTYPES[field_type], count=len(values))
+    return np.fromiter(map(_to_number, values), dtype=np.float64, count=len(values))
+
+
+def _compact(codes: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    | Renumbers the codes in use from 0, keeping their order.
+
+    :param codes:
+        Array of non negative integers.
+    :param size:
+        Upper bound of the codes.
+    :return:
+        Sorted codes in use, and new number of each code.
+    """
+    if size > 4 * len(codes) + 1024:
+        return np.unique(codes, return_inverse=True)
+    used = np.flatnonzero(np.bincount(codes, minlength=size))
+    numbers = np.zeros(size, dtype=np.intp)
+    numbers[used] = np.arange(len(used))
+    return used, numbers[codes]
+
+
+def _aggregate_column(column: np.ndarray, groups: np.ndarray, counts: np.ndarray, stats: Sequence[str],
+                      ordered: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+    """
+    | Computes statistics of a column per group, with one pass of numpy.bincount() per statistic.
+
+    :param column:
+        Values of the selected rows.
+    :param groups:
+        Group number of the selected rows.
+    :param counts:
+        Number of rows of each group.
+    :param stats:
+        Statistics to compute.
+    :param ordered:
+        Values sorted by group and position of the groups, see ColumnStore._sorted_by_group().
+        Needed by the 'min', 'max' and 'median' statistics.
+    :return:
+        Dictionary of the statistics to the arrays of their value per group.
+    """
+    size = len(counts)
+    results: Dict[str, np.ndarray] = {}
+    values = column.astype(np.float64)
+    if column.dtype.kind == 'f':
+        # The missing values are left out, like in pandas.
+        present = ~np.isnan(values)
+        if not present.all():
+            values, groups = values[present], groups[present]
+            counts = np.bincount(groups, minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sums = np.bincount(groups, weights=values, minlength=size)
+        means = sums / counts
+        if 'sum' in stats:
+            results['sum'] = sums.astype(np.int64) if column.dtype.kind in 'iub' else sums
+        if 'mean' in stats:
+            results['mean'] = means
+        if 'std' in stats or 'var' in stats:
+            deviations = values - means[groups]
+            variances = np.bincount(groups, weights=deviations * deviations, minlength=size) / (counts - 1)
+            variances[counts < 2] = np.nan
+            if 'var' in stats:
+                results['var'] = variances
+            if 'std' in stats:
+                results['std'] = np.sqrt(variances)
+    if ordered is not None:
+        sorted_values, starts = ordered
+        present = counts > 0
+        for stat, positions in (('min', starts), ('max', starts + counts - 1)):
+            if stat in stats:
+                result = np.full(size, np.nan)
+                result[present] = sorted_values[positions[present]]
+                results[stat] = result
+        if 'median' in stats:
+            results['median'] = _sorted_quantiles(sorted_values, starts, counts, np.array([0.5]))[0]
+    return {stat: results[stat] for stat in stats if stat != 'count'}
+
+
+def _sorted_quantiles(ordered: np.ndarray, starts: np.ndarray, counts: np.ndarray,
+                      probabilities: np.ndarray) -> np.ndarray:
+    """
+    | Interpolates quantiles in values sorted by group, then by value.
+
+    :param ordered:
+        Sorted values.
+    :param starts:
+        Position of the first value of each group.
+    :param counts:
+        Number of values of each group, not counting the missing values at their end.
+    :param probabilities:
+        Quantiles to compute.
+    :return:
+        Array of shape (number of quantiles, number of groups). The quantiles of the empty groups are NaN.
+    """
+    results = np.full((len(probabilities), len(counts)), np.nan)
+    present = counts > 0
+    if not present.any():
+        return results
+    starts, counts = starts[present], counts[present]
+    positions = starts + probabilities[:, None] * (counts - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, starts + counts - 1)
+    fraction = positions - lower
+    results[:, present] = ordered[lower] + (ordered[upper] - ordered[lower]) * fraction
+    return results
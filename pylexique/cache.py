@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+
+"""Bounded memoization layer for the derived queries of pylexique."""
+
+from collections import OrderedDict, defaultdict
+from sys import getsizeof
+from threading import Lock
+from typing import Any, DefaultDict, Dict, Hashable, List, NamedTuple, Optional
+
+__all__ = ['QueryCache', 'CacheInfo']
+
+_MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    """
+    Snapshot of the counters of a QueryCache.
+
+    """
+    hits: int
+    misses: int
+    evictions: int
+    currsize: int
+    maxsize: Optional[int]
+    currbytes: int
+    max_bytes: Optional[int]
+    policy: str
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        | Ratio of lookups served from the cache.
+
+        :return: float.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class QueryCache:
+    """
+    | Thread-safe bounded cache for the results of derived queries such as
+    | Lexique383.get_all_forms() and Lexique383.get_anagrams().
+    | Results are stored as tuples so that a single immutable object is shared by every caller.
+    | The memory bound only accounts for the result containers, the LexItem objects being owned by the lexicon.
+
+    :param maxsize: int or None.
+        Maximum number of cached results. None means no bound on the number of entries.
+    :param policy: string.
+        'lru' (least recently used) and 'lfu' (least frequently used) are valid values. 'lru' is the default value.
+    :param max_bytes: int or None.
+        Maximum number of bytes used by the cached result containers. None means no memory bound.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 1024, policy: str = 'lru', max_bytes: Optional[int] = None) -> None:
+        if policy not in {'lru', 'lfu'}:
+            raise ValueError(f"The value {policy} is not permitted. Only 'lru' and 'lfu' are valid values.")
+        if maxsize is not None and maxsize < 0:
+            raise ValueError(f"Argument 'maxsize' must be a positive integer or None, not {maxsize}")
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError(f"Argument 'max_bytes' must be a positive integer or None, not {max_bytes}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        self._data: Dict[Hashable, Any] = {}
+        self._sizes: Dict[Hashable, int] = {}
+        # LRU bookkeeping: keys ordered from least to most recently used.
+        self._recency: 'OrderedDict[Hashable, None]' = OrderedDict()
+        # LFU bookkeeping: use count of each key and keys grouped by use count, oldest first.
+        self._counts: Dict[Hashable, int] = {}
+        self._buckets: DefaultDict[int, 'OrderedDict[Hashable, None]'] = defaultdict(OrderedDict)
+        self._min_count = 0
+        self._currbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __repr__(self) -> str:
+        return '{0}(maxsize={1}, policy={2!r}, max_bytes={3})'.format(
+            self.__class__.__name__, self.maxsize, self.policy, self.max_bytes)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Any:
+        """
+        | Looks up a cached result and updates the hit/miss counters.
+
+        :param key:
+            Hashable key of the query.
+        :return:
+            The cached result, or the module sentinel _MISSING when the key is not cached.
+        """
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self._misses += 1
+                return value
+            self._hits += 1
+            self._touch(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        | Stores a result, evicting entries according to the policy until the bounds are respected.
+
+        :param key:
+            Hashable key of the query.
+        :param value:
+            Immutable result of the query.
+        :return:
+        """
+        size = getsizeof(value)
+        if self.maxsize == 0 or (self.max_bytes is not None and size > self.max_bytes):
+            return
+        with self._lock:
+            if key in self._data:
+                self._currbytes += size - self._sizes[key]
+                self._data[key] = value
+                self._sizes[key] = size
+                self._touch(key)
+            else:
+                self._data[key] = value
+                self._sizes[key] = size
+                self._currbytes += size
+                if self.policy == 'lru':
+                    self._recency[key] = None
+                else:
+                    self._counts[key] = 1
+                    self._buckets[1][key] = None
+                    self._min_count = 1
+            while self._over_bounds():
+                self._evict(protected=key)
+
+    def discard(self, key: Hashable) -> None:
+        """
+        | Removes a cached result, if present, eg because the entries it was computed from have changed.
+        | This does not count as an eviction.
+
+        :param key:
+            Hashable key of the query.
+        :return:
+        """
+        with self._lock:
+            if key not in self._data:
+                return
+            if self.policy == 'lru':
+                del self._recency[key]
+            else:
+                count = self._counts.pop(key)
+                bucket = self._buckets[count]
+                del bucket[key]
+                if not bucket:
+                    del self._buckets[count]
+            del self._data[key]
+            self._currbytes -= self._sizes.pop(key)
+
+    def clear(self) -> None:
+        """
+        | Empties the cache and resets its counters.
+
+        :return:
+        """
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._recency.clear()
+            self._counts.clear()
+            self._buckets.clear()
+            self._min_count = 0
+            self._currbytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def info(self) -> CacheInfo:
+        """
+        | Reports the hit, miss and eviction counters of the cache.
+
+        :return: CacheInfo.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, len(self._data), self.maxsize,
+                             self._currbytes, self.max_bytes, self.policy)
+
+    def keys(self) -> List[Hashable]:
+        """
+        | Lists the cached keys, in eviction order (next victim first).
+
+        :return: list.
+        """
+        with self._lock:
+            if self.policy == 'lru':
+                return list(self._recency)
+            return [key for count in sorted(self._buckets) for key in self._buckets[count]]
+
+    def _over_bounds(self) -> bool:
+        if self.maxsize is not None and len(self._data) > self.maxsize:
+            return True
+        return self.max_bytes is not None and self._currbytes > self.max_bytes
+
+    def _touch(self, key: Hashable) -> None:
+        if self.policy == 'lru':
+            self._recency.move_to_end(key)
+            return
+        count = self._counts[key]
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        self._counts[key] = count + 1
+        self._buckets[count + 1][key] = None
+
+    def _evict(self, protected: Hashable) -> None:
+        if self.policy == 'lru':
+            victim = next(iter(self._recency))
+            if victim == protected and len(self._recency) > 1:
+                self._recency.move_to_end(victim)
+                victim = next(iter(self._recency))
+            del self._recency[victim]
+        else:
+            if self._min_count not in self._buckets:
+                self._min_count = min(self._buckets)
+            bucket = self._buckets[self._min_count]
+            victim = next(iter(bucket))
+            if victim == protected and len(self._data) > 1:
+                # The freshly inserted key only stays if something else can be evicted instead.
+                counts = sorted(self._buckets)
+                bucket = self._buckets[counts[1]] if len(bucket) == 1 else bucket
+                victim = next(key for key in bucket if key != protected)
+            count = self._counts.pop(victim)
+            victim_bucket = self._buckets[count]
+            del victim_bucket[victim]
+            if not victim_bucket:
+                del self._buckets[count]
+        del self._data[victim]
+        self._currbytes -= self._sizes.pop(victim)
+        self._evictions += 1
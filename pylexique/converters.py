@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+"""Row converter of pylexique, driven by a per-column coercion plan computed once."""
+
+from typing import Any, Callable, Collection, Dict, List, Optional, Sequence, Tuple
+
+from .validation import ValidationReport
+
+__all__ = ['RowConverter', 'build_coercion_plan', 'compile_plan', 'UNCOERCED_FIELDS']
+
+#: Fields annotated as numbers in LexEntryTypes but kept as they appear in Lexique383,
+#: because they have never been coerced by pylexique.
+UNCOERCED_FIELDS = frozenset({'deflem', 'defobs', 'nbmorph'})
+
+Converter = Callable[[Any], Any]
+#: (column index, field name, converter, fallback). The fallback gives the value kept when the converter fails,
+#: None meaning that the failure rejects the whole row.
+PlanStep = Tuple[int, str, Converter, Optional[Converter]]
+
+
+def _to_float(value: Any) -> Any:
+    # Lexique383 uses decimal commas. Values without a comma are kept as they are.
+    if value.__class__ is str and ',' in value:
+        return float(value.replace(',', '.'))
+    return value
+
+
+def _to_bool(value: Any) -> Any:
+    if value.__class__ is str:
+        value = value.strip()
+    if value != '' and value not in ('0', '1', 0, 1):
+        value = 0
+    return bool(int(value))
+
+
+def _strip(value: Any) -> Any:
+    return value.strip() if value.__class__ is str else value
+
+
+def _keep(value: Any) -> Any:
+    return value
+
+
+_CONVERTERS: Dict[type, Tuple[Converter, Optional[Converter]]] = {
+    float: (_to_float, None),
+    int: (int, _keep),
+    bool: (_to_bool, _strip),
+}
+
+
+def build_coercion_plan(field_types: Dict[str, type]) -> Tuple[PlanStep, ...]:
+    """
+    | Maps every column which needs a type coercion to its converter.
+    | Columns annotated as strings, and the UNCOERCED_FIELDS, are left out of the plan.
+
+    :param field_types:
+        Ordered mapping of the field names to their annotated types, eg the type hints of LexEntryTypes.
+    :return:
+        Tuple of (column index, field name, converter, fallback).
+    """
+    plan = []
+    for index, (field, field_type) in enumerate(field_types.items()):
+        if field in UNCOERCED_FIELDS or field_type not in _CONVERTERS:
+            continue
+        converter, fallback = _CONVERTERS[field_type]
+        plan.append((index, field, converter, fallback))
+    return tuple(plan)
+
+
+def compile_plan(plan: Sequence[PlanStep], width: int,
+                 shared: Collection[int] = ()) -> Callable[[Sequence[Any]], List[Any]]:
+    """
+    | Compiles a coercion plan into a single function converting a row with one list display,
+    | so that converting a row involves neither a loop over the columns nor a test on the field names.
+    | The float conversion is inlined since it is the most frequent one.
+
+    :param plan:
+        Coercion plan, as returned by build_coercion_plan().
+    :param width:
+        Number of fields of a row.
+    :param shared:
+        Indexes of the columns whose converted values are shared, ie equal values converted by the function
+        are the same object.
+    :return:
+        Function converting a row with at least `width` fields. It raises ValueError if a conversion fails.
+    """
+    namespace: Dict[str, Any] = {}
+    converters = {index: converter for index, _, converter, _ in plan}
+    expressions = []
+    for index in range(width):
+        converter = converters.get(index)
+        if converter is None:
+            expression = 'row[{0}]'.format(index)
+        elif converter is _to_float:
+            expression = ("(float(value.replace(',', '.')) if (value := row[{0}]).__class__ is str "
+                          "and ',' in value else value)".format(index))
+        else:
+            name = '_converter_{0}'.format(index)
+            namespace[name] = converter
+            expression = '{0}(row[{1}])'.format(name, index)
+        if index in shared:
+            name = '_share_{0}'.format(index)
+            namespace[name] = {}.setdefault
+            expression = '{0}((shared := {1}), shared)'.format(name, expression)
+        expressions.append(expression)
+    source = 'def convert(row):\n    return [{0}]\n'.format(', '.join(expressions))
+    exec(compile(source, '<coercion plan>', 'exec'), namespace)  # nosec: the source is built from the plan only.
+    return namespace['convert']  # type: ignore[no-any-return]
+
+
+class RowConverter:
+    """
+    | Converts the rows of Lexique38X from strings to typed values by applying a precompiled coercion plan.
+    | A row whose conversion fails is converted again field by field, to report the errors to the ValidationReport.
+
+    :param field_types:
+        Ordered mapping of the field names to their annotated types.
+    :param report: ValidationReport.
+        Report receiving the conversion errors.
+    :param shared_fields:
+        Fields whose equal values are converted to the same object, to save memory. See compile_plan().
+    """
+
+    def __init__(self, field_types: Dict[str, type], report: ValidationReport,
+                 shared_fields: Collection[str] = ()) -> None:
+        self.width = len(field_types)
+        self.fields = tuple(field_types)
+        self.plan = build_coercion_plan(field_types)
+        self.report = report
+        shared = {index for index, field in enumerate(self.fields) if field in shared_fields}
+        self._compiled = compile_plan(self.plan, self.width, shared)
+
+    def __repr__(self) -> str:
+        return '{0}({1})'.format(self.__class__.__name__, ', '.join(field for _, field, _, _ in self.plan))
+
+    def convert(self, row_fields: Sequence[Any]) -> List[Any]:
+        """
+        | Converts a row.
+
+        :param row_fields:
+            List of column entries representing a row.
+        :return:
+            New list of typed column entries.
+        :raises: ValueError.
+            If the row must be rejected.
+        """
+        if len(row_fields) < self.width:
+            self.report.record_length_error(row_fields)
+            raise ValueError
+        try:
+            return self._compiled(row_fields)
+        except ValueError:
+            return self._convert_checked(row_fields)
+
+    def _convert_checked(self, row_fields: Sequence[Any]) -> List[Any]:
+        """
+        | Converts a row field by field, recording the fields which cannot be converted.
+
+        :param row_fields:
+            List of column entries representing a row.
+        :return:
+            New list of typed column entries.
+        :raises: ValueError.
+            If a field without fallback cannot be converted.
+        """
+        fields = list(row_fields[:self.width])
+        for index, field, converter, fallback in self.plan:
+            value = fields[index]
+            try:
+                fields[index] = converter(value)
+            except ValueError:
+                if fallback is None:
+                    raise
+                fields[index] = fallback(value)
+                self.report.record_value_error(fields[0], field, fields[index])
+        return fields
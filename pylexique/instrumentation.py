@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+
+"""Load-time profiling and lookup latency instrumentation for pylexique."""
+
+import os
+import sys
+import weakref
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import wraps
+from time import perf_counter
+from types import MethodType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+__all__ = ['Instrumentation', 'PhaseStats', 'LatencyHistogram']
+
+PhaseHook = Callable[[str, 'PhaseStats'], None]
+CallHook = Callable[[str, float], None]
+
+try:
+    _PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):  # pragma: no cover
+    _PAGE_SIZE = 4096
+
+
+def current_rss() -> int:
+    """
+    | Returns the resident set size of the current process in bytes.
+    | Falls back to the peak resident set size on platforms without /proc.
+
+    :return: int.
+    """
+    try:
+        with open('/proc/self/statm', 'rb') as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:  # pragma: no cover
+        return 0
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+@dataclass
+class PhaseStats:
+    """
+    Timings and counters accumulated for one phase of the loading pipeline.
+
+    """
+    name: str
+    seconds: float = 0.0
+    calls: int = 0
+    rows: int = 0
+    errors: int = 0
+    memory_delta: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        | Converts the PhaseStats to a dict.
+
+        :return: dict.
+        """
+        return asdict(self)
+
+
+class LatencyHistogram:
+    """
+    | Histogram of call latencies with power-of-two nanosecond buckets.
+    | Recording a latency is a constant time operation.
+
+    """
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self) -> None:
+        self.counts = [0] * 64
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def __repr__(self) -> str:
+        return '{0}(count={1}, mean={2:.3g}s, max={3:.3g}s)'.format(
+            self.__class__.__name__, self.count, self.mean, self.max)
+
+    def record(self, seconds: float) -> None:
+        """
+        | Adds a latency to the histogram.
+
+        :param seconds:
+            Duration of the call.
+        :return:
+        """
+        self.counts[min(int(seconds * 1e9).bit_length(), 63)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """
+        | Approximates a latency percentile by the upper bound of the bucket holding it.
+
+        :param q:
+            Percentile, between 0 and 100.
+        :return: float.
+            Latency in seconds.
+        """
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min((1 << index) / 1e9, self.max)
+        return self.max
+
+    def buckets(self) -> List[Tuple[float, int]]:
+        """
+        | Lists the non empty buckets as (upper bound in seconds, number of calls).
+
+        :return: list.
+        """
+        return [((1 << index) / 1e9, count) for index, count in enumerate(self.counts) if count]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        | Converts the histogram to a dict.
+
+        :return: dict.
+        """
+        return {'count': self.count, 'total': self.total, 'mean': self.mean,
+                'min': self.min if self.count else 0.0, 'max': self.max,
+                'p50': self.percentile(50), 'p90': self.percentile(90), 'p99': self.percentile(99),
+                'buckets': self.buckets()}
+
+
+class Instrumentation:
+    """
+    | Collects per-phase statistics while a Lexique383 instance is loaded and latency histograms for its lookup methods.
+    | Pass an instance to Lexique383(instrumentation=...) to enable it. When no instrumentation is given,
+    | the loading pipeline and the lookup methods run without any extra work.
+
+    :param on_phase: callable or None.
+        Called with the name and the PhaseStats of each phase when the load completes.
+    :param on_call: callable or None.
+        Called with the name of the method and the duration in seconds after each instrumented lookup.
+    :param track_memory: bool.
+        Records the variation of the resident set size across the coarse phases ('create_db', 'save_errors').
+    """
+
+    #: Lookup methods of Lexique383 whose latency is recorded.
+    methods = ('get_lex', 'get_all_forms', 'get_anagrams')
+
+    def __init__(self, on_phase: Optional[PhaseHook] = None, on_call: Optional[CallHook] = None,
+                 track_memory: bool = True) -> None:
+        self.on_phase = on_phase
+        self.on_call = on_call
+        self.track_memory = track_memory
+        self.phases: Dict[str, PhaseStats] = {}
+        self.latencies: Dict[str, LatencyHistogram] = {}
+
+    def __repr__(self) -> str:
+        return '{0}(phases={1}, methods={2})'.format(self.__class__.__name__, list(self.phases),
+                                                     list(self.latencies))
+
+    def _phase(self, name: str) -> PhaseStats:
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats(name)
+        return stats
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseStats]:
+        """
+        | Context manager timing a coarse phase of the pipeline and, optionally, its memory delta.
+
+        :param name:
+            Name of the phase.
+        :return:
+            The PhaseStats of the phase, whose counters can be updated inside the block.
+        """
+        stats = self._phase(name)
+        rss = current_rss() if self.track_memory else 0
+        t0 = perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds += perf_counter() - t0
+            stats.calls += 1
+            if self.track_memory:
+                stats.memory_delta = (stats.memory_delta or 0) + current_rss() - rss
+
+    def add(self, name: str, seconds: float, calls: int = 0, rows: int = 0, errors: int = 0) -> None:
+        """
+        | Accumulates timings measured by the caller into a phase.
+
+        :param name:
+            Name of the phase.
+        :param seconds:
+            Time spent in the phase.
+        :param calls:
+            Number of times the phase ran.
+        :param rows:
+            Number of rows processed.
+        :param errors:
+            Number of errors encountered.
+        :return:
+        """
+        stats = self._phase(name)
+        stats.seconds += seconds
+        stats.calls += calls
+        stats.rows += rows
+        stats.errors += errors
+
+    def publish(self) -> None:
+        """
+        | Forwards the statistics of every phase to the on_phase hook.
+
+        :return:
+        """
+        if self.on_phase is not None:
+            for name, stats in self.phases.items():
+                self.on_phase(name, stats)
+
+    def record_call(self, method: str, seconds: float) -> None:
+        """
+        | Records the latency of a lookup call.
+
+        :param method:
+            Name of the method.
+        :param seconds:
+            Duration of the call.
+        :return:
+        """
+        histogram = self.latencies.get(method)
+        if histogram is None:
+            histogram = self.latencies[method] = LatencyHistogram()
+        histogram.record(seconds)
+        if self.on_call is not None:
+            self.on_call(method, seconds)
+
+    def wrap(self, name: str, method: MethodType) -> Callable[..., Any]:
+        """
+        | Wraps a bound method so that the latency of each call is recorded.
+        | The wrapper holds a weak reference to the instance, so that it can be stored on the instance
+        | without creating a reference cycle.
+
+        :param name:
+            Name under which the latencies are recorded.
+        :param method:
+            Bound method to wrap.
+        :return:
+            Wrapped method.
+        :raises: ReferenceError.
+            If the wrapper is called after the instance was garbage collected.
+        """
+        record_call = self.record_call
+        method_ref = weakref.WeakMethod(method)
+
+        @wraps(method.__func__)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            bound = method_ref()
+            if bound is None:
+                raise ReferenceError(f"The instance of {name}() was garbage collected.")
+            t0 = perf_counter()
+            try:
+                return bound(*args, **kwargs)
+            finally:
+                record_call(name, perf_counter() - t0)
+        return timed
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        | Snapshot of all the statistics, suitable for json serialization.
+
+        :return: dict.
+        """
+        return {'phases': {name: stats.to_dict() for name, stats in self.phases.items()},
+                'latencies': {name: histogram.to_dict() for name, histogram in self.latencies.items()}}
@@ -0,0 +1,397 @@
+# -*- coding: utf-8 -*-
+
+"""Compact and persistable membership structures over the keys of a lexicon."""
+
+import json
+import math
+import struct
+import sys
+from array import array
+from hashlib import blake2b
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, TypeVar, Union
+
+__all__ = ['PerfectHashSet', 'BloomFilter', 'load_filter']
+
+_MAGIC = b'PYLXMEM1'
+_PREAMBLE = struct.Struct('<8sI')
+_MASK = (1 << 64) - 1
+# Multiplier of the pilots, spreading consecutive pilots over the whole 64 bits range (Fibonacci hashing).
+_MIX = 0x9E3779B97F4A7C15
+# Multiplier of the position hashes xored with the pilots, whose high 32 bits are mapped to a row
+# (multiplier of the splitmix64 finalizer).
+_SCRAMBLE = 0xBF58476D1CE4E5B9
+# Average number of keys per bucket of a PerfectHashSet. Larger buckets take less space but longer to build.
+_BUCKET_SIZE = 4
+# Number of seeds tried before giving up building a PerfectHashSet.
+_MAX_SEEDS = 16
+# Largest number of pilots tried at once for a bucket.
+_MAX_CHUNK = 1 << 16
+_TYPECODES = {8: 'B', 16: 'H', 32: 'I'}
+
+V = TypeVar('V')
+
+
+def _hasher(seed: int) -> Any:
+    return blake2b(digest_size=16, salt=seed.to_bytes(8, 'little'))
+
+
+def _hash(key: str, hasher: Any) -> int:
+    # Copying a hasher initialized with the salt is faster than creating one for each key.
+    hasher = hasher.copy()
+    hasher.update(key.encode('utf-8'))
+    return int.from_bytes(hasher.digest(), 'little')
+
+
+def _write(path: str, header: Dict[str, Any], arrays: Iterable['array[int]']) -> None:
+    encoded_header = json.dumps(dict(header, byteorder=sys.byteorder)).encode('utf-8')
+    with open(path, 'wb') as file:
+        file.write(_PREAMBLE.pack(_MAGIC, len(encoded_header)))
+        file.write(encoded_header)
+        for values in arrays:
+            values.tofile(file)
+    return
+
+
+def _read(path: str) -> Tuple[Dict[str, Any], memoryview]:
+    with open(path, 'rb') as file:
+        content = file.read()
+    magic, header_size = _PREAMBLE.unpack_from(content)
+    if magic != _MAGIC:
+        raise ValueError('{0} is not a membership filter saved by pylexique'.format(path))
+    header = json.loads(content[_PREAMBLE.size:_PREAMBLE.size + header_size].decode('utf-8'))
+    return header, memoryview(content)[_PREAMBLE.size + header_size:]
+
+
+def _array(typecode: str, data: memoryview, header: Dict[str, Any]) -> 'array[int]':
+    values = array(typecode)
+    values.frombytes(data)
+    if header['byteorder'] != sys.byteorder:
+        values.byteswap()
+    return values
+
+
+class PerfectHashSet:
+    """
+    | Minimal perfect hash function over a set of keys, mapping each of them to a distinct row id in [0, len),
+    | along with a fingerprint of the key stored at each row id, so that most other strings are rejected.
+    | The keys are hashed into buckets, and each bucket stores the pilot, found at build time, which places
+    | all its keys on free rows (PTHash, Pibiri and Trani, 2021). The keys themselves are not stored:
+    | a string which is not a key is reported as a member with a probability of 2 ** -fingerprint_bits.
+    | It takes about 1 byte per key plus the fingerprints, loads in a few milliseconds, and the row ids can index
+    | arrays of attributes, see arrange().
+    | Building it requires numpy, looking keys up does not.
+
+    :param keys: Iterable.
+        Strings. The duplicates are ignored.
+    :param fingerprint_bits:
+        Size of the fingerprints: 8, 16 or 32 bits. 16 is the default value.
+    :param seed:
+        Seed of the hash function.
+    :raises: ValueError.
+    """
+
+    def __init__(self, keys: Iterable[str] = (), fingerprint_bits: int = 16, seed: int = 0) -> None:
+        if fingerprint_bits not in _TYPECODES:
+            raise ValueError('fingerprint_bits must be 8, 16 or 32, not {0!r}'.format(fingerprint_bits))
+        self.fingerprint_bits = fingerprint_bits
+        self._fingerprint_mask = (1 << fingerprint_bits) - 1
+        keys = list(dict.fromkeys(keys))
+        for attempt in range(_MAX_SEEDS):
+            self.seed = seed + attempt
+            if self._build(keys):
+                return
+        raise ValueError('Could not build a perfect hash function over {0} keys'.format(len(keys)))
+
+    def _build(self, keys: List[str]) -> bool:
+        import numpy as np
+        self._hasher = _hasher(self.seed)
+        self._size = len(keys)
+        self._buckets = max(1, -(-len(keys) // _BUCKET_SIZE))
+        hashes = [_hash(key, self._hasher) for key in keys]
+        position_hashes = np.array([digest >> 64 for digest in hashes], dtype=np.uint64)
+        buckets = np.array([(digest & 0xFFFFFFFF) % self._buckets for digest in hashes], dtype=np.intp)
+        fingerprints = np.array([(digest >> 32) & self._fingerprint_mask for digest in hashes], dtype=np.uint32)
+        # Keys with the same position hash cannot be placed on distinct rows if they fall in the same bucket.
+        if len(np.unique(position_hashes)) < self._size:
+            return False
+        order = np.argsort(buckets, kind='stable')
+        bounds = np.searchsorted(buckets[order], np.arange(self._buckets + 1))
+        sizes = np.diff(bounds)
+        bounds = bounds.tolist()
+        pilots = np.zeros(self._buckets, dtype=np.uint64)
+        rows = np.zeros(self._size, dtype=np.intp)
+        occupied = np.zeros(self._size, dtype=bool)
+        size, scramble, shift = np.uint64(self._size), np.uint64(_SCRAMBLE), np.uint64(32)
+        # The largest buckets are placed first, while most rows are free.
+        for bucket in np.argsort(-sizes, kind='stable')[:np.count_nonzero(sizes)].tolist():
+            members = order[bounds[bucket]:bounds[bucket + 1]]
+            bucket_hashes = position_hashes[members][:, None]
+            start, chunk = 0, 64
+            while True:
+                if start >= 1 << 32:
+                    return False
+                mixes = np.arange(start, start + chunk, dtype=np.uint64) * np.uint64(_MIX)
+                positions = ((bucket_hashes ^ mixes) * scramble >> shift) * size >> shift
+                free = ~occupied[positions].any(axis=0)
+                if len(members) > 1:
+                    ordered = np.sort(positions, axis=0)
+                    free &= (ordered[1:] != ordered[:-1]).all(axis=0)
+                hits = np.flatnonzero(free)
+                if len(hits):
+                    pilots[bucket] = start + hits[0]
+                    occupied[positions[:, hits[0]]] = True
+                    rows[members] = positions[:, hits[0]]
+                    break
+                start += chunk
+                chunk = min(chunk * 2, _MAX_CHUNK)
+        typecode = next(code for code in 'BHI' if int(pilots.max()) < 1 << (8 * array(code).itemsize))
+        self._pilots = array(typecode, pilots.tolist())
+        slots = np.zeros(self._size, dtype=np.uint32)
+        slots[rows] = fingerprints
+        self._fingerprints = array(_TYPECODES[self.fingerprint_bits], slots.tolist())
+        return True
+
+    def __repr__(self) -> str:
+        return '{0}(keys={1}, fingerprint_bits={2}, nbytes={3})'.format(
+            self.__class__.__name__, len(self), self.fingerprint_bits, self.nbytes)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The hasher cannot be pickled, it is recreated from the seed.
+        return {name: value for name, value in self.__dict__.items() if name != '_hasher'}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state, _hasher=_hasher(state['seed']))
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.get(key) is not None
+
+    def __getitem__(self, key: str) -> int:
+        row = self.get(key)
+        if row is None:
+            raise KeyError(key)
+        return row
+
+    def get(self, key: str, default: Optional[int] = None) -> Optional[int]:
+        """
+        | Gets the row id of a key.
+
+        :param key:
+            String.
+        :param default:
+            Value returned if the string is not a key. None is the default value.
+        :return:
+            Row id, in [0, len).
+        """
+        if not self._size:
+            return default
+        digest = _hash(key, self._hasher)
+        pilot = self._pilots[(digest & 0xFFFFFFFF) % self._buckets]
+        row = ((((digest >> 64) ^ (pilot * _MIX & _MASK)) * _SCRAMBLE & _MASK) >> 32) * self._size >> 32
+        if self._fingerprints[row] != (digest >> 32) & self._fingerprint_mask:
+            return default
+        return row
+
+    def arrange(self, values: Mapping[str, V], default: Optional[V] = None) -> List[Optional[V]]:
+        """
+        | Lays out the values of the keys in a list indexed by their row ids, eg to look up an attribute of a key
+        | with values[hash_set[key]].
+
+        :param values:
+            Mapping of the keys to their values.
+        :param default:
+            Value of the keys missing from the mapping. None is the default value.
+        :return:
+            List of the values, in the order of the row ids.
+        """
+        arranged: List[Optional[V]] = [default] * self._size
+        for key, value in values.items():
+            row = self.get(key)
+            if row is not None:
+                arranged[row] = value
+        return arranged
+
+    @property
+    def nbytes(self) -> int:
+        """
+        | Size of the pilots and fingerprints, in bytes.
+
+        :return: int.
+        """
+        return len(self._pilots) * self._pilots.itemsize + len(self._fingerprints) * self._fingerprints.itemsize
+
+    def save(self, path: str) -> None:
+        """
+        | Saves the hash function and the fingerprints in a binary file.
+
+        :param path:
+            Path of the file.
+        :return:
+        """
+        _write(path, {'type': self.__class__.__name__, 'size': self._size, 'buckets': self._buckets,
+                      'seed': self.seed, 'fingerprint_bits': self.fingerprint_bits,
+                      'pilots': self._pilots.typecode}, (self._pilots, self._fingerprints))
+        return
+
+    @classmethod
+    def load(cls, path: str) -> 'PerfectHashSet':
+        """
+        | Loads a PerfectHashSet saved with save().
+
+        :param path:
+            Path of the file.
+        :return: PerfectHashSet.
+        :raises: ValueError.
+            If the file is not a saved PerfectHashSet.
+        """
+        header, data = _read(path)
+        if header.get('type') != cls.__name__:
+            raise ValueError('{0} is not a saved {1}'.format(path, cls.__name__))
+        return cls._from_saved(header, data)
+
+    @classmethod
+    def _from_saved(cls, header: Dict[str, Any], data: memoryview) -> 'PerfectHashSet':
+        hash_set = cls.__new__(cls)
+        hash_set.seed = header['seed']
+        hash_set.fingerprint_bits = header['fingerprint_bits']
+        hash_set._fingerprint_mask = (1 << hash_set.fingerprint_bits) - 1
+        hash_set._hasher = _hasher(hash_set.seed)
+        hash_set._size = header['size']
+        hash_set._buckets = header['buckets']
+        pilots_size = header['buckets'] * array(header['pilots']).itemsize
+        hash_set._pilots = _array(header['pilots'], data[:pilots_size], header)
+        hash_set._fingerprints = _array(_TYPECODES[hash_set.fingerprint_bits], data[pilots_size:], header)
+        return hash_set
+
+
+class BloomFilter:
+    """
+    | Bloom filter over a set of keys: a bit array where each key sets the bits at k positions derived from
+    | its hash. A string is reported as a member when all its bits are set, which happens for the keys
+    | and for a fraction of the other strings set by the false positive rate.
+    | It takes about 1.44 * log2(1 / false_positive_rate) bits per key, eg 1.2 bytes per key for a rate of 1%.
+    | Building it requires numpy, looking keys up does not.
+
+    :param keys: Iterable.
+        Strings. The duplicates are ignored.
+    :param false_positive_rate:
+        Expected ratio of the strings which are not keys reported as members. 0.01 is the default value.
+    :param seed:
+        Seed of the hash function.
+    :raises: ValueError.
+    """
+
+    def __init__(self, keys: Iterable[str] = (), false_positive_rate: float = 0.01, seed: int = 0) -> None:
+        import numpy as np
+        if not 0 < false_positive_rate < 1:
+            raise ValueError('false_positive_rate must be between 0 and 1, not {0!r}'.format(false_positive_rate))
+        keys = list(dict.fromkeys(keys))
+        self.false_positive_rate = false_positive_rate
+        self.seed = seed
+        self._hasher = _hasher(seed)
+        self._size = len(keys)
+        self._bits = max(8, math.ceil(-max(len(keys), 1) * math.log(false_positive_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._bits / max(len(keys), 1) * math.log(2)))
+        hashes = [_hash(key, self._hasher) for key in keys]
+        first = np.array([digest & _MASK for digest in hashes], dtype=np.uint64)[:, None]
+        step = np.array([(digest >> 64) | 1 for digest in hashes], dtype=np.uint64)[:, None]
+        # The positions are computed modulo 2 ** 64, like in get().
+        positions = (first + np.arange(self._hashes, dtype=np.uint64) * step) % np.uint64(self._bits)
+        bits = np.zeros(self._bits, dtype=bool)
+        bits[positions.ravel().astype(np.intp)] = True
+        self._array = bytearray(np.packbits(bits, bitorder='little').tobytes())
+
+    def __repr__(self) -> str:
+        return '{0}(keys={1}, false_positive_rate={2}, nbytes={3})'.format(
+            self.__class__.__name__, len(self), self.false_positive_rate, self.nbytes)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {name: value for name, value in self.__dict__.items() if name != '_hasher'}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state, _hasher=_hasher(state['seed']))
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        digest = _hash(key, self._hasher)
+        first, step = digest & _MASK, (digest >> 64) | 1
+        bits, array_ = self._bits, self._array
+        for index in range(self._hashes):
+            position = (first + index * step & _MASK) % bits
+            if not array_[position >> 3] >> (position & 7) & 1:
+                return False
+        return True
+
+    @property
+    def nbytes(self) -> int:
+        """
+        | Size of the bit array, in bytes.
+
+        :return: int.
+        """
+        return len(self._array)
+
+    def save(self, path: str) -> None:
+        """
+        | Saves the bit array in a binary file.
+
+        :param path:
+            Path of the file.
+        :return:
+        """
+        _write(path, {'type': self.__class__.__name__, 'size': self._size, 'bits': self._bits,
+                      'hashes': self._hashes, 'seed': self.seed, 'false_positive_rate': self.false_positive_rate},
+               (array('B', self._array),))
+        return
+
+    @classmethod
+    def load(cls, path: str) -> 'BloomFilter':
+        """
+        | Loads a BloomFilter saved with save().
+
+        :param path:
+            Path of the file.
+        :return: BloomFilter.
+        :raises: ValueError.
+            If the file is not a saved BloomFilter.
+        """
+        header, data = _read(path)
+        if header.get('type') != cls.__name__:
+            raise ValueError('{0} is not a saved {1}'.format(path, cls.__name__))
+        return cls._from_saved(header, data)
+
+    @classmethod
+    def _from_saved(cls, header: Dict[str, Any], data: memoryview) -> 'BloomFilter':
+        bloom_filter = cls.__new__(cls)
+        bloom_filter.seed = header['seed']
+        bloom_filter.false_positive_rate = header['false_positive_rate']
+        bloom_filter._hasher = _hasher(bloom_filter.seed)
+        bloom_filter._size = header['size']
+        bloom_filter._bits = header['bits']
+        bloom_filter._hashes = header['hashes']
+        bloom_filter._array = bytearray(data)
+        return bloom_filter
+
+
+def load_filter(path: str) -> Union[PerfectHashSet, BloomFilter]:
+    """
+    | Loads a PerfectHashSet or a BloomFilter saved in a file.
+
+    :param path:
+        Path of the file.
+    :return:
+        PerfectHashSet or BloomFilter.
+    :raises: ValueError.
+        If the file is not a saved membership filter.
+    """
+    header, data = _read(path)
+    for cls in (PerfectHashSet, BloomFilter):
+        if header.get('type') == cls.__name__:
+            return cls._from_saved(header, data)
+    raise ValueError('Unknown membership filter type {0!r}'.format(header.get('type')))
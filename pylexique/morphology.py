@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+"""Derivational morphology index over the morphoder field of Lexique383."""
+
+import re
+from collections import defaultdict
+from typing import TYPE_CHECKING, DefaultDict, Dict, Iterable, List, Set, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .pylexique import LexItem
+
+__all__ = ['MorphologyIndex', 'segment_morphoder']
+
+# Morphemes are the runs of letters of the morphoder field. The brackets, hyphens and spaces
+# Lexique383 uses to delimit them are all treated as boundaries.
+_MORPHEME = re.compile(r"[^\W\d_]+")
+
+
+def segment_morphoder(morphoder: str) -> Tuple[str, ...]:
+    """
+    | Splits a morphoder value into its morphemes, eg '{abaisser}{ment}' into ('abaisser', 'ment').
+
+    :param morphoder: string.
+        Value of the morphoder field.
+    :return: tuple.
+        Morphemes, lowercased, in their order of appearance.
+    """
+    if not isinstance(morphoder, str):
+        return ()
+    return tuple(_MORPHEME.findall(morphoder.lower()))
+
+
+class MorphologyIndex:
+    """
+    | Inverted index from morphemes to the LexItems whose morphoder contains them.
+    | Every distinct morphoder value is segmented only once and its morphemes are interned as integer ids,
+    | so that the queries are dictionary lookups instead of scans of the lexicon.
+    | It complements the inflectional grouping given by Lexique383.lemmes.
+    | Lexique383 does not give the type of the morphemes, so the morphemes which are not the whole morphoder
+    | of an indexed LexItem, ie which are not words by themselves, are taken as affixes.
+
+    :param items: Iterable.
+        LexItems to index.
+    :ivar morphemes: List of the morphemes, indexed by their id.
+    """
+
+    def __init__(self, items: Iterable['LexItem'] = ()) -> None:
+        self.morphemes: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._segmentations: Dict[str, Tuple[int, ...]] = {}
+        self._entries: DefaultDict[int, List['LexItem']] = defaultdict(list)
+        self._prefixes: DefaultDict[int, List['LexItem']] = defaultdict(list)
+        self._suffixes: DefaultDict[int, List['LexItem']] = defaultdict(list)
+        # Number of indexed LexItems made of each morpheme alone.
+        self._free: DefaultDict[int, int] = defaultdict(int)
+        for item in items:
+            self.add(item)
+
+    def __repr__(self) -> str:
+        return '{0}(morphemes={1})'.format(self.__class__.__name__, len(self.morphemes))
+
+    def __len__(self) -> int:
+        return len(self.morphemes)
+
+    def __contains__(self, morpheme: object) -> bool:
+        return isinstance(morpheme, str) and morpheme.lower() in self._ids
+
+    def segmentation_ids(self, morphoder: str) -> Tuple[int, ...]:
+        """
+        | Segments a morphoder value into morpheme ids, interning the new morphemes.
+
+        :param morphoder: string.
+            Value of the morphoder field.
+        :return: tuple.
+            Morpheme ids.
+        """
+        ids = self._segmentations.get(morphoder)
+        if ids is not None:
+            return ids
+        known = self._ids
+        segmentation = []
+        for morpheme in segment_morphoder(morphoder):
+            morpheme_id = known.get(morpheme)
+            if morpheme_id is None:
+                morpheme_id = known[morpheme] = len(self.morphemes)
+                self.morphemes.append(morpheme)
+            segmentation.append(morpheme_id)
+        ids = self._segmentations[morphoder] = tuple(segmentation)
+        return ids
+
+    def segmentation(self, item: 'LexItem') -> Tuple[str, ...]:
+        """
+        | Gives the morphemes of a LexItem.
+
+        :param item: LexItem.
+        :return: tuple.
+            Morphemes of the LexItem.
+        """
+        return tuple(self.morphemes[morpheme_id] for morpheme_id in self.segmentation_ids(item.morphoder))
+
+    def add(self, item: 'LexItem') -> None:
+        """
+        | Indexes a LexItem.
+
+        :param item: LexItem.
+        :return:
+        """
+        ids = self.segmentation_ids(item.morphoder)
+        if len(ids) == 1:
+            self._entries[ids[0]].append(item)
+            self._free[ids[0]] += 1
+        elif ids:
+            for morpheme_id in set(ids):
+                self._entries[morpheme_id].append(item)
+            self._prefixes[ids[0]].append(item)
+            self._suffixes[ids[-1]].append(item)
+
+    def discard(self, item: 'LexItem') -> None:
+        """
+        | Removes a LexItem from the index, if present.
+
+        :param item: LexItem.
+        :return:
+        """
+        ids = self.segmentation_ids(item.morphoder)
+        if len(ids) == 1 and any(entry is item for entry in self._entries.get(ids[0], ())):
+            self._free[ids[0]] -= 1
+            if not self._free[ids[0]]:
+                del self._free[ids[0]]
+        slots = [(self._entries, morpheme_id) for morpheme_id in set(ids)]
+        if len(ids) > 1:
+            slots += [(self._prefixes, ids[0]), (self._suffixes, ids[-1])]
+        for table, morpheme_id in slots:
+            entries = [entry for entry in table.get(morpheme_id, ()) if entry is not item]
+            if entries:
+                table[morpheme_id] = entries
+            else:
+                table.pop(morpheme_id, None)
+
+    def _lookup(self, table: Dict[int, List['LexItem']], morpheme: str) -> List['LexItem']:
+        morpheme_id = self._ids.get(morpheme.lower())
+        if morpheme_id is None:
+            return []
+        return list(table.get(morpheme_id, ()))
+
+    def derivations(self, morpheme: str) -> List['LexItem']:
+        """
+        | Gets the LexItems whose morphoder contains the given morpheme, eg all the derivations of a root.
+
+        :param morpheme: string.
+        :return: list.
+            List of LexItem objects.
+        """
+        return self._lookup(self._entries, morpheme)
+
+    def with_prefix(self, prefix: str) -> List['LexItem']:
+        """
+        | Gets the derived LexItems whose first morpheme is the given prefix.
+
+        :param prefix: string.
+        :return: list.
+            List of LexItem objects.
+        """
+        return self._lookup(self._prefixes, prefix)
+
+    def with_suffix(self, suffix: str) -> List['LexItem']:
+        """
+        | Gets the derived LexItems whose last morpheme is the given suffix.
+
+        :param suffix: string.
+        :return: list.
+            List of LexItem objects.
+        """
+        return self._lookup(self._suffixes, suffix)
+
+    def root(self, item: 'LexItem') -> str:
+        """
+        | Gives the root of a LexItem, approximated as its longest morpheme which is not an affix,
+        | the first one if several have that length. If all its morphemes are affixes, the longest one is taken.
+
+        :param item: LexItem.
+        :return: string.
+            Root morpheme, or an empty string if the morphoder field is empty.
+        """
+        ids = self.segmentation_ids(item.morphoder)
+        if not ids:
+            return ''
+        stems = [morpheme_id for morpheme_id in ids if morpheme_id in self._free] or ids
+        return max((self.morphemes[morpheme_id] for morpheme_id in stems), key=len)
+
+    def family(self, item: 'LexItem') -> Set[str]:
+        """
+        | Gives the morphological family of a LexItem, ie the lemmas of all the entries sharing its root.
+        | The root is taken from the morphoder of the LexItem itself: pass the entry of its lemma to get the family
+        | of an inflected form, whose morphoder does not contain the root of its derivations.
+
+        :param item: LexItem.
+        :return: set.
+            Set of lemmas.
+        """
+        root = self.root(item)
+        return {entry.lemme for entry in self._lookup(self._entries, root)} if root else set()
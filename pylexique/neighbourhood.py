@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+
+"""Levenshtein distances and neighbourhood metrics (OLD20, PLD20, Coltheart's N) of arbitrary strings."""
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Sequence, Tuple, cast
+
+import numpy as np
+
+__all__ = ['NeighbourhoodIndex', 'levenshtein']
+
+# Length difference up to which the lower bounds of the distances are computed at once.
+_INITIAL_SPAN = 3
+# Longest query handled by the bit-parallel distance, one bit per character.
+_MAX_BITS = 64
+# Queries sent at once to a worker process.
+_CHUNK_SIZE = 256
+# Number of buckets the bigrams are hashed into. More buckets give tighter bounds but use more memory,
+# one byte per bucket and form.
+_BIGRAM_BUCKETS = 128
+
+_ONE = np.uint64(1)
+
+# Index of the worker processes, set by _init_worker().
+_WORKER_INDEX: Optional['NeighbourhoodIndex'] = None
+
+
+def levenshtein(source: str, target: str) -> int:
+    """
+    | Computes the Levenshtein distance between two strings, ie the minimal number of insertions, deletions
+    | and substitutions of characters turning one into the other.
+
+    :param source: string.
+    :param target: string.
+    :return: int.
+    """
+    if len(source) < len(target):
+        source, target = target, source
+    previous = list(range(len(target) + 1))
+    for i, source_char in enumerate(source, 1):
+        current = [i]
+        for j, target_char in enumerate(target, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (source_char != target_char)))
+        previous = current
+    return previous[-1]
+
+
+class NeighbourhoodIndex:
+    """
+    | Index of a set of word forms, orthographic or phonological, for computing the Levenshtein distances
+    | of arbitrary strings to their nearest forms.
+    | The forms are stored as a matrix of character codes sorted by length, so that each length is a contiguous
+    | bucket, along with the number of occurrences of each character in each form.
+    | The character counts give a lower bound of the distances (the bag distance), computed for the forms of close
+    | lengths only, and the exact distances are computed for the forms with the lowest bounds first,
+    | with a bit-parallel algorithm vectorized over these forms, until the nearest forms are known.
+
+    :param forms: Iterable.
+        Word forms. The duplicates and empty strings are ignored.
+    """
+
+    def __init__(self, forms: Iterable[str]) -> None:
+        self.forms = sorted({form for form in forms if form}, key=lambda form: (len(form), form))
+        alphabet = sorted(set(''.join(self.forms)))
+        # Code 0 pads the forms and stands for the characters which are not in the alphabet.
+        self._code_of = {char: code for code, char in enumerate(alphabet, 1)}
+        size = len(self.forms)
+        self._lengths = np.fromiter(map(len, self.forms), dtype=np.intp, count=size)
+        width = int(self._lengths.max()) if size else 0
+        # The bucket of the forms of length n is [_starts[n], _starts[n + 1]).
+        self._starts = np.searchsorted(self._lengths, np.arange(width + 2)).astype(np.intp)
+        dtype, encoding = (np.uint8, 'latin-1') if len(alphabet) < 256 else (np.uint16, 'utf-16-le')
+        # The forms are translated into strings of character codes, and read as an array without a loop.
+        table = {ord(char): code for char, code in self._code_of.items()}
+        flat = np.frombuffer(''.join(self.forms).translate(table).encode(encoding), dtype=dtype)
+        rows = np.repeat(np.arange(size), self._lengths)
+        columns = np.arange(len(flat)) - np.repeat(np.cumsum(self._lengths) - self._lengths, self._lengths)
+        self._codes = np.zeros((size, width), dtype=dtype)
+        self._codes[rows, columns] = flat
+        # One row of counts per character code, for reading the counts of the characters of a query contiguously.
+        self._counts = np.bincount(flat.astype(np.intp) * size + rows,
+                                   minlength=(len(alphabet) + 1) * size).reshape(len(alphabet) + 1, size)
+        self._counts = self._counts.astype(np.uint8 if width < 256 else np.uint16)
+        # The bigrams of the forms, padded with a boundary code at both ends, are hashed into buckets with a fixed
+        # multiplicative hash, so that the worker processes compute the same buckets.
+        self._boundary = len(alphabet) + 1
+        pairs = np.arange((self._boundary + 1) ** 2, dtype=np.uint64) * np.uint64(2654435761) % np.uint64(1 << 32)
+        self._bigram_table = (pairs * np.uint64(_BIGRAM_BUCKETS) >> np.uint64(32)).astype(np.intp).reshape(
+            self._boundary + 1, self._boundary + 1)
+        padded = np.zeros((size, width + 2), dtype=np.intp)
+        padded[:, 0] = self._boundary
+        padded[:, 1:width + 1] = self._codes
+        padded[np.arange(size), self._lengths + 1] = self._boundary
+        valid = np.arange(width + 1) <= self._lengths[:, None]
+        buckets = self._bigram_table[padded[:, :-1], padded[:, 1:]][valid]
+        self._bigrams = np.bincount(buckets * size + np.nonzero(valid)[0], minlength=_BIGRAM_BUCKETS * size).reshape(
+            _BIGRAM_BUCKETS, size).astype(np.uint8 if width < 255 else np.uint16)
+
+    def __len__(self) -> int:
+        return len(self.forms)
+
+    def __repr__(self) -> str:
+        return '{0}(forms={1}, alphabet={2})'.format(self.__class__.__name__, len(self), len(self._code_of))
+
+    def _encode(self, query: str) -> List[int]:
+        return [self._code_of.get(char, 0) for char in query]
+
+    def _bucket(self, shortest: int, longest: int) -> Tuple[int, int]:
+        """
+        | Gets the rows of the forms whose length is between shortest and longest, included.
+
+        :return:
+            First row and row following the last one.
+        """
+        shortest, longest = max(shortest, 0), min(longest, len(self._starts) - 2)
+        if shortest > longest:
+            return 0, 0
+        return int(self._starts[shortest]), int(self._starts[longest + 1])
+
+    def _lower_bounds(self, codes: Sequence[int], start: int, stop: int) -> np.ndarray:
+        """
+        | Computes the bag distance between a query and the forms in [start, stop), which is a lower bound
+        | of their Levenshtein distance: the length of the longest string minus the number of characters they have
+        | in common. Only the counts of the characters of the query need to be read.
+
+        :return:
+            Array of the lower bounds.
+        """
+        common = np.zeros(stop - start, dtype=self._counts.dtype)
+        for code, count in Counter(codes).items():
+            common += np.minimum(self._counts[code, start:stop], min(count, 255))
+        return np.maximum(self._lengths[start:stop], len(codes)) - common
+
+    def _bigram_bounds(self, codes: Sequence[int], rows: np.ndarray) -> np.ndarray:
+        """
+        | Computes a lower bound of the distances between a query and some forms from their common bigrams,
+        | since an edit operation changes two bigrams at most (Ukkonen, 1992).
+
+        :param codes:
+            Character codes of the query.
+        :param rows:
+            Rows of the forms.
+        :return:
+            Array of the lower bounds.
+        """
+        padded = [self._boundary, *codes, self._boundary]
+        common = np.zeros(len(rows), dtype=self._bigrams.dtype)
+        for bucket, count in Counter(self._bigram_table[padded[:-1], padded[1:]].tolist()).items():
+            common += np.minimum(self._bigrams[bucket, rows], min(count, 255))
+        # The strings have one bigram more than characters.
+        return (np.maximum(self._lengths[rows], len(codes)) + 2 - common) // 2  # type: ignore[no-any-return]
+
+    def _distances(self, codes: Sequence[int], rows: np.ndarray) -> np.ndarray:
+        """
+        | Computes the exact Levenshtein distances between a query and some forms, with the bit-parallel algorithm
+        | of Myers (1999) run on all the forms at once.
+
+        :param codes:
+            Character codes of the query.
+        :param rows:
+            Rows of the forms.
+        :return:
+            Array of the distances.
+        """
+        lengths = self._lengths[rows]
+        size = len(codes)
+        if size == 0 or len(rows) == 0:
+            return cast(np.ndarray, lengths.copy())
+        if size > _MAX_BITS:
+            return np.array([levenshtein(self._decode(codes), self.forms[row]) for row in rows], dtype=np.intp)
+        masks = np.zeros(len(self._code_of) + 1, dtype=np.uint64)
+        for position, code in enumerate(codes):
+            if code:
+                masks[code] |= _ONE << np.uint64(position)
+        text = self._codes[rows]
+        high = _ONE << np.uint64(size - 1)
+        positive = np.full(len(rows), (_ONE << np.uint64(size)) - _ONE if size < 64 else ~np.uint64(0))
+        negative = np.zeros(len(rows), dtype=np.uint64)
+        score = np.full(len(rows), size, dtype=np.intp)
+        distances = np.where(lengths == 0, size, 0)
+        for column in range(int(lengths.max())):
+            equal = masks[text[:, column]]
+            vertical = equal | negative
+            horizontal = equal & positive
+            horizontal += positive
+            horizontal ^= positive
+            horizontal |= equal
+            horizontal_negative = positive & horizontal
+            horizontal |= positive
+            horizontal_positive = np.invert(horizontal, out=horizontal)
+            horizontal_positive |= negative
+            score += (horizontal_positive & high).astype(bool)
+            score -= (horizontal_negative & high).astype(bool)
+            # The first row of the distance matrix increases by one per character of the form.
+            horizontal_positive <<= _ONE
+            horizontal_positive |= _ONE
+            horizontal_negative <<= _ONE
+            positive = np.invert(horizontal_positive | vertical)
+            positive |= horizontal_negative
+            negative = np.bitwise_and(horizontal_positive, vertical, out=vertical)
+            ending = lengths == column + 1
+            distances[ending] = score[ending]
+        return distances
+
+    def _decode(self, codes: Sequence[int]) -> str:
+        alphabet = {code: char for char, code in self._code_of.items()}
+        # The characters out of the alphabet are replaced by private characters, which match no other character.
+        return ''.join(alphabet.get(code) or chr(0xF0000 + position) for position, code in enumerate(codes))
+
+    def nearest_distances(self, query: str, n: int = 20) -> List[int]:
+        """
+        | Gets the distances of a string to its n nearest forms, not counting the string itself if it is a form.
+
+        :param query:
+            String, orthographic or phonological like the forms of the index.
+        :param n:
+            Number of nearest forms. 20 is the default value.
+        :return:
+            Sorted list of the n smallest distances, shorter if the index has less than n other forms.
+        """
+        codes = self._encode(query)
+        size = len(codes)
+        maximum_length = len(self._starts) - 2
+        # Lower bounds of the length buckets measured so far, as (first row, bounds) parts.
+        parts: List[Tuple[int, np.ndarray]] = []
+        measured: Optional[Tuple[int, int]] = None
+        found: List[np.ndarray] = []
+        # Rows whose bigram bound is higher than their bag bound, and these bounds.
+        deferred: List[Tuple[np.ndarray, np.ndarray]] = []
+        tally = np.zeros(0, dtype=np.intp)
+        level = 0
+        span = _INITIAL_SPAN
+        while True:
+            low, high = size - span, size + span
+            lengths = [(low, high)] if measured is None else [(low, measured[0] - 1), (measured[1] + 1, high)]
+            measured = (low, high)
+            for shortest, longest in lengths:
+                start, stop = self._bucket(shortest, longest)
+                if stop > start:
+                    parts.append((start, self._lower_bounds(codes, start, stop)))
+            complete = low <= 0 and high >= maximum_length
+            # The forms of the buckets not measured yet differ in length by more than span, so their bounds
+            # are over span, and the levels up to span can be measured.
+            last = max((int(bounds.max()) for _, bounds in parts if len(bounds)), default=0) if complete else span
+            while level <= last and parts:
+                rows = np.concatenate([np.flatnonzero(bounds == level) + start for start, bounds in parts])
+                if len(rows):
+                    bigram_bounds = self._bigram_bounds(codes, rows)
+                    later = bigram_bounds > level
+                    deferred.append((rows[later], bigram_bounds[later]))
+                    rows = rows[~later]
+                rows = np.concatenate([rows] + [deferred_rows[bounds == level] for deferred_rows, bounds in deferred])
+                if len(rows):
+                    tally = self._measure(codes, rows, found, tally)
+                # The forms not measured yet have bounds over level, so they are at a distance of level + 1 at least,
+                # and cannot be nearer than the forms already found at that distance.
+                if tally[:level + 2].sum() >= n:
+                    nearest = np.sort(np.concatenate(found))
+                    return nearest[nearest <= level + 1][:n].tolist()  # type: ignore[no-any-return]
+                level += 1
+            if complete:
+                rows = np.concatenate([deferred_rows[bounds >= level] for deferred_rows, bounds in deferred] or
+                                      [np.zeros(0, dtype=np.intp)])
+                if len(rows):
+                    self._measure(codes, rows, found, tally)
+                nearest = np.sort(np.concatenate(found)) if found else np.zeros(0, dtype=np.intp)
+                return nearest[:n].tolist()  # type: ignore[no-any-return]
+            span *= 2
+
+    def _measure(self, codes: Sequence[int], rows: np.ndarray, found: List[np.ndarray],
+                 tally: np.ndarray) -> np.ndarray:
+        """
+        | Measures the distances to some forms, and adds them to the distances found so far.
+
+        :return:
+            Number of forms found at each distance.
+        """
+        distances = self._distances(codes, rows)
+        # Only the string itself is at distance 0.
+        distances = distances[distances > 0]
+        found.append(distances)
+        counts = np.bincount(distances)
+        if len(counts) > len(tally):
+            tally = np.pad(tally, (0, len(counts) - len(tally)))
+        tally[:len(counts)] += counts
+        return tally
+
+    def mean_distance(self, query: str, n: int = 20) -> float:
+        """
+        | Computes the mean distance of a string to its n nearest forms: its OLD20 when the forms are orthographic,
+        | and its PLD20 when they are phonological.
+
+        :param query:
+            String.
+        :param n:
+            Number of nearest forms. 20 is the default value.
+        :return: float.
+            NaN if the index has no other form.
+        """
+        distances = self.nearest_distances(query, n)
+        return sum(distances) / len(distances) if distances else float('nan')
+
+    def neighbours(self, query: str) -> List[str]:
+        """
+        | Gets the neighbours of a string in the sense of Coltheart: the forms of the same length
+        | differing from it by the substitution of one character.
+
+        :param query:
+            String.
+        :return:
+            List of forms.
+        """
+        return [self.forms[row] for row in self._neighbour_rows(self._encode(query))]
+
+    def _neighbour_rows(self, codes: Sequence[int]) -> np.ndarray:
+        size = len(codes)
+        if size == 0 or size > len(self._starts) - 2:
+            return np.zeros(0, dtype=np.intp)
+        start, stop = int(self._starts[size]), int(self._starts[size + 1])
+        # A neighbour has a bag distance of 1 at most.
+        rows = np.flatnonzero(self._lower_bounds(codes, start, stop) <= 1) + start
+        mismatches = np.count_nonzero(self._codes[rows, :size] != np.asarray(codes, dtype=self._codes.dtype), axis=1)
+        return rows[mismatches == 1]  # type: ignore[no-any-return]
+
+    def neighbourhood_size(self, query: str) -> int:
+        """
+        | Counts the neighbours of a string in the sense of Coltheart (Coltheart's N), see neighbours().
+
+        :param query:
+            String.
+        :return: int.
+        """
+        return len(self._neighbour_rows(self._encode(query)))
+
+    def measure(self, queries: Iterable[str], n: int = 20,
+                processes: Optional[int] = None) -> List[Tuple[float, int]]:
+        """
+        | Computes the mean distance to the n nearest forms and the neighbourhood size of a batch of strings,
+        | optionally in a pool of worker processes, each receiving a copy of the index once.
+        | In a single process, a string takes about 3.5ms with the orthographic forms of Lexique383 (135,000 forms),
+        | so a batch of 10,000 strings takes about 35s, divided at best by the number of processes.
+
+        :param queries:
+            Strings.
+        :param n:
+            Number of nearest forms. 20 is the default value.
+        :param processes:
+            Number of worker processes. The strings are processed in the current process by default.
+        :return:
+            List of (mean distance, neighbourhood size) tuples, in the order of the strings.
+        """
+        queries = list(queries)
+        if not processes or processes < 2 or len(queries) <= _CHUNK_SIZE:
+            return [(self.mean_distance(query, n), self.neighbourhood_size(query)) for query in queries]
+        chunks = [queries[start:start + _CHUNK_SIZE] for start in range(0, len(queries), _CHUNK_SIZE)]
+        results: List[Tuple[float, int]] = []
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(self,)) as executor:
+            for chunk_results in executor.map(_measure_chunk, chunks, [n] * len(chunks)):
+                results.extend(chunk_results)
+        return results
+
+
+def _init_worker(index: NeighbourhoodIndex) -> None:
+    global _WORKER_INDEX
+    _WORKER_INDEX = index
+
+
+def _measure_chunk(queries: List[str], n: int) -> List[Tuple[float, int]]:
+    assert _WORKER_INDEX is not None
+    return _WORKER_INDEX.measure(queries, n)
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+"""Copy-on-write tables and layer files for the overlay lexicons of pylexique."""
+
+import json
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Dict, Iterator, List, Tuple
+
+__all__ = ['LayeredDict', 'read_layer']
+
+_DELETED = object()
+
+
+class LayeredDict(MutableMapping):  # type: ignore[type-arg]
+    """
+    | Mapping recording its changes on top of a base mapping which it never modifies.
+    | Lookups fall through to the base unless the key was set or deleted in this layer,
+    | so creating a layer is O(1) and its memory is proportional to the number of changes.
+    | A missing key raises a KeyError even if the base is a defaultdict, which is left unchanged.
+    | The values must be replaced rather than mutated in place, since they may belong to the base.
+
+    :param base: Mapping.
+        Base mapping, shared with the other layers built on it.
+    :ivar changes: Dictionary of the keys set in this layer. The deleted keys are mapped to a tombstone.
+    """
+
+    def __init__(self, base: Mapping) -> None:  # type: ignore[type-arg]
+        self.base = base
+        self.changes: Dict[Any, Any] = {}
+
+    def __repr__(self) -> str:
+        return '{0}(base={1}, changes={2})'.format(self.__class__.__name__, len(self.base), len(self.changes))
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self.changes.get(key, self)
+        if value is self:
+            # The base is not indexed, so that a defaultdict does not insert the missing key.
+            value = self.base.get(key, self)
+        if value is self or value is _DELETED:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.changes[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self.changes[key] = _DELETED
+
+    def __contains__(self, key: object) -> bool:
+        value = self.changes.get(key, self)
+        if value is self:
+            return key in self.base
+        return value is not _DELETED
+
+    def __iter__(self) -> Iterator[Any]:
+        changes = self.changes
+        for key in self.base:
+            if changes.get(key, self) is not _DELETED:
+                yield key
+        for key, value in changes.items():
+            if value is not _DELETED and key not in self.base:
+                yield key
+
+    def __len__(self) -> int:
+        length = len(self.base)
+        for key, value in self.changes.items():
+            if key in self.base:
+                length -= value is _DELETED
+            else:
+                length += value is not _DELETED
+        return length
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        value = self.changes.get(key, self)
+        if value is self:
+            return self.base.get(key, default)
+        return default if value is _DELETED else value
+
+
+def read_layer(layer_path: str) -> Tuple[List[Any], List[Dict[str, Any]]]:
+    """
+    | Reads a layer file, either json or tab separated values.
+    | A tsv layer has the columns of Lexique383, header included, and only holds additions.
+    | Like the lexique file, it may be compressed and encoded in ISO-8859-1 or UTF-8.
+    | A json layer is a list of entries, or an object with an "entries" list and a "delete" list.
+    | The entries are objects mapping field names to values and the deletions are objects with at least
+    | an "ortho" field, the other fields restricting the entries deleted.
+
+    :param layer_path: string.
+        Path to the layer file.
+    :return:
+        Tuple of the entries, raw rows for a tsv layer or dicts for a json layer, and of the deletions.
+    :raises: ValueError.
+        If the json layer is malformed.
+    """
+    if layer_path.endswith('.json'):
+        with open(layer_path, 'r', encoding='utf-8') as json_file:
+            content = json.load(json_file)
+        if isinstance(content, list):
+            content = {'entries': content}
+        if not isinstance(content, dict) or not set(content) <= {'entries', 'delete'}:
+            raise ValueError(f"The layer {layer_path} must be a list of entries or an object with "
+                             f"'entries' and 'delete' lists.")
+        return list(content.get('entries', [])), list(content.get('delete', []))
+    from .sources import open_lexique
+    with open_lexique(layer_path) as tsv_file:
+        # Skips the header.
+        next(tsv_file, None)
+        rows = [row.rstrip('\r\n').split('\t') for row in tsv_file if row.strip()]
+    return rows, []
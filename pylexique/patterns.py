@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+"""Pattern search over the syllabic and CV-structure fields of Lexique383."""
+
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, DefaultDict, Dict, FrozenSet, Iterable, Iterator, List, Optional, Pattern, \
+    Tuple, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .pylexique import LexItem
+
+__all__ = ['PhonotacticIndex', 'compile_pattern', 'ipa_to_lexique', 'PATTERN_FIELDS']
+
+#: Fields which can be searched with a pattern. Their syllables (or CV groups) are separated by hyphens.
+PATTERN_FIELDS = ('cvcv', 'p_cvcv', 'cv_cv', 'syll', 'orthosyll')
+_SEGMENTED_FIELDS = frozenset({'cv_cv', 'syll', 'orthosyll'})
+# Number of patterns whose matching values are remembered by a PhonotacticIndex.
+_MAX_MATCHES = 1024
+
+# Phonemes of the International Phonetic Alphabet and their code in the phonetic alphabet of Lexique383.
+_IPA_TO_LEXIQUE = (
+    ('ɛ̃', '5'), ('œ̃', '1'), ('ɑ̃', '@'), ('ɔ̃', '§'), ('ɛ', 'E'), ('ɔ', 'O'), ('ø', '2'), ('œ', '9'),
+    ('ə', '°'), ('ɑ', 'a'), ('ʃ', 'S'), ('ʒ', 'Z'), ('ɲ', 'N'), ('ŋ', 'G'), ('ɥ', '8'), ('ʁ', 'R'), ('r', 'R'),
+    ('/', ''),
+)
+
+
+def ipa_to_lexique(text: str) -> str:
+    """
+    | Transcribes the IPA symbols of a phonological pattern into the phonetic alphabet of Lexique383.
+    | Symbols which are shared by both alphabets, and the pattern wildcards, are left unchanged.
+
+    :param text: string.
+        Phonological pattern, eg '*-ʁe' or '/ʃɑ̃/'.
+    :return: string.
+    """
+    for ipa, code in _IPA_TO_LEXIQUE:
+        text = text.replace(ipa, code)
+    return text
+
+
+@lru_cache(maxsize=4096)
+def compile_pattern(pattern: str) -> Pattern:  # type: ignore[type-arg]
+    """
+    | Compiles a pattern into a regular expression automaton. Compiled patterns are cached.
+    | '?' matches one character and '*' any number of characters, without crossing a syllable boundary ('-').
+    | '**' matches anything, boundaries included, and '[...]' matches one character of a set.
+    | Any other character matches itself.
+
+    :param pattern: string.
+    :return:
+        Compiled regular expression, to be used with fullmatch().
+    """
+    regex = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith('**', index):
+            regex.append('.*')
+            index += 2
+            continue
+        if char == '*':
+            regex.append('[^-]*')
+        elif char == '?':
+            regex.append('[^-]')
+        elif char == '[' and ']' in pattern[index + 2:]:
+            end = pattern.index(']', index + 2)
+            regex.append('[' + pattern[index + 1:end].replace('\\', '\\\\') + ']')
+            index = end
+        else:
+            regex.append(re.escape(char))
+        index += 1
+    return re.compile(''.join(regex))
+
+
+def _segment_count(pattern: str) -> Optional[int]:
+    # Number of segments a pattern can match, when it is fixed.
+    if '**' in pattern or '[' in pattern:
+        return None
+    return pattern.count('-') + 1
+
+
+def _is_literal(pattern: str) -> bool:
+    return not any(char in pattern for char in '*?[')
+
+
+class PhonotacticIndex:
+    """
+    | Groups the LexItems by the value of each pattern field and by syllable count,
+    | so that a pattern is matched against the distinct values of a field rather than against every entry.
+    | The distinct values of the hyphenated fields are further grouped by number of segments.
+
+    :param items: Iterable.
+        LexItems to index.
+    """
+
+    def __init__(self, items: Iterable['LexItem'] = ()) -> None:
+        self.groups: Dict[str, DefaultDict[Any, List['LexItem']]] = {
+            field: defaultdict(list) for field in PATTERN_FIELDS + ('nbsyll',)}
+        self._by_segments: Dict[str, DefaultDict[int, Dict[str, None]]] = {
+            field: defaultdict(dict) for field in _SEGMENTED_FIELDS}
+        self._matches: Dict[Tuple[str, str], FrozenSet[Any]] = {}
+        for item in items:
+            self.add(item)
+
+    def __repr__(self) -> str:
+        return '{0}({1})'.format(self.__class__.__name__, ', '.join(
+            '{0}={1}'.format(field, len(groups)) for field, groups in self.groups.items()))
+
+    def add(self, item: 'LexItem') -> None:
+        """
+        | Indexes a LexItem.
+
+        :param item: LexItem.
+        :return:
+        """
+        for field, groups in self.groups.items():
+            value = getattr(item, field)
+            group = groups.get(value)
+            if group is None:
+                group = groups[value] = []
+                if field in _SEGMENTED_FIELDS and isinstance(value, str):
+                    self._by_segments[field][value.count('-') + 1][value] = None
+                self._matches.clear()
+            group.append(item)
+
+    def discard(self, item: 'LexItem') -> None:
+        """
+        | Removes a LexItem from the index, if present.
+
+        :param item: LexItem.
+        :return:
+        """
+        for field, groups in self.groups.items():
+            value = getattr(item, field)
+            if value not in groups:
+                continue
+            group = [entry for entry in groups[value] if entry is not item]
+            if group:
+                groups[value] = group
+                continue
+            del groups[value]
+            if field in _SEGMENTED_FIELDS and isinstance(value, str):
+                self._by_segments[field][value.count('-') + 1].pop(value, None)
+            self._matches.clear()
+
+    def matching_values(self, field: str, pattern: str) -> FrozenSet[Any]:
+        """
+        | Finds the distinct values of a field which match a pattern.
+        | The values matched by the last patterns are remembered until a new value is indexed.
+
+        :param field: string.
+            One of PATTERN_FIELDS.
+        :param pattern: string.
+        :return: frozenset.
+        """
+        groups = self.groups[field]
+        if _is_literal(pattern):
+            return frozenset((pattern,)) if pattern in groups else frozenset()
+        matches = self._matches.get((field, pattern))
+        if matches is None:
+            count = _segment_count(pattern) if field in _SEGMENTED_FIELDS else None
+            values: Iterable[Any] = self._by_segments[field].get(count, ()) if count is not None else groups
+            fullmatch = compile_pattern(pattern).fullmatch
+            matches = frozenset(value for value in values if isinstance(value, str) and fullmatch(value))
+            if len(self._matches) >= _MAX_MATCHES:
+                del self._matches[next(iter(self._matches))]
+            self._matches[(field, pattern)] = matches
+        return matches
+
+    def search(self, patterns: Dict[str, str],
+               nbsyll: Union[None, int, Iterable[int]] = None) -> Iterator['LexItem']:
+        """
+        | Lazily yields the LexItems matching all the patterns.
+        | The most selective constraint drives the iteration and the others are checked by set membership.
+
+        :param patterns:
+            Mapping of field names from PATTERN_FIELDS to patterns.
+        :param nbsyll:
+            Number of syllables, or an iterable of accepted numbers of syllables.
+        :return:
+            Iterator of LexItem objects.
+        """
+        constraints: List[Tuple[str, FrozenSet[Any]]] = []
+        for field, pattern in patterns.items():
+            if field not in PATTERN_FIELDS:
+                raise ValueError(f"The field {field} cannot be searched. Only {', '.join(PATTERN_FIELDS)} can.")
+            constraints.append((field, self.matching_values(field, pattern)))
+        if nbsyll is not None:
+            counts = frozenset((nbsyll,)) if isinstance(nbsyll, int) else frozenset(nbsyll)
+            constraints.append(('nbsyll', counts))
+        if not constraints:
+            raise ValueError('At least one pattern or a number of syllables must be given.')
+        sizes = [sum(len(self.groups[field].get(value, ())) for value in values) for field, values in constraints]
+        driver = sizes.index(min(sizes))
+        field, values = constraints.pop(driver)
+        groups = self.groups[field]
+        return self._iterate([groups[value] for value in values if value in groups], constraints)
+
+    @staticmethod
+    def _iterate(candidates: List[List['LexItem']],
+                 constraints: List[Tuple[str, FrozenSet[Any]]]) -> Iterator['LexItem']:
+        for group in candidates:
+            for item in group:
+                if all(getattr(item, field) in values for field, values in constraints):
+                    yield item
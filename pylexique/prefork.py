@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+"""Preparation of a loaded lexicon for pre-forking servers, and memory accounting of the forked workers."""
+
+import gc
+from typing import Any, Dict, Iterable, Sequence
+
+__all__ = ['deduplicate_values', 'freeze_heap', 'memory_usage', 'SHARED_VALUE_FIELDS']
+
+#: Fields whose values repeat across the entries of Lexique383 as distinct objects. The other fields are either
+#: nearly unique per entry (ortho, phon, syll...) or hold small integers, booleans and one-letter strings,
+#: which CPython already shares.
+SHARED_VALUE_FIELDS = ('lemme', 'cgram', 'freqlemfilms2', 'freqlemlivres', 'freqfilms2', 'freqlivres', 'infover',
+                       'cvcv', 'p_cvcv', 'cv_cv', 'cgramortho', 'deflem', 'defobs', 'old20', 'pld20')
+
+
+def deduplicate_values(items: Iterable[Any], fields: Sequence[str] = SHARED_VALUE_FIELDS) -> int:
+    """
+    | Makes the LexItems share one object per distinct value of the given fields,
+    | eg a single 'NOM' string or a single 0.0 float instead of one per entry.
+    | This removes millions of small objects, whose reference counts would otherwise
+    | dirty the memory pages shared by the forked workers.
+
+    :param items: Iterable.
+        LexItems, which are frozen dataclasses updated in place.
+    :param fields:
+        Names of the fields to deduplicate.
+    :return: int.
+        Number of values replaced by a shared object.
+    """
+    canonical: Dict[str, Dict[Any, Any]] = {field: {} for field in fields}
+    tables = tuple(canonical.items())
+    set_field = object.__setattr__
+    replaced = 0
+    for item in items:
+        for field, table in tables:
+            value = getattr(item, field)
+            shared = table.setdefault(value, value)
+            # 1 == 1.0 == True, so the type is checked too.
+            if shared is not value and shared.__class__ is value.__class__:
+                set_field(item, field, shared)
+                replaced += 1
+    return replaced
+
+
+def freeze_heap() -> int:
+    """
+    | Collects the garbage, then moves all the objects tracked by the garbage collector to its permanent generation,
+    | so that the collections run in the forked workers never write to the pages holding them.
+    | To be called in the master process, once everything shared by the workers is loaded.
+
+    :return: int.
+        Number of objects frozen.
+    """
+    gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+def memory_usage(pid: str = 'self') -> Dict[str, int]:
+    """
+    | Reads the private and shared memory of a process from /proc/<pid>/smaps_rollup, or from /proc/<pid>/smaps
+    | on older Linux kernels. The values are in bytes.
+
+    :param pid: string.
+        Process id, 'self' by default.
+    :return: dict.
+        'rss', 'pss', 'shared' (clean and dirty), 'private' (clean and dirty), 'private_dirty' and 'swap'.
+    :raises: OSError.
+        If the process has no smaps file, eg on platforms other than Linux.
+    """
+    totals: Dict[str, int] = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup', 'r') as smaps:
+            lines = smaps.readlines()
+    except FileNotFoundError:
+        with open(f'/proc/{pid}/smaps', 'r') as smaps:
+            lines = smaps.readlines()
+    for line in lines:
+        key, _, value = line.partition(':')
+        fields = value.split()
+        if len(fields) == 2 and fields[1] == 'kB':
+            totals[key] = totals.get(key, 0) + int(fields[0]) * 1024
+    return {'rss': totals.get('Rss', 0), 'pss': totals.get('Pss', 0),
+            'shared': totals.get('Shared_Clean', 0) + totals.get('Shared_Dirty', 0),
+            'private': totals.get('Private_Clean', 0) + totals.get('Private_Dirty', 0),
+            'private_dirty': totals.get('Private_Dirty', 0), 'swap': totals.get('Swap', 0)}
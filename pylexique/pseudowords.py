@@ -0,0 +1,431 @@
+# -*- coding: utf-8 -*-
+
+"""Sublexical statistics of Lexique383 and pseudoword generation by syllable recombination."""
+
+import json
+import os
+import random
+from bisect import bisect
+from collections import Counter
+from hashlib import blake2b
+from itertools import accumulate, chain
+from operator import add
+from typing import TYPE_CHECKING, Any, Container, Dict, Iterable, List, NamedTuple, Optional, Set, \
+    Tuple, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .pylexique import LexItem
+
+__all__ = ['SublexicalStatistics', 'PseudowordGenerator', 'Pseudoword']
+
+# Version of the layout of the saved statistics. Saved statistics of another version are rebuilt.
+_VERSION = 1
+# Positions of the syllables in the words, used as keys of the syllable tables.
+_POSITIONS = ('mono', 'initial', 'medial', 'final')
+# Number of draws of a syllable whose junction with the previous syllable is not attested, before giving up
+# the candidate. With a bigram frequency band, it is also the number of syllables the best one is chosen from.
+_JUNCTION_TRIES = 8
+
+Bounds = Union[None, float, Tuple[float, float]]
+# Syllables of a position and their cumulative frequencies, for drawing them with bisect.
+_Table = Tuple[List[Tuple[str, str]], List[int]]
+
+
+class Pseudoword(NamedTuple):
+    """
+    Pseudoword generated by a PseudowordGenerator, with its orthographic and phonological forms and syllables
+    in the format of the fields of Lexique383.
+
+    """
+    ortho: str
+    phon: str
+    orthosyll: str
+    syll: str
+    nbsyll: int
+    bigram_frequency: float
+
+
+def _syllables(item: 'LexItem') -> Optional[List[Tuple[str, str]]]:
+    # Pairs of orthographic and phonological syllables of an entry, when they are aligned.
+    orthosyll, syll = item.orthosyll, item.syll
+    if not isinstance(orthosyll, str) or not isinstance(syll, str):
+        return None
+    ortho_parts, phon_parts = orthosyll.split('-'), syll.split('-')
+    if len(ortho_parts) != len(phon_parts) or ''.join(ortho_parts) != item.ortho or \
+            ''.join(phon_parts) != item.phon or '' in ortho_parts or '' in phon_parts:
+        return None
+    return list(zip(ortho_parts, phon_parts))
+
+
+def _positions(nbsyll: int) -> List[str]:
+    if nbsyll == 1:
+        return ['mono']
+    return ['initial'] + ['medial'] * (nbsyll - 2) + ['final']
+
+
+def _bigrams(form: str) -> List[str]:
+    return list(map(add, form, form[1:]))
+
+
+def _bounds(value: Bounds) -> Tuple[float, float]:
+    if value is None:
+        return float('-inf'), float('inf')
+    if isinstance(value, (int, float)):
+        return value, value
+    return value[0], value[1]
+
+
+class SublexicalStatistics:
+    """
+    | Frequency tables of the sublexical units of a lexicon, counted over its distinct forms (type counts):
+    | the letter and phoneme bigrams, overall and by position, the orthographic/phonological syllable pairs
+    | by position in the word (monosyllable, initial, medial or final syllable), and the number of words of each
+    | syllable count and length.
+    | The syllables are read from the orthosyll and syll fields, and only the entries whose orthographic and
+    | phonological syllables are aligned contribute to the syllable tables.
+    | The tables can be saved as json, with a fingerprint of the entries they were computed from.
+
+    :param items: Iterable.
+        LexItems to count.
+    """
+
+    def __init__(self, items: Iterable['LexItem'] = ()) -> None:
+        items = list(items)
+        self.fingerprint = self.fingerprint_of(items)
+        self.letter_bigrams: Counter = Counter()  # type: ignore[type-arg]
+        self.phoneme_bigrams: Counter = Counter()  # type: ignore[type-arg]
+        self.positional_letter_bigrams: List[Counter] = []  # type: ignore[type-arg]
+        self.positional_phoneme_bigrams: List[Counter] = []  # type: ignore[type-arg]
+        self.syllables: Dict[str, Counter] = {position: Counter() for position in _POSITIONS}  # type: ignore[type-arg]
+        self.shapes: Counter = Counter()  # type: ignore[type-arg]
+        orthos: Set[str] = set()
+        phons: Set[str] = set()
+        words: Set[Tuple[str, str]] = set()
+        positions: List[Tuple[str, str]] = []
+        for item in items:
+            if isinstance(item.ortho, str):
+                orthos.add(item.ortho)
+            if isinstance(item.phon, str):
+                phons.add(item.phon)
+            syllables = _syllables(item)
+            if syllables is None or (item.ortho, item.phon) in words:
+                continue
+            words.add((item.ortho, item.phon))
+            positions.extend(zip(_positions(len(syllables)), map('\t'.join, syllables)))
+            self.shapes[len(syllables), len(item.ortho)] += 1
+        for (position, pair), count in Counter(positions).items():
+            self.syllables[position][pair] = count
+        for forms, bigrams, positional in ((orthos, self.letter_bigrams, self.positional_letter_bigrams),
+                                           (phons, self.phoneme_bigrams, self.positional_phoneme_bigrams)):
+            # The (position, bigram) pairs of all the forms are counted at once.
+            counts = Counter(chain.from_iterable(enumerate(map(add, form, form[1:])) for form in forms))
+            positional.extend(Counter() for _ in range(max((index + 1 for index, _ in counts), default=0)))
+            for (index, bigram), count in counts.items():
+                bigrams[bigram] += count
+                positional[index][bigram] = count
+
+    def __repr__(self) -> str:
+        return '{0}(letter_bigrams={1}, phoneme_bigrams={2}, syllables={3})'.format(
+            self.__class__.__name__, len(self.letter_bigrams), len(self.phoneme_bigrams),
+            sum(len(table) for table in self.syllables.values()))
+
+    @staticmethod
+    def fingerprint_of(items: Iterable['LexItem']) -> str:
+        """
+        | Computes a digest of the fields the statistics are computed from.
+
+        :param items: Iterable.
+            LexItems.
+        :return: string.
+        """
+        fields = '\n'.join('{0}\t{1}\t{2}\t{3}'.format(item.ortho, item.phon, item.orthosyll, item.syll)
+                           for item in items)
+        return blake2b(fields.encode('utf-8'), digest_size=16).hexdigest()
+
+    def bigram_frequency(self, form: str, phonological: bool = False, positional: bool = False) -> float:
+        """
+        | Computes the mean frequency of the bigrams of a form, ie the mean number of forms of the lexicon containing
+        | each of its bigrams, at any position or at the same position.
+
+        :param form:
+            Orthographic form, or phonological form if phonological is True.
+        :param phonological: bool.
+            Whether the form is phonological. False is the default value.
+        :param positional: bool.
+            Whether to count the bigrams at the same position only. False is the default value.
+        :return: float.
+            0 for the forms shorter than 2 characters.
+        """
+        bigrams = _bigrams(form)
+        if not bigrams:
+            return 0.0
+        if positional:
+            tables = self.positional_phoneme_bigrams if phonological else self.positional_letter_bigrams
+            return sum(tables[position][bigram] if position < len(tables) else 0
+                       for position, bigram in enumerate(bigrams)) / len(bigrams)
+        table = self.phoneme_bigrams if phonological else self.letter_bigrams
+        return sum(table[bigram] for bigram in bigrams) / len(bigrams)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        | Converts the statistics to a json serializable dict.
+
+        :return: dict.
+        """
+        return {
+            'version': _VERSION, 'fingerprint': self.fingerprint,
+            'letter_bigrams': self.letter_bigrams, 'phoneme_bigrams': self.phoneme_bigrams,
+            'positional_letter_bigrams': self.positional_letter_bigrams,
+            'positional_phoneme_bigrams': self.positional_phoneme_bigrams,
+            'syllables': self.syllables,
+            'shapes': [[nbsyll, length, count] for (nbsyll, length), count in sorted(self.shapes.items())],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SublexicalStatistics':
+        """
+        | Creates statistics from the dict made by to_dict().
+
+        :param data: dict.
+        :return: SublexicalStatistics.
+        :raises: ValueError.
+            If the dict was made by another version of pylexique.
+        """
+        if data.get('version') != _VERSION:
+            raise ValueError('Unsupported version of the sublexical statistics: {0!r}'.format(data.get('version')))
+        statistics = cls()
+        statistics.fingerprint = data['fingerprint']
+        statistics.letter_bigrams = Counter(data['letter_bigrams'])
+        statistics.phoneme_bigrams = Counter(data['phoneme_bigrams'])
+        statistics.positional_letter_bigrams = [Counter(table) for table in data['positional_letter_bigrams']]
+        statistics.positional_phoneme_bigrams = [Counter(table) for table in data['positional_phoneme_bigrams']]
+        statistics.syllables = {position: Counter(data['syllables'][position]) for position in _POSITIONS}
+        statistics.shapes = Counter({(nbsyll, length): count for nbsyll, length, count in data['shapes']})
+        return statistics
+
+    def save(self, path: str) -> None:
+        """
+        | Saves the statistics as compact json. The file is replaced atomically.
+
+        :param path:
+            Path of the json file.
+        :return:
+        """
+        temporary_path = '{0}.{1}.tmp'.format(path, os.getpid())
+        with open(temporary_path, 'w', encoding='utf-8') as json_file:
+            json.dump(self.to_dict(), json_file, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temporary_path, path)
+        return
+
+    @classmethod
+    def load(cls, path: str) -> 'SublexicalStatistics':
+        """
+        | Loads statistics saved with save().
+
+        :param path:
+            Path of the json file.
+        :return: SublexicalStatistics.
+        :raises: OSError, ValueError.
+        """
+        with open(path, encoding='utf-8') as json_file:
+            return cls.from_dict(json.load(json_file))
+
+    @classmethod
+    def cached(cls, items: Iterable['LexItem'], path: str) -> 'SublexicalStatistics':
+        """
+        | Loads the statistics saved at path if they were computed from the same entries,
+        | or computes them and saves them at path.
+
+        :param items: Iterable.
+            LexItems to count.
+        :param path:
+            Path of the json file.
+        :return: SublexicalStatistics.
+        """
+        items = list(items)
+        try:
+            statistics = cls.load(path)
+        except (OSError, ValueError, KeyError, TypeError):
+            statistics = None
+        if statistics is not None and statistics.fingerprint == cls.fingerprint_of(items):
+            return statistics
+        statistics = cls(items)
+        statistics.save(path)
+        return statistics
+
+
+class PseudowordGenerator:
+    """
+    | Generates pseudowords by recombining the syllables of a lexicon at the positions they occur in,
+    | drawing them with their type frequency. The junction of two syllables must be a letter bigram
+    | and a phoneme bigram of the lexicon, so that the pseudowords follow its orthotactics and phonotactics.
+    | Candidates which are words of the lexicon, or optionally homophones of words, are rejected with a set lookup.
+    | When a band of bigram frequency is requested, half of the syllables are drawn among those whose inner
+    | bigrams are within the band, and each syllable is chosen among several draws as the one keeping the mean
+    | bigram frequency of the candidate closest to the band, so that most candidates fall within it.
+    | The syllables are then no longer drawn exactly with their type frequency.
+
+    :param statistics: SublexicalStatistics.
+        Statistics of the lexicon.
+    :param words: Container.
+        Orthographic forms to reject, eg the lexique table of a Lexique383.
+    :param phons: Container.
+        Phonological forms to reject. Empty by default.
+    :param seed:
+        Seed of the random generator. The generated pseudowords are reproducible for a given seed.
+    """
+
+    def __init__(self, statistics: SublexicalStatistics, words: Container[str] = (), phons: Container[str] = (),
+                 seed: Optional[int] = None) -> None:
+        self.statistics = statistics
+        self.words = words
+        self.phons = phons
+        self.random = random.Random(seed)
+        # Sums of the frequencies of the letter bigrams inside each orthographic syllable.
+        self._inner_frequencies: Dict[str, int] = {}
+        self._tables: Dict[str, _Table] = {position: self._table(table.items())
+                                           for position, table in statistics.syllables.items()}
+        # Tables restricted to the syllables within a band of bigram frequency, by band.
+        self._band_tables: Dict[Tuple[float, float], Dict[str, _Table]] = {}
+
+    def __repr__(self) -> str:
+        return '{0}({1!r})'.format(self.__class__.__name__, self.statistics)
+
+    @staticmethod
+    def _table(counts: Iterable[Tuple[str, int]]) -> _Table:
+        syllables: List[Tuple[str, str]] = []
+        cumulative: List[int] = []
+        total = 0
+        for pair, count in sorted(counts):
+            ortho, phon = pair.split('\t')
+            syllables.append((ortho, phon))
+            total += count
+            cumulative.append(total)
+        return syllables, cumulative
+
+    def _tables_within(self, band: Tuple[float, float]) -> Dict[str, _Table]:
+        # Tables of the syllables whose inner letter bigrams have a mean frequency within the band, or which
+        # have none. The positions without such syllables keep all their syllables.
+        tables = self._band_tables.get(band)
+        if tables is None:
+            tables = self._band_tables[band] = {}
+            for position, counts in self.statistics.syllables.items():
+                within = [(pair, count) for pair, count in counts.items()
+                          if self._is_within(pair.split('\t')[0], band)]
+                tables[position] = self._table(within) if within else self._tables[position]
+        return tables
+
+    def _is_within(self, ortho: str, band: Tuple[float, float]) -> bool:
+        if len(ortho) < 2:
+            return True
+        return band[0] <= self._inner_frequency(ortho) / (len(ortho) - 1) <= band[1]
+
+    def _draw(self, position: str, tables: Dict[str, _Table]) -> Tuple[str, str]:
+        pairs, cumulative = tables[position]
+        return pairs[bisect(cumulative, self.random.random() * cumulative[-1])]
+
+    def _inner_frequency(self, ortho: str) -> int:
+        frequency = self._inner_frequencies.get(ortho)
+        if frequency is None:
+            letter_bigrams = self.statistics.letter_bigrams
+            frequency = self._inner_frequencies[ortho] = sum(letter_bigrams[bigram] for bigram in _bigrams(ortho))
+        return frequency
+
+    def _candidate(self, nbsyll: int, band: Optional[Tuple[float, float]] = None) -> Optional[List[Tuple[str, str]]]:
+        syllables: List[Tuple[str, str]] = []
+        letter_bigrams, phoneme_bigrams = self.statistics.letter_bigrams, self.statistics.phoneme_bigrams
+        # With a band, every other syllable is drawn among the syllables within the band.
+        tables = (self._tables,) if band is None else (self._tables_within(band), self._tables)
+        # Sum of the frequencies of the letter bigrams of the candidate so far, and their number.
+        total = bigrams = 0
+        for position in _positions(nbsyll):
+            best: Optional[Tuple[str, str, int]] = None
+            best_distance = float('inf')
+            for attempt in range(_JUNCTION_TRIES):
+                ortho, phon = self._draw(position, tables[attempt % len(tables)])
+                if syllables:
+                    junction = syllables[-1][0][-1] + ortho[0]
+                    if junction not in letter_bigrams or syllables[-1][1][-1] + phon[0] not in phoneme_bigrams:
+                        continue
+                if band is None:
+                    best = ortho, phon, 0
+                    break
+                added = self._inner_frequency(ortho) + (letter_bigrams[junction] if syllables else 0)
+                count = bigrams + len(ortho) - (0 if syllables else 1)
+                mean = (total + added) / count if count else band[0]
+                distance = max(band[0] - mean, mean - band[1], 0.0)
+                if distance < best_distance:
+                    best, best_distance = (ortho, phon, added), distance
+                    if not distance:
+                        break
+            if best is None:
+                return None
+            ortho, phon, added = best
+            total += added
+            bigrams += len(ortho) - (1 if not syllables else 0)
+            syllables.append((ortho, phon))
+        return syllables
+
+    def _syllable_counts(self, nbsyll: Bounds, length: Bounds) -> Tuple[List[int], List[int]]:
+        # Syllable counts allowed by the constraints, and their cumulative frequencies among the words
+        # of an allowed length.
+        (low_syll, high_syll), (low_length, high_length) = _bounds(nbsyll), _bounds(length)
+        counts: Counter = Counter()  # type: ignore[type-arg]
+        for (count, word_length), words in self.statistics.shapes.items():
+            if low_syll <= count <= high_syll and low_length <= word_length <= high_length and \
+                    all(self._tables[position][0] for position in set(_positions(count))):
+                counts[count] += words
+        syllable_counts = sorted(counts)
+        return syllable_counts, list(accumulate(counts[count] for count in syllable_counts))
+
+    def generate(self, count: int = 1, length: Bounds = None, nbsyll: Bounds = None,
+                 bigram_frequency: Bounds = None, max_attempts: Optional[int] = None) -> List[Pseudoword]:
+        """
+        | Generates distinct pseudowords matching constraints. The syllable count of each candidate is drawn
+        | from the distribution of the words of the lexicon satisfying the length and syllable count constraints.
+        | Each constraint is a value or a (minimum, maximum) tuple, bounds included. The candidates are steered
+        | towards the bigram frequency band, but a band few syllable combinations reach may still exhaust
+        | max_attempts before count pseudowords are found.
+
+        :param count:
+            Number of pseudowords.
+        :param length:
+            Number of letters.
+        :param nbsyll:
+            Number of syllables.
+        :param bigram_frequency:
+            Mean frequency of the letter bigrams, see SublexicalStatistics.bigram_frequency().
+        :param max_attempts:
+            Number of candidates drawn before giving up. 1000 times count by default.
+        :return:
+            List of Pseudoword objects, shorter than count if the attempts ran out.
+        """
+        syllable_counts, cumulative = self._syllable_counts(nbsyll, length)
+        if not syllable_counts:
+            return []
+        low_length, high_length = _bounds(length)
+        low_frequency, high_frequency = _bounds(bigram_frequency)
+        band = None if bigram_frequency is None else (low_frequency, high_frequency)
+        max_attempts = count * 1000 if max_attempts is None else max_attempts
+        pseudowords: List[Pseudoword] = []
+        seen: Set[str] = set()
+        for _ in range(max_attempts):
+            if len(pseudowords) >= count:
+                break
+            nbsyll_drawn = syllable_counts[bisect(cumulative, self.random.random() * cumulative[-1])]
+            syllables = self._candidate(nbsyll_drawn, band)
+            if syllables is None:
+                continue
+            ortho = ''.join(ortho for ortho, _ in syllables)
+            if not low_length <= len(ortho) <= high_length or ortho in seen or ortho in self.words:
+                continue
+            phon = ''.join(phon for _, phon in syllables)
+            if phon in self.phons:
+                continue
+            frequency = self.statistics.bigram_frequency(ortho)
+            if not low_frequency <= frequency <= high_frequency:
+                continue
+            seen.add(ortho)
+            pseudowords.append(Pseudoword(ortho, phon, '-'.join(ortho for ortho, _ in syllables),
+                                          '-'.join(phon for _, phon in syllables), nbsyll_drawn, frequency))
+        return pseudowords
@@ -2,29 +2,69 @@
 
 from collections import OrderedDict, defaultdict
 from collections.abc import Sequence
-import pkg_resources
-import json
-from math import isnan
+import os
+import weakref
 # import faster_than_csv as csv
 import csv
 from csv import reader
-import pandas as pd
 from dataclasses import dataclass
-from typing import DefaultDict, Dict, List, Optional, Tuple, Union, Generator, Any, Iterator
+from functools import lru_cache
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable, Dict, Mapping, List, Optional, Set, Tuple, Union, Generator, Any, \
+    Iterator, get_type_hints
+from typing import Sequence as SequenceType, cast
 
 __all__ = ['Lexique383', 'LexItem', 'LexEntryTypes']
 
 try:
-    from utils import logger
+    from utils import logger, gc_paused
+    from cache import QueryCache, CacheInfo, _MISSING
+    from instrumentation import Instrumentation
+    from validation import ValidationReport, LexiqueValidationError
+    from converters import RowConverter
+    from morphology import MorphologyIndex
+    from patterns import PhonotacticIndex, ipa_to_lexique
+    from overlay import LayeredDict, read_layer
+    from prefork import SHARED_VALUE_FIELDS, deduplicate_values, freeze_heap
 except (ModuleNotFoundError, ImportError):
-    from .utils import logger
+    from .utils import logger, gc_paused
+    from .cache import QueryCache, CacheInfo, _MISSING
+    from .instrumentation import Instrumentation
+    from .validation import ValidationReport, LexiqueValidationError
+    from .converters import RowConverter
+    from .morphology import MorphologyIndex
+    from .patterns import PhonotacticIndex, ipa_to_lexique
+    from .overlay import LayeredDict, read_layer
+    from .prefork import SHARED_VALUE_FIELDS, deduplicate_values, freeze_heap
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .aggregation import ColumnStore, Filter
+    from .membership import BloomFilter, PerfectHashSet
+    from .neighbourhood import NeighbourhoodIndex
+    from .pseudowords import Bounds, Pseudoword, SublexicalStatistics
+    from .shared import SharedLexicon
 
 _RESOURCE_PACKAGE = __name__
 
 HOME_PATH = '/'.join(('Lexique', ''))
-_RESOURCE_PATH_csv = pkg_resources.resource_filename(_RESOURCE_PACKAGE, 'Lexique383/Lexique383.txt')
-_VALUE_ERRORS_PATH = pkg_resources.resource_filename(_RESOURCE_PACKAGE, 'errors/value_errors.json')
-_LENGTH_ERRORS_PATH = pkg_resources.resource_filename(_RESOURCE_PACKAGE, 'errors/length_errors.json')
+
+
+@lru_cache(maxsize=None)
+def _default_lexique_path() -> str:
+    """
+    | Resolves the path to the Lexique383 file shipped with pylexique, the first time it is needed.
+
+    :return: string.
+    """
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Lexique383', 'Lexique383.txt')
+
+
+def __getattr__(name: str) -> Any:
+    # The path used to be resolved when the module was imported.
+    if name == '_RESOURCE_PATH_csv':
+        return _default_lexique_path()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 LEXIQUE383_FIELD_NAMES = ['ortho', 'phon', 'lemme', 'cgram', 'genre', 'nombre', 'freqlemfilms2', 'freqlemlivres',
                           'freqfilms2',
@@ -33,6 +73,9 @@ LEXIQUE383_FIELD_NAMES = ['ortho', 'phon', 'lemme', 'cgram', 'genre', 'nombre',
                           'voisorth', 'voisphon', 'puorth', 'puphon', 'syll', 'nbsyll', 'cv_cv', 'orthrenv', 'phonrenv',
                           'orthosyll', 'cgramortho', 'deflem', 'defobs', 'old20', 'pld20', 'morphoder', 'nbmorph']
 
+# Fields identifying an entry. Adding an entry replaces the entry with the same values for these fields.
+_ENTRY_KEY = ('ortho', 'lemme', 'cgram', 'genre', 'nombre')
+
 ConvertedRow = Tuple[str, str, str, str, str, str, float, float, float, float, str, int, int, bool,
                      int, int, str, str, int, int, int, int, str, int, str, str, str, str, str, float,
                      int, float, float, str, int]
@@ -121,30 +164,47 @@ class Lexique383:
     and retrieve lexical items.
     All the lexical items are then stored in an Ordered Dict.
 
-    :param lexique_path: string.
-        Path to the lexique file.
+    :param lexique_path: string or path-like object.
+        Path to the lexique file. It may be compressed with gzip, bz2, xz or zstd (with the zstandard package),
+        and encoded in ISO-8859-1 or UTF-8.
     :param parser_type: string.
         'pandas_csv' and 'csv' are valid values. 'csv' is the default value.
-    :cvar lexique: Dictionary containing all the LexicalItem objects indexed by orthography.
-    :cvar lemmes: Dictionary containing all the LexicalItem objects indexed by lemma.
-    :cvar anagrams: Dictionary containing all the LexicalItem objects indexed by anagram form.
+    :param cache: QueryCache or None.
+        Optional bounded cache memoizing the results of get_all_forms() and get_anagrams().
+    :param instrumentation: Instrumentation or None.
+        Optional collector of per-phase load statistics and lookup latencies.
+    :param validation: string.
+        How the rows which cannot be converted are reported: 'off', 'count', 'collect' or 'strict'.
+        'count' is the default value. See ValidationReport.
+    :param errors_path: string or None.
+        If provided, the validation report is saved as json to this path after the load.
+    :param prefork: bool.
+        Loads the lexicon for sharing with forked worker processes: the repeated values are shared while loading,
+        then prepare_for_fork() is called. False is the default value.
+    :ivar lexique: Dictionary containing all the LexicalItem objects indexed by orthography.
+    :ivar lemmes: Dictionary containing all the LexicalItem objects indexed by lemma.
+    :ivar anagrams: Dictionary containing all the LexicalItem objects indexed by anagram form.
+    :ivar base: Lexique383 on which this lexicon is overlaid, or None. See overlay().
     """
 
-    lexique: Dict[str, Any] = OrderedDict()
-    value_errors: List[Any] = []
-    length_errors: List[Any] = []
-    lemmes: Dict[str, List[LexItem]] = defaultdict(list)
-    anagrams: Dict[str, List[LexItem]] = defaultdict(list)
+    lexique: Dict[str, Any]
+    value_errors: List[Any]
+    length_errors: List[Any]
+    lemmes: Dict[str, List[LexItem]]
+    anagrams: Dict[str, List[LexItem]]
 
-    def __init__(self, lexique_path: Optional[str] = None, parser_type: str = 'csv') -> None:
-        self.lexique_path = lexique_path
+    def __init__(self, lexique_path: Union[str, 'os.PathLike[str]', None] = None, parser_type: str = 'csv',
+                 cache: Optional[QueryCache] = None, instrumentation: Optional[Instrumentation] = None,
+                 validation: str = 'count', errors_path: Optional[str] = None, prefork: bool = False) -> None:
+        if lexique_path and not isinstance(lexique_path, (str, os.PathLike)):
+            raise TypeError(f"Argument 'lexique_path' must be of type String, not {type(lexique_path)}")
+        path = os.fspath(lexique_path) if lexique_path else None
+        self._setup(path, cache, instrumentation, validation, errors_path, prefork)
         if parser_type not in {'pandas_csv', 'csv'}:
             raise ValueError(f"The value {parser_type} is not permitted. Only 'pandas_csv' and 'csv' are valid values.")
-        if lexique_path:
-            if not isinstance(lexique_path, str):
-                raise TypeError(f"Argument 'lexique_path' must be of type String, not {type(lexique_path)}")
+        if path:
             try:
-                self._parse_lexique(lexique_path, parser_type)
+                self._parse_lexique(path, parser_type)
             except UnicodeDecodeError as e:
                 raise UnicodeError(f"There was a unicode error while parsing {type(lexique_path)}.") from e
             except FileNotFoundError as e:
@@ -152,11 +212,47 @@ class Lexique383:
         else:
             try:
                 # Tries to load the pre-shipped Lexique38X if no path file to the lexicon is provided.
-                self._parse_lexique(_RESOURCE_PATH_csv, parser_type)
+                self._parse_lexique(_default_lexique_path(), parser_type)
             except UnicodeDecodeError as e:
-                raise UnicodeError(f"There was a unicode error while parsing {type(_RESOURCE_PATH_csv)}.") from e
+                raise UnicodeError(f"There was a unicode error while parsing {type(_default_lexique_path())}.") from e
             except FileNotFoundError as e:
                 raise ValueError(f"Argument 'lexique_path' must be a valid path to Lexique383") from e
+        if instrumentation is not None:
+            for method in instrumentation.methods:
+                # The wrapper only holds a weak reference to the lexicon, which avoids a reference cycle.
+                setattr(self, method, instrumentation.wrap(method, getattr(self, method)))
+        if prefork:
+            self.prepare_for_fork(deduplicate=False)
+        return
+
+    def _setup(self, lexique_path: Optional[str], cache: Optional[QueryCache],
+               instrumentation: Optional[Instrumentation], validation: str, errors_path: Optional[str],
+               prefork: bool = False) -> None:
+        """
+        | Initializes the attributes of an empty lexicon.
+
+        :return:
+        """
+        self.lexique_path = lexique_path
+        self.base: Optional[Lexique383] = None
+        self.lexique = OrderedDict()
+        self.validation_report = ValidationReport(validation)
+        self.value_errors = self.validation_report.value_errors
+        self.length_errors = self.validation_report.length_errors
+        self.errors_path = errors_path
+        self._row_converter = RowConverter(get_type_hints(LexEntryTypes), self.validation_report,
+                                           SHARED_VALUE_FIELDS if prefork else ())
+        self._morphology: Optional[MorphologyIndex] = None
+        self._phonotactics: Optional[PhonotacticIndex] = None
+        self._columns: Optional['ColumnStore'] = None
+        self._neighbourhoods: Dict[str, 'NeighbourhoodIndex'] = {}
+        self._sublexical: Optional['SublexicalStatistics'] = None
+        self._sublexical_path: Optional[str] = None
+        self._overlays: 'weakref.WeakSet[Lexique383]' = weakref.WeakSet()
+        self.lemmes = defaultdict(list)
+        self.anagrams = defaultdict(list)
+        self.cache = cache
+        self.instrumentation = instrumentation
         return
 
     def __repr__(self) -> str:
@@ -165,50 +261,97 @@ class Lexique383:
     def __len__(self) -> int:
         return len(self.lexique)
 
+    def _iter_items(self) -> Iterator[LexItem]:
+        """
+        | Iterates over all the LexItems of the lexicon, homographs included.
+
+        :return:
+            Iterator of LexItem objects.
+        """
+        for entry in self.lexique.values():
+            if isinstance(entry, list):
+                yield from entry
+            else:
+                yield entry
+
     @staticmethod
     def _parse_csv(lexique_path: str) -> Generator[list, Any, None]:    #type: ignore[type-arg]
         """
+        | Streams the rows of the lexique file, decompressing and decoding it while it is read.
+        | The file may be compressed with gzip, bz2, xz or zstd, and encoded in ISO-8859-1 or UTF-8.
 
         :param lexique_path: string.
             Path to the lexique file.
         :return: generator of rows:
             Content of the Lexique38x database.
         """
-        with open(lexique_path, 'r', encoding='iso-8859-1') as csv_file:
-            raw_content = csv_file.readlines()
-            content = (row.strip().split('\t') for row in raw_content[1:])
-            return content
+        from .sources import open_lexique
+        with open_lexique(lexique_path) as csv_file:
+            # Skips the header.
+            next(csv_file, None)
+            for row in csv_file:
+                yield row.strip().split('\t')
 
-    def _parse_lexique(self, lexique_path: str, parser_type: str) -> None:
+    def _read_lexique(self, lexique_path: str, parser_type: str) -> Iterator[list]:  # type: ignore[type-arg]
         """
-        | Parses the given lexique file and creates 2 hash tables to store the data.
+        | Reads the given lexique file with the requested parser.
 
         :param lexique_path: string.
             Path to the lexique file.
         :param parser_type: string.
             Can be either 'csv', 'pandas_csv'.
-        :return:
+        :return: iterator of rows:
+            Content of the Lexique38x database.
         """
         try:
             if parser_type == 'pandas_csv':
-                df = pd.read_csv(lexique_path, delimiter='\t')
+                # pandas is only imported by this parser, since importing it takes longer than importing pylexique.
+                import pandas as pd
+                from .sources import detect_encoding, open_source
+                encoding = detect_encoding(lexique_path)
+                with open_source(lexique_path) as source:
+                    # Reads every value as a string, like the csv parser, so that words such as 'nan' and
+                    # 'null' are not read as missing values.
+                    df = pd.read_csv(source, delimiter='\t', encoding=encoding, dtype=str, na_filter=False)
                 content = (list(row) for row in df.values)
             elif parser_type == 'csv':
                 content = self._parse_csv(lexique_path)
             else:
                 content = self._parse_csv(lexique_path)
         except UnicodeDecodeError:
-            logger.warn(f"there was an issue while parsing the file {lexique_path}."
-                        f" Trying again with built-in csv parser")
+            logger.warning(f"there was an issue while parsing the file {lexique_path}."
+                           f" Trying again with built-in csv parser")
             content = self._parse_csv(lexique_path)
-        self._create_db(content)
-        if self.value_errors:
-            self._save_errors(self.value_errors, _VALUE_ERRORS_PATH)
-        if self.length_errors:
-            self._save_errors(self.length_errors, _LENGTH_ERRORS_PATH)
+        return content
+
+    def _parse_lexique(self, lexique_path: str, parser_type: str) -> None:
+        """
+        | Parses the given lexique file and creates 2 hash tables to store the data.
+
+        :param lexique_path: string.
+            Path to the lexique file.
+        :param parser_type: string.
+            Can be either 'csv', 'pandas_csv'.
+        :return:
+        """
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            self._create_db(self._read_lexique(lexique_path, parser_type))
+            if self.errors_path:
+                self.validation_report.save(self.errors_path)
+            return
+        # The csv parser streams the file, so reading it is timed with the rows, in 'tokenize'.
+        with instrumentation.phase('create_db') as stats:
+            self._create_db_instrumented(self._read_lexique(lexique_path, parser_type), instrumentation)
+            stats.rows = len(self.lexique)
+        if self.errors_path:
+            with instrumentation.phase('save_errors') as stats:
+                self.validation_report.save(self.errors_path)
+                stats.errors = self.validation_report.error_count
+        instrumentation.publish()
         return
 
-    def _create_db(self, lexicon: Generator[list, Any, None]) -> None:  #type: ignore[type-arg]
+    def _create_db(self, lexicon: Iterator[list]) -> None:  #type: ignore[type-arg]
         """
         | Creates 2 hash tables populated with the entries in lexique if it does not exist yet.
         | One hash table holds the LexItems, the other holds the same data but grouped by lemmma to give access to all lexical forms of a word.
@@ -217,69 +360,110 @@ class Lexique383:
             Iterable containing the lexique383 entries.
         :return:
         """
+        convert_entries = self._row_converter.convert
         for row in lexicon:
             try:
-                converted_row_fields = self._convert_entries(row)
+                converted_row_fields = convert_entries(row)
+            except LexiqueValidationError:
+                raise
             except ValueError:
                 continue
             lexical_entry = LexItem(*converted_row_fields)
-            self.lemmes[lexical_entry.lemme].append(lexical_entry)
             sorted_form = ''.join(sorted(lexical_entry.ortho))
-            self.anagrams[sorted_form].append(lexical_entry)
-            if converted_row_fields[0] in self.lexique and not isinstance(self.lexique[converted_row_fields[0]], list):
-                self.lexique[converted_row_fields[0]] = [self.lexique[converted_row_fields[0]]]
-                self.lexique[converted_row_fields[0]].append(lexical_entry)
-            elif converted_row_fields[0] in self.lexique and isinstance(self.lexique[converted_row_fields[0]], list):
-                self.lexique[converted_row_fields[0]].append(lexical_entry)
-            else:
-                self.lexique[converted_row_fields[0]] = lexical_entry
+            self._index_entry(lexical_entry, sorted_form)
+        return
+
+    def _create_db_instrumented(self, lexicon: Iterator[list],  # type: ignore[type-arg]
+                                instrumentation: Instrumentation) -> None:
+        """
+        | Same as _create_db(), but accumulates the time spent in each step of the row processing
+        | ('tokenize', 'convert', 'build', 'anagram_keys' and 'index') into the instrumentation.
+        | 'tokenize' includes reading, decompressing and decoding the file, whose rows are streamed.
+
+        :param lexicon: Iterable.
+            Iterable containing the lexique383 entries.
+        :param instrumentation:
+            Instrumentation collecting the statistics.
+        :return:
+        """
+        tokenize = convert = build = anagram_keys = index = 0.0
+        rows = loaded = 0
+        errors = self.validation_report.error_count
+        convert_entries = self._row_converter.convert
+        iterator = iter(lexicon)
+        while True:
+            t0 = perf_counter()
+            try:
+                row = next(iterator)
+            except StopIteration:
+                tokenize += perf_counter() - t0
+                break
+            t1 = perf_counter()
+            tokenize += t1 - t0
+            rows += 1
+            try:
+                converted_row_fields = convert_entries(row)
+            except LexiqueValidationError:
+                raise
+            except ValueError:
+                convert += perf_counter() - t1
+                continue
+            t2 = perf_counter()
+            lexical_entry = LexItem(*converted_row_fields)
+            t3 = perf_counter()
+            sorted_form = ''.join(sorted(lexical_entry.ortho))
+            t4 = perf_counter()
+            self._index_entry(lexical_entry, sorted_form)
+            t5 = perf_counter()
+            convert += t2 - t1
+            build += t3 - t2
+            anagram_keys += t4 - t3
+            index += t5 - t4
+            loaded += 1
+        errors = self.validation_report.error_count - errors
+        instrumentation.add('tokenize', tokenize, calls=1, rows=rows)
+        instrumentation.add('convert', convert, calls=1, rows=rows, errors=errors)
+        instrumentation.add('build', build, calls=1, rows=loaded)
+        instrumentation.add('anagram_keys', anagram_keys, calls=1, rows=loaded)
+        instrumentation.add('index', index, calls=1, rows=loaded)
+        return
+
+    def _index_entry(self, lexical_entry: LexItem, sorted_form: str) -> None:
+        """
+        | Adds a LexItem to the lexique, lemmes and anagrams hash tables.
+
+        :param lexical_entry:
+            LexItem to add.
+        :param sorted_form:
+            Anagram key of the LexItem, ie its sorted orthography.
+        :return:
+        """
+        self.lemmes[lexical_entry.lemme].append(lexical_entry)
+        self.anagrams[sorted_form].append(lexical_entry)
+        ortho = lexical_entry.ortho
+        if ortho in self.lexique and not isinstance(self.lexique[ortho], list):
+            self.lexique[ortho] = [self.lexique[ortho]]
+            self.lexique[ortho].append(lexical_entry)
+        elif ortho in self.lexique and isinstance(self.lexique[ortho], list):
+            self.lexique[ortho].append(lexical_entry)
+        else:
+            self.lexique[ortho] = lexical_entry
         return
 
     def _convert_entries(self, row_fields: Union[List[str], List[Union[str, float, int, bool]]]) -> ConvertedRow:
         """
         | Convert entries from `strings` to `int`, `bool` or `float` and generates
-        | a new list with typed entries.
+        | a new list with typed entries, using the coercion plan of the RowConverter.
 
         :param row_fields:
             List of column entries representing a row.
         :return: ConvertedRow:
             List of typed column entries representing a typed row.
+        :raises: ValueError.
+            If the row does not have 35 fields, or LexiqueValidationError in 'strict' validation mode.
         """
-        errors = defaultdict(list)
-        converted_row_fields = []
-        for attr, value in zip(LEXIQUE383_FIELD_NAMES, row_fields):
-            if isinstance(value, float) and isnan(value):
-                value = ''
-            if attr in {'freqlemfilms2', 'freqlemlivres', 'freqfilms2', 'freqlivres', 'old20', 'pld20'}:
-                if not isinstance(value, float):
-                    if (value != '' or value != ' ') and ',' in value:
-                        value = value.replace(',', '.')
-                        value = float(value)
-            if attr == 'islem':
-                if isinstance(value, str):
-                    value = value.strip()
-                if value != '' and value not in ('0', '1', 0, 1):
-                    value = 0
-                try:
-                    value = bool(int(value))
-                except ValueError:
-                    errors[row_fields[0]].append({attr: value})
-                    value = value
-                    self.value_errors.append(errors)
-            if attr in {'nbhomogr', 'nbhomoph', 'nblettres', 'nbphons',
-                        'voisorth', 'voisphon', 'puorth', 'puphon', 'nbsyll'}:
-                if value != '' or value != ' ':
-                    try:
-                        value = int(value)
-                    except ValueError:
-                        errors[row_fields[0]].append({attr: value})
-                        value = value
-                        self.value_errors.append(errors)
-            converted_row_fields.append(value)
-        if len(converted_row_fields) != 35:
-            self.length_errors.append((converted_row_fields, row_fields))
-            raise ValueError
-        return converted_row_fields  # type: ignore[return-value]
+        # The converter is compiled at runtime, so its return type is not known statically.
+        return cast(ConvertedRow, self._row_converter.convert(row_fields))
 
     def get_lex(self, words: Union[Tuple[str, ...], str]) -> Dict[str, Union[LexItem, List[LexItem]]]:
         """
@@ -312,10 +496,24 @@ class Lexique383:
             raise TypeError
         return results
 
-    def get_all_forms(self, word: str) -> List[LexItem]:
+    def get_all_forms(self, word: str) -> SequenceType[LexItem]:
         """
         Gets all lexical forms of a given word.
 
+        :param word:
+            String.
+        :return:
+            List of LexItem objects sharing the same root lemma.
+            When a cache is configured, a tuple shared by all the callers is returned instead.
+        :raises: ValueError.
+        :raises: TypeError.
+        """
+        return self._cached_query('get_all_forms', word, self._get_all_forms)
+
+    def _get_all_forms(self, word: str) -> List[LexItem]:
+        """
+        Computes all lexical forms of a given word, bypassing the cache.
+
         :param word:
             String.
         :return:
@@ -341,9 +539,23 @@ class Lexique383:
             raise TypeError
         return lemmes
 
-    def get_anagrams(self, word: str) -> List[LexItem]:
+    def get_anagrams(self, word: str) -> SequenceType[LexItem]:
         """
-        Gets all lexical forms of a given word.
+        Gets all the anagrams of a given word.
+
+        :param word:
+            String.
+        :return:
+            List of LexItem objects which are anagrams of the given word.
+            When a cache is configured, a tuple shared by all the callers is returned instead.
+        :raises: ValueError.
+        :raises: TypeError.
+        """
+        return self._cached_query('get_anagrams', word, self._get_anagrams)
+
+    def _get_anagrams(self, word: str) -> List[LexItem]:
+        """
+        Computes all the anagrams of a given word, bypassing the cache.
 
         :param word:
             String.
@@ -371,22 +583,697 @@ class Lexique383:
         final_anagrams = [lex_item for lex_item in anagrams if lex_item.ortho != word.lower()]
         return final_anagrams
 
-    @staticmethod
-    def _save_errors(errors: Union[
-        List[Tuple[List[Union[str, float, int, bool]], List[str]]], List[DefaultDict[str, List[Dict[str, str]]]]],
-                     errors_path: str) -> None:
+    def _cached_query(self, query: str, word: str,
+                      compute: Callable[[str], List[LexItem]]) -> SequenceType[LexItem]:
+        """
+        | Serves a derived query from the cache if one is configured, computing and storing it otherwise.
+
+        :param query:
+            Name of the query, used as part of the cache key.
+        :param word:
+            String.
+        :param compute:
+            Function computing the result of the query for the given word.
+        :return:
+            Result of the query.
+        """
+        if self.cache is None:
+            return compute(word)
+        key = (query, word.lower())
+        result = self.cache.get(key)
+        if result is _MISSING:
+            result = tuple(compute(word))
+            self.cache.put(key, result)
+        return result  # type: ignore[no-any-return]
+
+    def cache_info(self) -> Optional[CacheInfo]:
+        """
+        | Reports the hits, misses and evictions of the query cache.
+
+        :return: CacheInfo or None.
+            None if no cache is configured.
+        """
+        if self.cache is None:
+            return None
+        return self.cache.info()
+
+    def cache_clear(self) -> None:
+        """
+        | Empties the query cache, if one is configured.
+
+        :return:
+        """
+        if self.cache is not None:
+            self.cache.clear()
+        return
+
+    @property
+    def morphology(self) -> MorphologyIndex:
+        """
+        | Derivational morphology index of the lexicon, built from the morphoder field the first time it is used.
+
+        :return: MorphologyIndex.
+        """
+        if self._morphology is None:
+            with gc_paused():
+                self._morphology = MorphologyIndex(self._iter_items())
+        return self._morphology
+
+    def get_derivations(self, root: str) -> List[LexItem]:
+        """
+        Gets all the lexical items derived from a given root, ie whose morphoder contains it.
+
+        :param root:
+            String.
+        :return:
+            List of LexItem objects. The list is empty if the root is unknown.
+        """
+        return cast(List[LexItem], self.morphology.derivations(root))
+
+    def get_affixed(self, affix: str, position: str = 'suffix') -> List[LexItem]:
+        """
+        Gets all the derived lexical items ending or starting with a given affix, eg all the words with suffix -ment.
+
+        :param affix:
+            String.
+        :param position:
+            'suffix' and 'prefix' are valid values. 'suffix' is the default value.
+        :return:
+            List of LexItem objects. The list is empty if the affix is unknown.
+        :raises: ValueError.
+        """
+        if position == 'suffix':
+            return cast(List[LexItem], self.morphology.with_suffix(affix))
+        if position == 'prefix':
+            return cast(List[LexItem], self.morphology.with_prefix(affix))
+        raise ValueError(f"The value {position} is not permitted. Only 'suffix' and 'prefix' are valid values.")
+
+    def get_morphological_family(self, word: str) -> Set[str]:
+        """
+        Gets the morphological family of a given word, ie the lemmas of all the words sharing its root.
+        The root is taken from the lemmas of the word, so that its inflected forms have the same family.
+        The size of the family is the length of the returned set.
+
+        :param word:
+            String.
+        :return:
+            Set of lemmas.
+        :raises: KeyError.
+        """
+        lex_entry = self.lexique[word.lower()]
+        entries = lex_entry if isinstance(lex_entry, list) else [lex_entry]
+        family: Set[str] = set()
+        for entry in entries:
+            lemmas = [lemma for lemma in self.lemmes.get(entry.lemme, ()) if lemma.islem] or [entry]
+            for lemma in lemmas:
+                family |= self.morphology.family(lemma)
+        return family
+
+    @property
+    def phonotactics(self) -> PhonotacticIndex:
+        """
+        | Index of the lexicon by CV structure, syllabification and syllable count, built the first time it is used.
+
+        :return: PhonotacticIndex.
+        """
+        if self._phonotactics is None:
+            with gc_paused():
+                self._phonotactics = PhonotacticIndex(self._iter_items())
+        return self._phonotactics
+
+    def find_by_pattern(self, cvcv: Optional[str] = None, p_cvcv: Optional[str] = None,
+                        cv_cv: Optional[str] = None, syll: Optional[str] = None, orthosyll: Optional[str] = None,
+                        nbsyll: Union[None, int, SequenceType[int]] = None) -> Iterator[LexItem]:
         """
-        Saves the mismatched key/values in Lexique383 based on type coercion.
+        Lazily finds the lexical items matching patterns over their CV structure and syllables,
+        eg the 2 syllable words with the CVCV orthographic structure whose second syllable is /ʁe/:
+        find_by_pattern(cvcv='CVCV', syll='*-ʁe').
+        In a pattern, '?' matches one character, '*' any characters within a syllable,
+        '**' any characters across syllables and '[...]' one character of a set. Syllables are separated by '-'.
+        The syll pattern may be written in IPA or in the phonetic alphabet of Lexique383.
 
-        :param errors:
-            List of errors encountered while parsing Lexique38x
-        :param errors_path:
-            Path to save the errors.
+        :param cvcv:
+            Pattern over the orthographic CV structure.
+        :param p_cvcv:
+            Pattern over the phonological CV structure.
+        :param cv_cv:
+            Pattern over the syllabified phonological CV structure.
+        :param syll:
+            Pattern over the phonological syllables.
+        :param orthosyll:
+            Pattern over the orthographic syllables.
+        :param nbsyll:
+            Number of syllables, or sequence of accepted numbers of syllables.
         :return:
+            Iterator of LexItem objects.
+        :raises: ValueError.
+            If no constraint is given.
+        """
+        constraints = (('cvcv', cvcv), ('p_cvcv', p_cvcv), ('cv_cv', cv_cv), ('syll', syll), ('orthosyll', orthosyll))
+        patterns = {field: pattern for field, pattern in constraints if pattern is not None}
+        if 'syll' in patterns:
+            patterns['syll'] = ipa_to_lexique(patterns['syll'])
+        return cast(Iterator[LexItem], self.phonotactics.search(patterns, nbsyll))
+
+    @property
+    def columns(self) -> 'ColumnStore':
+        """
+        | Columnar copy of the fields of all the LexItems, used by the aggregations.
+        | It is built the first time it is used, and rebuilt after the lexicon is updated.
+
+        :return: ColumnStore.
+        """
+        if self._columns is None:
+            from .aggregation import ColumnStore
+            self._columns = ColumnStore(self._iter_items(), get_type_hints(LexEntryTypes))
+        return self._columns
+
+    def aggregate(self, values: Union[str, SequenceType[str]] = (), by: Union[str, SequenceType[str], None] = None,
+                  stats: SequenceType[str] = ('mean',), where: Optional[Mapping[str, 'Filter']] = None,
+                  as_frame: bool = False) -> Any:
+        """
+        Aggregates numerical fields over all the lexical items, homographs included, optionally filtered and grouped
+        by the values of other fields, eg the mean frequency per grammatical category:
+        aggregate('freqfilms2', by='cgram'), or the number of words per syllable count: aggregate(by='nbsyll').
+        The aggregations run on numpy arrays, see ColumnStore.aggregate().
+
+        :param values:
+            Name or sequence of names of the numerical fields to aggregate.
+        :param by:
+            Name or sequence of names of the fields to group by.
+        :param stats:
+            Statistics to compute: 'count', 'sum', 'mean', 'std', 'var', 'min', 'max' or 'median'.
+            'mean' is the default value. The number of items is always included as 'count'.
+        :param where:
+            Mapping of field names to filters: a value, a collection of values or a callable.
+        :param as_frame: bool.
+            Whether to return a pandas DataFrame.
+        :return:
+            Dictionary of statistics, or dictionary of the group keys to their statistics, or DataFrame.
+        :raises: ValueError.
+        """
+        return self.columns.aggregate(values, by, stats, where, as_frame)
+
+    def quantiles(self, field: str, q: Union[float, SequenceType[float]] = (0.25, 0.5, 0.75),
+                  by: Union[str, SequenceType[str], None] = None,
+                  where: Optional[Mapping[str, 'Filter']] = None) -> Any:
+        """
+        Computes quantiles of a numerical field over all the lexical items, optionally filtered and grouped,
+        eg the quartiles of the frequency of the verbs: quantiles('freqfilms2', where={'cgram': 'VER'}).
+
+        :param field:
+            Name of the numerical field.
+        :param q:
+            Quantile or sequence of quantiles, between 0 and 1. The quartiles are the default value.
+        :param by:
+            Name or sequence of names of the fields to group by.
+        :param where:
+            Mapping of field names to filters: a value, a collection of values or a callable.
+        :return:
+            Quantiles, or dictionary of the group keys to their quantiles.
+        :raises: ValueError.
+        """
+        return self.columns.quantiles(field, q, by, where)
+
+    def histogram(self, field: str, bins: Union[int, SequenceType[float]] = 10,
+                  range: Optional[Tuple[float, float]] = None, by: Union[str, SequenceType[str], None] = None,
+                  where: Optional[Mapping[str, 'Filter']] = None) -> Dict[Any, Any]:
+        """
+        Counts the values of a numerical field in bins, over all the lexical items, optionally filtered and grouped.
+
+        :param field:
+            Name of the numerical field.
+        :param bins:
+            Number of bins of equal width, or sequence of the edges of the bins. 10 is the default value.
+        :param range:
+            Lower and upper bounds of the bins. The range of the values by default.
+        :param by:
+            Name or sequence of names of the fields to group by.
+        :param where:
+            Mapping of field names to filters: a value, a collection of values or a callable.
+        :return:
+            Dictionary with the 'edges' of the bins and their 'counts'.
+        :raises: ValueError.
+        """
+        return self.columns.histogram(field, bins, range, by, where)
+
+    def neighbourhood(self, field: str = 'ortho') -> 'NeighbourhoodIndex':
+        """
+        | Index of the distinct orthographic forms ('ortho') or phonological forms ('phon') of the lexicon,
+        | used by the neighbourhood metrics. It is built the first time it is used, and rebuilt after the lexicon
+        | is updated.
+
+        :param field:
+            'ortho' or 'phon'. 'ortho' is the default value.
+        :return: NeighbourhoodIndex.
+        :raises: ValueError.
+        """
+        if field not in ('ortho', 'phon'):
+            raise ValueError("The field must be 'ortho' or 'phon', not {0!r}".format(field))
+        if field not in self._neighbourhoods:
+            from .neighbourhood import NeighbourhoodIndex
+            forms = self.lexique if field == 'ortho' else (item.phon for item in self._iter_items())
+            self._neighbourhoods[field] = NeighbourhoodIndex(forms)
+        return self._neighbourhoods[field]
+
+    def get_neighbourhood_metrics(self, words: Union[str, SequenceType[str]],
+                                  phons: Union[str, SequenceType[str], None] = None, n: int = 20,
+                                  processes: Optional[int] = None) -> List[Dict[str, Union[float, int]]]:
+        """
+        Computes the neighbourhood metrics of arbitrary strings, words of the lexicon or not, eg of pseudowords:
+        their OLD20 (mean Levenshtein distance to the 20 nearest orthographic forms of the lexicon) and their number
+        of orthographic neighbours in the sense of Coltheart (voisorth), and, if their phonological forms are given
+        in the phonetic alphabet of Lexique383, their PLD20 and number of phonological neighbours (voisphon).
+        For the words of the lexicon the metrics are computed like the fields of the same names.
+        In a single process, each form takes about 3.5ms with the Lexique383 indexes, so the orthographic and
+        phonological metrics of 10,000 words take over a minute. Pass processes to spread large batches over
+        a pool of workers.
+
+        :param words:
+            Orthographic form or sequence of orthographic forms.
+        :param phons:
+            Phonological form or sequence of phonological forms, aligned with the orthographic forms.
+        :param n:
+            Number of nearest forms. 20 is the default value.
+        :param processes:
+            Number of worker processes for large batches. The strings are processed in the current process by default.
+        :return:
+            List of dictionaries with the 'old20' and 'voisorth' keys, and the 'pld20' and 'voisphon' keys
+            if the phonological forms are given.
+        :raises: ValueError.
+            If the phonological forms are not aligned with the orthographic forms.
+        """
+        words = [words] if isinstance(words, str) else list(words)
+        metrics: List[Dict[str, Union[float, int]]] = [
+            {'old20': distance, 'voisorth': size} for distance, size in
+            self.neighbourhood('ortho').measure([word.lower() for word in words], n, processes)]
+        if phons is not None:
+            phons = [phons] if isinstance(phons, str) else list(phons)
+            if len(phons) != len(words):
+                raise ValueError('Got {0} phonological forms for {1} words'.format(len(phons), len(words)))
+            for metric, (distance, size) in zip(metrics, self.neighbourhood('phon').measure(phons, n, processes)):
+                metric.update(pld20=distance, voisphon=size)
+        return metrics
+
+    def get_neighbours(self, word: str, field: str = 'ortho') -> List[str]:
+        """
+        Gets the neighbours of a string in the sense of Coltheart: the forms of the lexicon of the same length
+        differing from it by the substitution of one character.
+
+        :param word:
+            Orthographic form, or phonological form if field is 'phon'.
+        :param field:
+            'ortho' or 'phon'. 'ortho' is the default value.
+        :return:
+            List of forms.
+        :raises: ValueError.
+        """
+        return self.neighbourhood(field).neighbours(word.lower() if field == 'ortho' else word)
+
+    def sublexical_statistics(self, cache_path: Optional[str] = None) -> 'SublexicalStatistics':
+        """
+        | Frequency tables of the letter and phoneme bigrams and of the syllables of the lexicon, used to generate
+        | pseudowords. They are computed the first time they are used, and recomputed after the lexicon is updated.
+
+        :param cache_path:
+            Path of a json file where the tables are saved, and loaded from as long as the lexicon is unchanged.
+            Tables already computed are saved at a cache path they were not saved at yet.
+        :return: SublexicalStatistics.
+        """
+        if self._sublexical is None:
+            from .pseudowords import SublexicalStatistics
+            if cache_path is None:
+                self._sublexical = SublexicalStatistics(self._iter_items())
+            else:
+                self._sublexical = SublexicalStatistics.cached(self._iter_items(), cache_path)
+            self._sublexical_path = cache_path
+        elif cache_path is not None and cache_path != self._sublexical_path:
+            self._sublexical.save(cache_path)
+            self._sublexical_path = cache_path
+        return self._sublexical
+
+    def generate_pseudowords(self, count: int = 1, length: 'Bounds' = None, nbsyll: 'Bounds' = None,
+                             bigram_frequency: 'Bounds' = None, reject_homophones: bool = False,
+                             seed: Optional[int] = None, cache_path: Optional[str] = None) -> List['Pseudoword']:
+        """
+        Generates pseudowords by recombining the syllables of the lexicon at the positions they occur in,
+        eg 10 pseudowords of 2 syllables and 5 to 7 letters: generate_pseudowords(10, length=(5, 7), nbsyll=2).
+        The candidates which are words of the lexicon are rejected. Each constraint is a value
+        or a (minimum, maximum) tuple, see PseudowordGenerator.generate().
+
+        :param count:
+            Number of pseudowords.
+        :param length:
+            Number of letters.
+        :param nbsyll:
+            Number of syllables.
+        :param bigram_frequency:
+            Mean frequency of the letter bigrams, see SublexicalStatistics.bigram_frequency().
+        :param reject_homophones: bool.
+            Whether to reject the homophones of words too. False is the default value.
+        :param seed:
+            Seed of the random generator, for reproducible pseudowords.
+        :param cache_path:
+            Path of a json file caching the statistics of the lexicon, see sublexical_statistics().
+        :return:
+            List of Pseudoword objects, which may be shorter than count if the constraints are too narrow.
+        """
+        from .pseudowords import PseudowordGenerator
+        phons = {item.phon for item in self._iter_items()} if reject_homophones else frozenset()
+        generator = PseudowordGenerator(self.sublexical_statistics(cache_path), self.lexique, phons, seed)
+        return generator.generate(count, length, nbsyll, bigram_frequency)
+
+    def prepare_for_fork(self, deduplicate: bool = True, build_indexes: bool = False) -> int:
+        """
+        Prepares the lexicon to be shared by processes forked after it is loaded, eg the workers of a
+        pre-forking server like gunicorn with preload_app. The repeated field values are shared, and all the objects
+        are moved out of the reach of the garbage collector, so that its collections in the workers do not copy
+        the memory pages holding the lexicon. The pages of the entries the workers look up are still copied
+        when their reference counts change.
+        Call it last in the parent process, since the objects allocated afterwards are not frozen.
+
+        :param deduplicate:
+            Makes the LexItems share their repeated values. Already done at load time with Lexique383(prefork=True).
+        :param build_indexes:
+            Builds the morphology and phonotactics indexes in the parent, instead of in every worker using them.
+            False is the default value.
+        :return:
+            Number of objects frozen.
+        """
+        with gc_paused():
+            if deduplicate:
+                deduplicate_values(self._iter_items())
+            if build_indexes:
+                # Reading the properties forces the lazy builds of the indexes.
+                self._morphology = self.morphology
+                self._phonotactics = self.phonotactics
+        return cast(int, freeze_heap())
+
+    def to_shared_memory(self, name: Optional[str] = None) -> 'SharedLexicon':
+        """
+        Publishes the lexicon into a shared memory segment, which other processes attach to by name in O(1).
+        The returned SharedLexicon pickles as the name of the segment, so it can be passed to the tasks of
+        a multiprocessing.Pool instead of the lexicon. The segment is unlinked when it is closed, garbage collected,
+        or when this process exits.
+
+        :param name:
+            Name of the segment. A unique name is generated by default.
+        :return: SharedLexicon.
+        """
+        from .shared import SharedLexicon
+        return SharedLexicon.create(self.lexique, self.lemmes, self.anagrams, name)
 
+    def to_membership_filter(self, lemmas: bool = False, kind: str = 'perfect_hash', fingerprint_bits: int = 16,
+                             false_positive_rate: float = 0.01) -> Union['PerfectHashSet', 'BloomFilter']:
         """
-        with open(errors_path, 'w', encoding='utf-8') as json_file:
-            json.dump(errors, json_file, indent=4)
+        Builds a compact membership structure over the words of the lexicon, answering whether a string is a word
+        without loading the lexicon once it is saved and loaded back, eg:
+        to_membership_filter().save('words.bin'), then 'manger' in pylexique.membership.load_filter('words.bin').
+        The words are the lowercased keys of the lexique table, so the strings must be lowercased too.
+
+        :param lemmas: bool.
+            Whether to include the lemmas. False is the default value.
+        :param kind:
+            'perfect_hash' for a PerfectHashSet, which also maps the words to dense row ids,
+            or 'bloom' for a BloomFilter. 'perfect_hash' is the default value.
+        :param fingerprint_bits:
+            Size of the fingerprints of a PerfectHashSet: 8, 16 or 32 bits. 16 is the default value.
+        :param false_positive_rate:
+            False positive rate of a BloomFilter. 0.01 is the default value.
+        :return:
+            PerfectHashSet or BloomFilter.
+        :raises: ValueError.
+        """
+        from .membership import BloomFilter, PerfectHashSet
+        keys = list(self.lexique)
+        if lemmas:
+            keys.extend(self.lemmes)
+        if kind == 'perfect_hash':
+            return PerfectHashSet(keys, fingerprint_bits)
+        if kind == 'bloom':
+            return BloomFilter(keys, false_positive_rate)
+        raise ValueError("The kind must be 'perfect_hash' or 'bloom', not {0!r}".format(kind))
+
+    def overlay(self, *layer_paths: str, cache: Optional[QueryCache] = None) -> 'Lexique383':
+        """
+        Creates a lexicon layered on top of this one, whose updates do not modify this lexicon.
+        The tables of the overlay are copy-on-write views of the tables of this lexicon,
+        so creating an overlay is O(1) and its memory grows with the number of changes only.
+        Overlays can be stacked. Changes made to this lexicon are visible through its overlays,
+        except for the words the overlays have changed: the caches and the morphological and phonotactic
+        indexes of the overlays are updated, while their columns, neighbourhood indexes and sublexical
+        statistics are rebuilt in O(N) the next time they are used.
+
+        :param layer_paths:
+            Paths to layer files to load in the overlay, in order. See load_layer().
+        :param cache: QueryCache or None.
+            Optional query cache of the overlay. The cache of this lexicon is not shared.
+        :return:
+            New Lexique383 instance.
+        """
+        layer = self.__class__.__new__(self.__class__)
+        layer._setup(self.lexique_path, cache, None, self.validation_report.mode, None)
+        layer.base = self
+        layer.lexique = LayeredDict(self.lexique)
+        layer.lemmes = LayeredDict(self.lemmes)
+        layer.anagrams = LayeredDict(self.anagrams)
+        self._overlays.add(layer)
+        for layer_path in layer_paths:
+            layer.load_layer(layer_path)
+        return layer
+
+    def load_layer(self, layer_path: str) -> None:
+        """
+        Applies the deletions, then the additions, of a json or tsv layer file to this lexicon.
+        Tsv layers have the format of Lexique383 and their rows are validated like the rows of the lexicon.
+        Json layers hold a list of entries, or an object with an "entries" list and a "delete" list of criteria.
+        See pylexique.overlay.read_layer().
+
+        :param layer_path:
+            String.
+        :return:
+        :raises: ValueError.
+            If an entry of the layer is malformed.
+        """
+        entries, deletions = read_layer(layer_path)
+        for criteria in deletions:
+            criteria = dict(criteria)
+            word = criteria.pop('ortho', None)
+            if word is None:
+                raise ValueError(f"The deletion {criteria} of the layer {layer_path} has no 'ortho' field.")
+            if word not in self.lexique:
+                logger.warning('The word {} of the layer {} is not in the lexicon'.format(word, layer_path))
+                continue
+            self.remove_entries(word, **criteria)
+        convert_entries = self._row_converter.convert
+        for entry in entries:
+            if isinstance(entry, list):
+                try:
+                    entry = LexItem(*convert_entries(entry))
+                except LexiqueValidationError:
+                    raise
+                except ValueError:
+                    continue
+            self.add_entry(entry)
+        return
+
+    def add_entry(self, entry: Union[LexItem, Mapping[str, Any]]) -> LexItem:
+        """
+        Adds an entry to the lexicon, updating all its tables and indexes.
+        An existing entry with the same ortho, lemme, cgram, genre and nombre is replaced.
+        The cost is proportional to the number of entries sharing the ortho, lemme or anagram form of the entry.
+
+        :param entry:
+            LexItem, or mapping of field names to typed values. The missing fields are empty strings.
+        :return:
+            The LexItem added.
+        :raises: ValueError.
+            If the mapping has unknown fields or no 'ortho' field.
+        """
+        if not isinstance(entry, LexItem):
+            unknown = set(entry) - set(LEXIQUE383_FIELD_NAMES)
+            if unknown or 'ortho' not in entry:
+                raise ValueError(f"The entry {dict(entry)} must have an 'ortho' field and only fields of Lexique383.")
+            entry = LexItem(*(entry.get(field, '') for field in LEXIQUE383_FIELD_NAMES))
+        key = tuple(getattr(entry, field) for field in _ENTRY_KEY)
+        for existing in self._entries_of(entry.ortho):
+            if tuple(getattr(existing, field) for field in _ENTRY_KEY) == key:
+                self._unlink(existing)
+        self._link(entry)
+        return entry
+
+    def remove_entries(self, word: str, **criteria: Any) -> List[LexItem]:
+        """
+        Removes the entries of a word from the lexicon, updating all its tables and indexes.
+
+        :param word:
+            String.
+        :param criteria:
+            Field values the removed entries must have, eg cgram='NOM'.
+            All the entries of the word are removed by default.
+        :return:
+            List of the removed LexItem objects.
+        :raises: KeyError.
+            If the word is not in the lexicon.
+        :raises: ValueError.
+            If a criterion is not a field of Lexique383.
+        """
+        unknown = set(criteria) - set(LEXIQUE383_FIELD_NAMES)
+        if unknown:
+            raise ValueError(f"The fields {', '.join(sorted(unknown))} are not fields of Lexique383.")
+        if word not in self.lexique:
+            raise KeyError(word)
+        removed = [entry for entry in self._entries_of(word)
+                   if all(getattr(entry, field) == value for field, value in criteria.items())]
+        for entry in removed:
+            self._unlink(entry)
+        return removed
+
+    def _entries_of(self, word: str) -> List[LexItem]:
+        entry = self.lexique.get(word)
+        if entry is None:
+            return []
+        return list(entry) if isinstance(entry, list) else [entry]
+
+    def _link(self, entry: LexItem) -> None:
+        """
+        | Adds a LexItem to the tables and the built indexes, replacing the lists instead of
+        | appending to them since they may be shared with a base lexicon.
+
+        :param entry:
+            LexItem to add.
+        :return:
+        """
+        ortho = entry.ortho
+        current = self.lexique.get(ortho)
+        if current is None:
+            self.lexique[ortho] = entry
+        elif isinstance(current, list):
+            self.lexique[ortho] = current + [entry]
+        else:
+            self.lexique[ortho] = [current, entry]
+        sorted_form = ''.join(sorted(ortho))
+        for table, key in ((self.lemmes, entry.lemme), (self.anagrams, sorted_form)):
+            table[key] = list(table.get(key, ())) + [entry]
+        if self._morphology is not None:
+            self._morphology.add(entry)
+        if self._phonotactics is not None:
+            self._phonotactics.add(entry)
+        self._columns = None
+        self._neighbourhoods = {}
+        self._sublexical = None
+        self._invalidate(entry, sorted_form)
+        self._follow(entry, sorted_form, True)
+        return
+
+    def _unlink(self, entry: LexItem) -> None:
+        """
+        | Removes a LexItem from the tables and the built indexes, without modifying the lists in place.
+
+        :param entry:
+            LexItem to remove.
+        :return:
+        """
+        sorted_form = ''.join(sorted(entry.ortho))
+        self._invalidate(entry, sorted_form)
+        remaining = [existing for existing in self._entries_of(entry.ortho) if existing is not entry]
+        if not remaining:
+            del self.lexique[entry.ortho]
+        else:
+            self.lexique[entry.ortho] = remaining[0] if len(remaining) == 1 else remaining
+        for table, key in ((self.lemmes, entry.lemme), (self.anagrams, sorted_form)):
+            remaining = [existing for existing in table.get(key, ()) if existing is not entry]
+            if remaining:
+                table[key] = remaining
+            elif key in table:
+                del table[key]
+        if self._morphology is not None:
+            self._morphology.discard(entry)
+        if self._phonotactics is not None:
+            self._phonotactics.discard(entry)
+        self._columns = None
+        self._neighbourhoods = {}
+        self._sublexical = None
+        self._follow(entry, sorted_form, False)
+        return
+
+    def _invalidate(self, entry: LexItem, sorted_form: str) -> None:
+        """
+        | Discards the cached queries whose result depends on the lemma or the anagram form of a LexItem.
+
+        :param entry:
+            LexItem being added or removed.
+        :param sorted_form:
+            Anagram key of the LexItem.
+        :return:
+        """
+        if self.cache is not None:
+            words = {entry.ortho}
+            words.update(existing.ortho for existing in self.lemmes.get(entry.lemme, ()))
+            words.update(existing.ortho for existing in self.anagrams.get(sorted_form, ()))
+            for word in words:
+                self.cache.discard(('get_all_forms', word))
+                self.cache.discard(('get_anagrams', word))
+        return
+
+    def _follow(self, entry: LexItem, sorted_form: str, added: bool) -> None:
+        """
+        | Applies a LexItem added to or removed from this lexicon to its overlays, which see it through the keys
+        | of their tables they did not change. The lists an overlay holds for its changed lemmas and anagram forms
+        | are updated, unless the overlay changed the word of the LexItem, which then stays hidden from it.
+        | The morphological and phonotactic indexes of the overlays are updated in place, while their columns,
+        | neighbourhood indexes and sublexical statistics are rebuilt in O(N) the next time they are used,
+        | like the ones of this lexicon.
+
+        :param entry:
+            LexItem added or removed.
+        :param sorted_form:
+            Anagram key of the LexItem.
+        :param added:
+            Whether the LexItem was added or removed.
+        :return:
+        """
+        for layer in list(self._overlays):
+            # The tables of an overlay are LayeredDicts.
+            tables = ((cast(LayeredDict, layer.lemmes), entry.lemme), (cast(LayeredDict, layer.anagrams), sorted_form))
+            if entry.ortho in cast(LayeredDict, layer.lexique).changes:
+                if added:
+                    # The keys the overlay did not change fall through to the LexItem, which is hidden from them.
+                    for table, key in tables:
+                        if key not in table.changes:
+                            hidden = [existing for existing in table.get(key, ()) if existing is not entry]
+                            if hidden:
+                                table[key] = hidden
+                            else:
+                                del table[key]
+                continue
+            if not added:
+                layer._invalidate(entry, sorted_form)
+            for table, key in tables:
+                if key in table.changes:
+                    remaining = [existing for existing in table.get(key, ()) if existing is not entry]
+                    if added:
+                        remaining.append(entry)
+                    if remaining:
+                        table[key] = remaining
+                    elif key in table:
+                        del table[key]
+            if layer._morphology is not None:
+                if added:
+                    layer._morphology.add(entry)
+                else:
+                    layer._morphology.discard(entry)
+            if layer._phonotactics is not None:
+                if added:
+                    layer._phonotactics.add(entry)
+                else:
+                    layer._phonotactics.discard(entry)
+            layer._columns = None
+            layer._neighbourhoods = {}
+            layer._sublexical = None
+            if added:
+                layer._invalidate(entry, sorted_form)
+            layer._follow(entry, sorted_form, added)
         return
 
 
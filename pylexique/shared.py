@@ -0,0 +1,427 @@
+# -*- coding: utf-8 -*-
+
+"""Read-only lexicon published in shared memory, for pools of worker processes."""
+
+import json
+import marshal
+import os
+import struct
+import sys
+import weakref
+from array import array
+from collections import OrderedDict
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from operator import attrgetter
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+from zlib import crc32
+
+from .pylexique import LEXIQUE383_FIELD_NAMES, LexItem
+
+__all__ = ['SharedLexicon']
+
+_MAGIC = b'PYLXSHM1'
+_PREAMBLE = struct.Struct('<8sI')
+_INDEXES = ('lexique', 'lemmes', 'anagrams')
+# Setters of the slots of LexItem, in field order. Decoding through them skips the checks of the frozen dataclass,
+# which take most of the time of a lookup.
+_SETTERS = tuple(getattr(LexItem, field).__set__ for field in LEXIQUE383_FIELD_NAMES)
+
+# Segments attached by the current process, so that a handle unpickled once per task attaches only once.
+_ATTACHED: Dict[str, 'SharedLexicon'] = {}
+
+
+def _tracker_id() -> Optional[str]:
+    # The child processes started by multiprocessing inherit the pipe to the resource tracker, which identifies it.
+    fd = resource_tracker.getfd() if os.name == 'posix' else None
+    if fd is None:
+        return None
+    stat = os.fstat(fd)
+    return f'{stat.st_dev}:{stat.st_ino}'
+
+
+def _read_header(segment: SharedMemory) -> Dict[str, Any]:
+    buffer = segment.buf
+    if buffer is None:
+        raise ValueError(f"The shared memory segment {segment.name} is closed.")
+    magic, header_size = _PREAMBLE.unpack_from(buffer)
+    if magic != _MAGIC:
+        raise ValueError(f"The shared memory segment {segment.name} does not hold a lexicon.")
+    header: Dict[str, Any] = json.loads(bytes(buffer[_PREAMBLE.size:_PREAMBLE.size + header_size]))
+    if header['fields'] != LEXIQUE383_FIELD_NAMES:
+        raise ValueError(f"The shared memory segment {segment.name} holds an incompatible lexicon.")
+    return header
+
+
+def _attach_segment(name: str) -> SharedMemory:
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name, track=False)  # type: ignore[call-arg]
+    segment = SharedMemory(name)
+    # Before Python 3.13, attaching registers the segment with the resource tracker of the process, which then unlinks
+    # it when the process exits, even though it does not own it. The registration of this segment is withdrawn, unless
+    # the tracker is the one of the owner, which is shared by the processes it starts.
+    if os.name == 'posix':
+        try:
+            tracker = _read_header(segment).get('tracker')
+        except ValueError:
+            tracker = None
+        if tracker != _tracker_id():
+            resource_tracker.unregister(getattr(segment, '_name'), 'shared_memory')
+    return segment
+
+
+def _release(segment: SharedMemory, views: List[memoryview], owner_pid: Optional[int]) -> None:
+    for view in views:
+        view.release()
+    views.clear()
+    segment.close()
+    if owner_pid is None:
+        _ATTACHED.pop(segment.name, None)
+    # A process forked from the owner inherits this finalizer, but must not unlink the segment.
+    if owner_pid == os.getpid():
+        attached = _ATTACHED.pop(segment.name, None)
+        if attached is not None:
+            attached.close()
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _build_index(groups: Mapping[str, Sequence[int]]) -> Dict[str, bytes]:
+    """
+    | Serializes a mapping from keys to lists of row numbers as an open addressing hash table
+    | with linear probing, keyed by the crc32 of the utf-8 encoded keys.
+
+    :param groups:
+        Mapping of the keys to their row numbers.
+    :return:
+        Sections of the index: key pool, key offsets, group offsets, row numbers and slots.
+    """
+    encoded = [key.encode('utf-8') for key in groups]
+    key_offsets = [0]
+    group_offsets = [0]
+    rows: List[int] = []
+    for data, group in zip(encoded, groups.values()):
+        key_offsets.append(key_offsets[-1] + len(data))
+        rows.extend(group)
+        group_offsets.append(len(rows))
+    size = 1
+    while size < 2 * len(encoded):
+        size <<= 1
+    mask = size - 1
+    slots = [0] * size
+    for key_id, data in enumerate(encoded):
+        slot = crc32(data) & mask
+        while slots[slot]:
+            slot = (slot + 1) & mask
+        slots[slot] = key_id + 1
+    # The sections use the native byte order, like the memoryview casts reading them.
+    return {'pool': b''.join(encoded), 'key_offsets': array('Q', key_offsets).tobytes(),
+            'group_offsets': array('I', group_offsets).tobytes(), 'rows': array('I', rows).tobytes(),
+            'slots': array('I', slots).tobytes()}
+
+
+class _SharedIndex:
+    """
+    | Hash index over a segment, read through memoryviews without copying it.
+
+    """
+
+    __slots__ = ('pool', 'key_offsets', 'group_offsets', 'rows', 'slots', 'mask')
+
+    def __init__(self, views: Dict[str, memoryview]) -> None:
+        self.pool = views['pool']
+        self.key_offsets = views['key_offsets'].cast('Q')
+        self.group_offsets = views['group_offsets'].cast('I')
+        self.rows = views['rows'].cast('I')
+        self.slots = views['slots'].cast('I')
+        self.mask = len(self.slots) - 1
+
+    def find(self, key: str) -> int:
+        """
+        | Gets the id of a key.
+
+        :param key: string.
+        :return: int.
+            Id of the key, or -1 if the key is not indexed.
+        """
+        data = key.encode('utf-8')
+        pool, key_offsets, slots, mask = self.pool, self.key_offsets, self.slots, self.mask
+        slot = crc32(data) & mask
+        while True:
+            key_id = slots[slot] - 1
+            if key_id < 0:
+                return -1
+            if pool[key_offsets[key_id]:key_offsets[key_id + 1]] == data:
+                return key_id
+            slot = (slot + 1) & mask
+
+    def group(self, key_id: int) -> Sequence[int]:
+        return self.rows[self.group_offsets[key_id]:self.group_offsets[key_id + 1]].tolist()
+
+    def key(self, key_id: int) -> str:
+        return bytes(self.pool[self.key_offsets[key_id]:self.key_offsets[key_id + 1]]).decode('utf-8')
+
+
+class SharedLexicon:
+    """
+    | Read-only copy of a lexicon stored in a single multiprocessing.shared_memory segment:
+    | the entries are serialized in a records area, and the lexique, lemmes and anagrams tables are hash indexes
+    | from their keys to row numbers. Any process can attach to the segment by its name in O(1),
+    | and decodes the LexItems it looks up on demand.
+    | A SharedLexicon pickles as the name of its segment, so it can be passed to the tasks of a multiprocessing.Pool.
+    | The segment is unlinked when the SharedLexicon of the owner process is closed, garbage collected, or when
+    | the owner exits. Keep a reference to it in the owner for as long as the other processes use the segment.
+
+    :param segment: SharedMemory.
+        Segment holding the lexicon.
+    :param owner: bool.
+        Whether this process created the segment and is responsible for unlinking it.
+    """
+
+    def __init__(self, segment: SharedMemory, owner: bool = False) -> None:
+        self._segment = segment
+        self.owner = owner
+        header = _read_header(segment)
+        buffer = segment.buf
+        assert buffer is not None
+        views: List[memoryview] = []
+        sections: Dict[str, memoryview] = {}
+        for section, (start, length) in header['sections'].items():
+            sections[section] = buffer[start:start + length]
+            views.append(sections[section])
+        self._records = sections['records']
+        self._record_offsets = sections['record_offsets'].cast('Q')
+        self._indexes = {name: _SharedIndex({part: sections[f'{name}.{part}'] for part in
+                                             ('pool', 'key_offsets', 'group_offsets', 'rows', 'slots')})
+                         for name in _INDEXES}
+        for index in self._indexes.values():
+            views.extend((index.key_offsets, index.group_offsets, index.rows, index.slots))
+        views.append(self._record_offsets)
+        # The casts are released before the sections they are made from.
+        views.reverse()
+        self.rows = header['rows']
+        self._finalizer = weakref.finalize(self, _release, segment, views, os.getpid() if owner else None)
+
+    def __repr__(self) -> str:
+        return '{0}(name={1!r}, words={2}, rows={3}, owner={4})'.format(
+            self.__class__.__name__, self.name, len(self), self.rows, self.owner)
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str]]:
+        return self.__class__.attach, (self.name,)
+
+    def __enter__(self) -> 'SharedLexicon':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def name(self) -> str:
+        return self._segment.name
+
+    @property
+    def size(self) -> int:
+        """
+        | Size of the segment in bytes.
+
+        """
+        return self._segment.size
+
+    @classmethod
+    def create(cls, lexique: Mapping[str, Union[LexItem, List[LexItem]]], lemmes: Mapping[str, List[LexItem]],
+               anagrams: Mapping[str, List[LexItem]], name: Optional[str] = None) -> 'SharedLexicon':
+        """
+        | Publishes the tables of a lexicon into a new shared memory segment, owned by the current process.
+        | See Lexique383.to_shared_memory().
+
+        :param lexique:
+            Table of the LexItems by orthography.
+        :param lemmes:
+            Table of the LexItems by lemma.
+        :param anagrams:
+            Table of the LexItems by anagram form.
+        :param name:
+            Name of the segment. A unique name is generated by default.
+        :return: SharedLexicon.
+        """
+        get_fields = attrgetter(*LEXIQUE383_FIELD_NAMES)
+        dumps = marshal.dumps
+        rows: Dict[int, int] = {}
+        records: List[bytes] = []
+        ortho_groups: Dict[str, List[int]] = {}
+        for ortho, entry in lexique.items():
+            group = ortho_groups[ortho] = []
+            for item in entry if isinstance(entry, list) else (entry,):
+                rows[id(item)] = len(records)
+                group.append(len(records))
+                records.append(dumps(get_fields(item)))
+        record_offsets = [0]
+        for record in records:
+            record_offsets.append(record_offsets[-1] + len(record))
+        sections: Dict[str, bytes] = {'records': b''.join(records),
+                                      'record_offsets': array('Q', record_offsets).tobytes()}
+        row_of = rows.__getitem__
+        for index_name, groups in (('lexique', ortho_groups),
+                                   ('lemmes', {key: list(map(row_of, map(id, group)))
+                                               for key, group in lemmes.items() if group}),
+                                   ('anagrams', {key: list(map(row_of, map(id, group)))
+                                                 for key, group in anagrams.items() if group})):
+            for part, data in _build_index(groups).items():
+                sections[f'{index_name}.{part}'] = data
+        # The header is sized before the offsets are known, so it is built twice.
+        layout: Dict[str, List[int]] = {section: [0, len(data)] for section, data in sections.items()}
+        # The resource tracker of the owner lets the attaching processes tell whether they share it.
+        header = {'fields': LEXIQUE383_FIELD_NAMES, 'rows': len(records), 'sections': layout, 'tracker': _tracker_id()}
+        header_size = len(json.dumps(header)) + 16 * len(sections)
+        offset = _align(_PREAMBLE.size + header_size)
+        for section, data in sections.items():
+            layout[section] = [offset, len(data)]
+            offset = _align(offset + len(data))
+        encoded_header = json.dumps(header).encode('utf-8').ljust(header_size)
+        segment = SharedMemory(name, create=True, size=max(offset, 1))
+        try:
+            buffer = segment.buf
+            if buffer is None:
+                raise ValueError(f"The shared memory segment {segment.name} is closed.")
+            _PREAMBLE.pack_into(buffer, 0, _MAGIC, header_size)
+            buffer[_PREAMBLE.size:_PREAMBLE.size + header_size] = encoded_header
+            for section, data in sections.items():
+                start, length = layout[section]
+                buffer[start:start + length] = data
+            del buffer
+            shared = cls(segment, owner=True)
+        except BaseException:
+            segment.close()
+            segment.unlink()
+            raise
+        return shared
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedLexicon':
+        """
+        | Attaches to a shared lexicon by the name of its segment. A process attaches only once to a given segment,
+        | and stays attached until the SharedLexicon is closed or the process exits.
+
+        :param name:
+            Name of the segment.
+        :return: SharedLexicon.
+        :raises: FileNotFoundError.
+            If the segment does not exist anymore.
+        """
+        shared = _ATTACHED.get(name)
+        if shared is None:
+            shared = _ATTACHED[name] = cls(_attach_segment(name))
+        return shared
+
+    def close(self) -> None:
+        """
+        | Detaches from the segment, and unlinks it if this process owns it.
+        | The SharedLexicon cannot be used anymore.
+
+        :return:
+        """
+        self._finalizer()
+        return
+
+    def __len__(self) -> int:
+        return len(self._indexes['lexique'].key_offsets) - 1
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and self._indexes['lexique'].find(word) >= 0
+
+    def __getitem__(self, word: str) -> Union[LexItem, List[LexItem]]:
+        entries = self._lookup('lexique', word)
+        return entries[0] if len(entries) == 1 else entries
+
+    def __iter__(self) -> Iterator[str]:
+        index = self._indexes['lexique']
+        for key_id in range(len(self)):
+            yield index.key(key_id)
+
+    def item(self, row: int) -> LexItem:
+        """
+        | Decodes the LexItem stored at a row.
+
+        :param row:
+            Row number.
+        :return: LexItem.
+        """
+        offsets = self._record_offsets
+        item = object.__new__(LexItem)
+        for setter, value in zip(_SETTERS, marshal.loads(self._records[offsets[row]:offsets[row + 1]])):
+            setter(item, value)
+        return item
+
+    def items(self) -> Iterator[LexItem]:
+        """
+        | Iterates over all the LexItems, homographs included.
+
+        :return:
+            Iterator of LexItem objects.
+        """
+        for row in range(self.rows):
+            yield self.item(row)
+
+    def _lookup(self, index_name: str, key: str) -> List[LexItem]:
+        index = self._indexes[index_name]
+        key_id = index.find(key)
+        if key_id < 0:
+            raise KeyError(key)
+        return [self.item(row) for row in index.group(key_id)]
+
+    def get_lex(self, words: Union[Tuple[str, ...], str]) -> Dict[str, Union[LexItem, List[LexItem]]]:
+        """
+        Recovers the lexical entries for the words in the sequence, like Lexique383.get_lex().
+
+        :param words:
+            A string or a tuple of multiple strings for getting the LexItems for multiple words.
+        :return:
+            Dictionary of LexItems.
+        :raises: KeyError.
+        :raises: TypeError.
+        """
+        if isinstance(words, str):
+            words = (words,)
+        results = OrderedDict()
+        for word in words:
+            if not isinstance(word, str):
+                raise TypeError
+            results[word] = self[word.lower()]
+        return results
+
+    def get_all_forms(self, word: str) -> List[LexItem]:
+        """
+        Gets all lexical forms of a given word, like Lexique383.get_all_forms().
+
+        :param word:
+            String.
+        :return:
+            List of LexItem objects sharing the same root lemma.
+        :raises: KeyError.
+        """
+        lemmas = OrderedDict.fromkeys(entry.lemme for entry in self._lookup('lexique', word.lower()))
+        forms = []
+        for lemma in lemmas:
+            forms.extend(self._lookup('lemmes', lemma))
+        return forms
+
+    def get_anagrams(self, word: str) -> List[LexItem]:
+        """
+        Gets all the anagrams of a given word, like Lexique383.get_anagrams().
+
+        :param word:
+            String.
+        :return:
+            List of LexItem objects which are anagrams of the given word.
+        :raises: KeyError.
+        """
+        word = word.lower()
+        if word not in self:
+            raise KeyError(word)
+        return [entry for entry in self._lookup('anagrams', ''.join(sorted(word))) if entry.ortho != word]
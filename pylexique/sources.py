@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+"""Opening of the Lexique38x source files, compressed or not, in ISO-8859-1 or UTF-8."""
+
+import bz2
+import codecs
+import gzip
+import io
+import lzma
+import os
+from typing import IO, Optional, Union, cast
+
+__all__ = ['COMPRESSIONS', 'detect_compression', 'detect_encoding', 'open_source', 'open_lexique']
+
+PathType = Union[str, 'os.PathLike[str]']
+
+#: Compression formats recognized by their magic number. zstd requires the zstandard package before Python 3.14.
+COMPRESSIONS = {
+    'gzip': b'\x1f\x8b',
+    'bz2': b'BZh',
+    'xz': b'\xfd7zXZ\x00',
+    'zstd': b'\x28\xb5\x2f\xfd',
+}
+# Number of decompressed bytes read to detect the encoding.
+_SAMPLE_SIZE = 1 << 16
+_BUFFER_SIZE = 1 << 16
+
+
+def detect_compression(path: PathType) -> Optional[str]:
+    """
+    | Detects the compression of a file from its first bytes, whatever its extension.
+
+    :param path:
+        Path to the file.
+    :return:
+        'gzip', 'bz2', 'xz', 'zstd', or None if the file is not compressed.
+    """
+    with open(path, 'rb') as file:
+        head = file.read(8)
+    for compression, magic in COMPRESSIONS.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def _open_zstd(path: PathType) -> IO[bytes]:
+    try:
+        from compression import zstd
+        return cast(IO[bytes], zstd.open(path, 'rb'))
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(f"{path} is compressed with zstd, which requires the zstandard package: "
+                          f"pip install zstandard") from e
+    return cast(IO[bytes], zstandard.open(path, 'rb'))
+
+
+def open_source(path: PathType) -> IO[bytes]:
+    """
+    | Opens a file for reading, decompressing it on the fly if it is compressed with gzip, bz2, xz or zstd.
+
+    :param path:
+        Path to the file.
+    :return:
+        Binary file object.
+    :raises: ImportError.
+        If the file is compressed with zstd and no zstd module is installed.
+    """
+    compression = detect_compression(path)
+    if compression == 'gzip':
+        return gzip.open(path, 'rb')  # type: ignore[return-value]
+    if compression == 'bz2':
+        return bz2.open(path, 'rb')
+    if compression == 'xz':
+        return lzma.open(path, 'rb')
+    if compression == 'zstd':
+        return _open_zstd(path)
+    return open(path, 'rb', buffering=_BUFFER_SIZE)
+
+
+def detect_encoding(path: PathType) -> str:
+    """
+    | Detects whether a Lexique38x file is encoded in UTF-8 or in ISO-8859-1, the encoding of the files
+    | distributed by Lexique, from its first decompressed bytes. A sample with non-ASCII characters is UTF-8
+    | if it decodes as such, since French text in ISO-8859-1 practically never does.
+
+    :param path:
+        Path to the file.
+    :return:
+        'utf-8-sig' or 'iso-8859-1'.
+    """
+    with open_source(path) as file:
+        sample = file.read(_SAMPLE_SIZE)
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if not sample or max(sample) < 0x80:
+        return 'iso-8859-1'
+    try:
+        # The sample may end in the middle of a character.
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return 'iso-8859-1'
+    return 'utf-8-sig'
+
+
+def open_lexique(path: PathType, encoding: Optional[str] = None) -> IO[str]:
+    """
+    | Opens a Lexique38x file as text, decompressing and decoding it while it is read, without temporary file.
+
+    :param path:
+        Path to the file, compressed or not.
+    :param encoding:
+        Encoding of the file. Detected with detect_encoding() by default.
+    :return:
+        Text file object.
+    """
+    encoding = encoding or detect_encoding(path)
+    return io.TextIOWrapper(open_source(path), encoding=encoding, newline='')
@@ -1,4 +1,7 @@
+import gc
 import logging
+from contextlib import contextmanager
+from typing import Iterator
 
 basestring = str
 
@@ -8,3 +11,20 @@ level = 'WARNING'
 fmt = '\r%(asctime)s%(levelname)8s%(filename)15s %(lineno)4s: %(message)s'
 logging.basicConfig(format=fmt, level=level)
 
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """
+    | Pauses the cyclic garbage collector while large acyclic structures are built.
+    | Building an index of the lexicon allocates hundreds of thousands of containers,
+    | which would otherwise trigger many useless collections.
+
+    :return:
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
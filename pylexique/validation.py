@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+"""Validation of the rows of Lexique38X while it is being parsed."""
+
+import json
+from typing import Any, Dict, List, Sequence, Tuple
+
+__all__ = ['ValidationReport', 'LexiqueValidationError', 'VALIDATION_MODES']
+
+#: 'off' ignores the malformed rows, 'count' counts them, 'collect' keeps them in memory
+#: and 'strict' raises a LexiqueValidationError on the first one.
+VALIDATION_MODES = ('off', 'count', 'collect', 'strict')
+
+
+class LexiqueValidationError(ValueError):
+    """
+    Raised in 'strict' validation mode when a row of Lexique38X cannot be converted.
+
+    """
+
+
+class ValidationReport:
+    """
+    | Structured report of the errors encountered while converting the rows of Lexique38X.
+    | The recording functions are selected once from the validation mode, so that
+    | rows without errors never pay for the validation.
+
+    :param mode: string.
+        'off', 'count', 'collect' and 'strict' are valid values. 'count' is the default value.
+    :ivar value_errors: List of (ortho, field, raw value) for the fields whose type coercion failed.
+        Only filled in 'collect' mode.
+    :ivar length_errors: List of the raw rows which do not have the expected number of fields.
+        Only filled in 'collect' mode.
+    """
+
+    def __init__(self, mode: str = 'count') -> None:
+        if mode not in VALIDATION_MODES:
+            raise ValueError(f"The value {mode} is not permitted. Only {', '.join(map(repr, VALIDATION_MODES))} "
+                             f"are valid values.")
+        self.mode = mode
+        self.value_error_count = 0
+        self.length_error_count = 0
+        self.value_errors: List[Tuple[str, str, Any]] = []
+        self.length_errors: List[List[Any]] = []
+        if mode == 'off':
+            self.record_value_error = self._ignore_value_error
+            self.record_length_error = self._ignore_length_error
+        elif mode == 'count':
+            self.record_value_error = self._count_value_error
+            self.record_length_error = self._count_length_error
+        elif mode == 'collect':
+            self.record_value_error = self._collect_value_error
+            self.record_length_error = self._collect_length_error
+        else:
+            self.record_value_error = self._raise_value_error
+            self.record_length_error = self._raise_length_error
+
+    def __repr__(self) -> str:
+        return '{0}(mode={1!r}, value_errors={2}, length_errors={3})'.format(
+            self.__class__.__name__, self.mode, self.value_error_count, self.length_error_count)
+
+    def __bool__(self) -> bool:
+        return bool(self.error_count)
+
+    @property
+    def error_count(self) -> int:
+        return self.value_error_count + self.length_error_count
+
+    def _ignore_value_error(self, ortho: str, field: str, value: Any) -> None:
+        return
+
+    def _ignore_length_error(self, row_fields: Sequence[Any]) -> None:
+        return
+
+    def _count_value_error(self, ortho: str, field: str, value: Any) -> None:
+        self.value_error_count += 1
+
+    def _count_length_error(self, row_fields: Sequence[Any]) -> None:
+        self.length_error_count += 1
+
+    def _collect_value_error(self, ortho: str, field: str, value: Any) -> None:
+        self.value_error_count += 1
+        self.value_errors.append((ortho, field, value))
+
+    def _collect_length_error(self, row_fields: Sequence[Any]) -> None:
+        self.length_error_count += 1
+        self.length_errors.append(list(row_fields))
+
+    def _raise_value_error(self, ortho: str, field: str, value: Any) -> None:
+        self.value_error_count += 1
+        raise LexiqueValidationError(f"Invalid value {value!r} for the field '{field}' of the entry '{ortho}'.")
+
+    def _raise_length_error(self, row_fields: Sequence[Any]) -> None:
+        self.length_error_count += 1
+        raise LexiqueValidationError(f"The row {list(row_fields)!r} has {len(row_fields)} fields instead of 35.")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        | Converts the report to a dict.
+
+        :return: dict.
+        """
+        return {'mode': self.mode, 'value_error_count': self.value_error_count,
+                'length_error_count': self.length_error_count,
+                'value_errors': [list(error) for error in self.value_errors], 'length_errors': self.length_errors}
+
+    def save(self, errors_path: str) -> None:
+        """
+        | Saves the report as compact json.
+
+        :param errors_path:
+            Path to save the report.
+        :return:
+        """
+        with open(errors_path, 'w', encoding='utf-8') as json_file:
+            json.dump(self.to_dict(), json_file, ensure_ascii=False, separators=(',', ':'), default=str)
+        return
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+"""Shared fixtures for the `pylexique` test suite."""
+
+import pytest
+
+from pylexique.pylexique import LEXIQUE383_FIELD_NAMES
+
+_VOWELS = set('aeiouyéèêàâîôûE@§°25918O')
+
+
+def _cv(form: str) -> str:
+    return ''.join('V' if char in _VOWELS else 'C' for char in form if char not in '- ')
+
+
+def _row(ortho: str, phon: str, lemme: str, cgram: str, syll: str, orthosyll: str, morphoder: str = '',
+         nbmorph: str = '1', freq: str = '12,5', genre: str = '', nombre: str = '', islem: str = '1') -> str:
+    fields = {
+        'ortho': ortho, 'phon': phon, 'lemme': lemme, 'cgram': cgram, 'genre': genre, 'nombre': nombre,
+        'freqlemfilms2': freq, 'freqlemlivres': freq, 'freqfilms2': freq, 'freqlivres': freq, 'infover': '',
+        'nbhomogr': '1', 'nbhomoph': '1', 'islem': islem, 'nblettres': str(len(ortho)), 'nbphons': str(len(phon)),
+        'cvcv': _cv(ortho), 'p_cvcv': _cv(phon), 'voisorth': '3', 'voisphon': '4', 'puorth': str(len(ortho)),
+        'puphon': str(len(phon)), 'syll': syll, 'nbsyll': str(syll.count('-') + 1),
+        'cv_cv': '-'.join(_cv(part) for part in syll.split('-')), 'orthrenv': ortho[::-1], 'phonrenv': phon[::-1],
+        'orthosyll': orthosyll, 'cgramortho': cgram, 'deflem': '100', 'defobs': '30', 'old20': '1,45',
+        'pld20': '1,2', 'morphoder': morphoder or ortho, 'nbmorph': nbmorph,
+    }
+    return '\t'.join(fields[name] for name in LEXIQUE383_FIELD_NAMES)
+
+
+SMALL_LEXIQUE_ROWS = [
+    _row('a', 'a', 'avoir', 'AUX', 'a', 'a', freq='12190,4'),
+    _row('a', 'a', 'a', 'NOM', 'a', 'a', freq='0,04', genre='m'),
+    _row('manger', 'm@Ze', 'manger', 'VER', 'm@-Ze', 'man-ger', freq='207,63'),
+    _row('manger', 'm@Ze', 'manger', 'NOM', 'm@-Ze', 'man-ger', freq='5,62', genre='m', nombre='s'),
+    _row('mange', 'm@Z', 'manger', 'VER', 'm@Z', 'mange', freq='64,16', islem='0'),
+    _row('mangeons', 'm@Z§', 'manger', 'VER', 'm@-Z§', 'man-geons', freq='10,06', islem='0'),
+    _row('mangeable', 'm@Zabl', 'mangeable', 'ADJ', 'm@-Zabl', 'man-gea-ble', '{manger}{able}', '2', freq='0,5'),
+    _row('abaisser', 'abese', 'abaisser', 'VER', 'a-be-se', 'a-bais-ser', freq='3,2'),
+    _row('abaissement', 'abEs°m@', 'abaissement', 'NOM', 'a-bE-s°-m@', 'a-bais-se-ment', '{abaisser}{ment}', '2',
+         freq='1,12', genre='m', nombre='s'),
+    _row('rabaisser', 'Rabese', 'rabaisser', 'VER', 'Ra-be-se', 'ra-bais-ser', '{re}{abaisser}', '2', freq='0,9'),
+    _row('aimer', 'eme', 'aimer', 'VER', 'e-me', 'ai-mer', freq='155,45'),
+    _row('marie', 'maRi', 'marie', 'NOM', 'ma-Ri', 'ma-rie', freq='23,4', genre='f', nombre='s'),
+    _row('maire', 'mER', 'maire', 'NOM', 'mER', 'maire', freq='30,62', genre='m', nombre='s'),
+    _row('ramie', 'Rami', 'ramie', 'NOM', 'Ra-mi', 'ra-mie', freq='0,01', genre='f', nombre='s'),
+    _row('chanter', 'S@te', 'chanter', 'VER', 'S@-te', 'chan-ter', freq='75,1'),
+    _row('chante', 'S@t', 'chanter', 'VER', 'S@t', 'chante', freq='40,02', islem='0'),
+    _row('chanteur', 'S@t9R', 'chanteur', 'NOM', 'S@-t9R', 'chan-teur', '{chanter}{eur}', '2', freq='20,3',
+         genre='m', nombre='s'),
+    _row('changement', 'S@Z°m@', 'changement', 'NOM', 'S@-Z°-m@', 'chan-ge-ment', '{changer}{ment}', '2',
+         freq='60,5', genre='m', nombre='s'),
+    _row('lent', 'l@', 'lent', 'ADJ', 'l@', 'lent', freq='15,05', genre='m', nombre='s'),
+    _row('lente', 'l@t', 'lent', 'ADJ', 'l@t', 'lente', freq='8,3', genre='f', nombre='s', islem='0'),
+    _row('lentement', 'l@t°m@', 'lentement', 'ADV', 'l@-t°-m@', 'len-te-ment', '{lent}{ment}', '2', freq='30,1'),
+    _row('bizarre', 'bizaR', 'bizarre', 'ADJ', 'bi-zaR', 'bi-zar-re', freq='4,2', islem=''),
+    'tronque\ttR§k\ttronquer',
+]
+
+
+@pytest.fixture(scope='session')
+def small_lexique_path(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """
+    Writes a small Lexique383-formatted file, including one value error and one length error.
+
+    """
+    path = tmp_path_factory.mktemp('lexique').joinpath('Lexique_small.txt')
+    content = '\t'.join(LEXIQUE383_FIELD_NAMES) + '\n' + '\n'.join(SMALL_LEXIQUE_ROWS) + '\n'
+    path.write_text(content, encoding='iso-8859-1')
+    return str(path)
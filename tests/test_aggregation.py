@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the aggregations and distribution statistics of `pylexique`."""
+
+import math
+import statistics
+from collections import defaultdict
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+
+from pylexique import Lexique383
+
+
+def _grouped(lexicon: Lexique383, by: str, field: str) -> Dict[Any, List[Any]]:
+    groups = defaultdict(list)
+    for item in lexicon._iter_items():
+        groups[getattr(item, by)].append(getattr(item, field))
+    return dict(sorted(groups.items()))
+
+
+class TestAggregation:
+
+    def test_aggregate(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        results = lexicon.aggregate('freqfilms2', by='cgram', stats=('sum', 'mean', 'std', 'min', 'max', 'median'))
+        expected = _grouped(lexicon, 'cgram', 'freqfilms2')
+        assert list(results) == list(expected)
+        for cgram, values in expected.items():
+            stats = results[cgram]
+            assert stats['count'] == len(values)
+            assert stats['freqfilms2_sum'] == pytest.approx(sum(values))
+            assert stats['freqfilms2_mean'] == pytest.approx(statistics.mean(values))
+            assert stats['freqfilms2_median'] == pytest.approx(statistics.median(values))
+            assert (stats['freqfilms2_min'], stats['freqfilms2_max']) == (min(values), max(values))
+            if len(values) > 1:
+                assert stats['freqfilms2_std'] == pytest.approx(statistics.stdev(values))
+            else:
+                assert math.isnan(stats['freqfilms2_std'])
+        total = lexicon.aggregate(('nblettres', 'islem'), stats=('sum', 'mean'))
+        items = list(lexicon._iter_items())
+        assert total['count'] == len(items)
+        assert total['nblettres_sum'] == sum(item.nblettres for item in items)
+        assert isinstance(total['nblettres_sum'], int)
+        # The malformed islem values are missing values.
+        flags = [item.islem for item in items if isinstance(item.islem, bool)]
+        assert len(flags) < len(items)
+        assert total['islem_mean'] == pytest.approx(sum(flags) / len(flags))
+
+    def test_group_by_and_filters(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        syllables = lexicon.aggregate(by='nbsyll')
+        assert {key: stats['count'] for key, stats in syllables.items()} == {
+            key: len(values) for key, values in _grouped(lexicon, 'nbsyll', 'ortho').items()}
+        results = lexicon.aggregate('freqfilms2', by=('cgram', 'nbsyll'), stats=('sum',),
+                                    where={'cgram': ['VER', 'NOM'], 'freqfilms2': lambda freq: freq > 1})
+        expected: Dict[Any, float] = defaultdict(float)
+        for item in lexicon._iter_items():
+            if item.cgram in ('VER', 'NOM') and item.freqfilms2 > 1:
+                expected[item.cgram, item.nbsyll] += item.freqfilms2
+        assert list(results) == sorted(expected)
+        assert {key: stats['freqfilms2_sum'] for key, stats in results.items()} == pytest.approx(dict(expected))
+        empty = lexicon.aggregate('freqfilms2', where={'lemme': str.isupper})
+        assert empty['count'] == 0 and math.isnan(empty['freqfilms2_mean'])
+        assert lexicon.aggregate(by='cgram', where={'ortho': 'manger'}) == {'NOM': {'count': 1}, 'VER': {'count': 1}}
+        with pytest.raises(ValueError):
+            lexicon.aggregate('cgram')
+        with pytest.raises(ValueError):
+            lexicon.aggregate('freqfilms2', stats=('mode',))
+        with pytest.raises(ValueError):
+            lexicon.aggregate(by='nothing')
+
+    def test_uncoerced_fields(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        deflem = lexicon.columns.column('deflem')
+        assert deflem.dtype == np.float64
+        assert lexicon.aggregate('deflem', stats=('max',))['deflem_max'] == 100.0
+
+    def test_quantiles_and_histogram(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        values = [item.freqfilms2 for item in lexicon._iter_items()]
+        assert lexicon.quantiles('freqfilms2', (0.1, 0.5, 0.9)) == pytest.approx(
+            np.quantile(values, (0.1, 0.5, 0.9)).tolist())
+        assert lexicon.quantiles('freqfilms2', 0.5) == pytest.approx(statistics.median(values))
+        by_cgram = lexicon.quantiles('freqfilms2', 0.5, by='cgram')
+        assert by_cgram == pytest.approx({cgram: statistics.median(group) for cgram, group in
+                                          _grouped(lexicon, 'cgram', 'freqfilms2').items()})
+        with pytest.raises(ValueError):
+            lexicon.quantiles('freqfilms2', 1.5)
+        histogram = lexicon.histogram('nblettres', bins=4)
+        counts, edges = np.histogram([item.nblettres for item in lexicon._iter_items()], bins=4)
+        assert histogram == {'edges': edges.tolist(), 'counts': counts.tolist()}
+        grouped = lexicon.histogram('nblettres', bins=4, by='cgram')
+        assert grouped['edges'] == edges.tolist()
+        assert np.sum(list(grouped['counts'].values()), axis=0).tolist() == counts.tolist()
+
+    def test_as_frame_and_updates(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        frame = lexicon.aggregate('freqfilms2', by='cgram', stats=('mean', 'max'), as_frame=True)
+        assert frame.index.name == 'cgram'
+        assert list(frame.columns) == ['count', 'freqfilms2_mean', 'freqfilms2_max']
+        assert frame.loc['VER', 'count'] == lexicon.aggregate(by='cgram')['VER']['count']
+        before = lexicon.aggregate(by='cgram')['VER']['count']
+        lexicon.add_entry(dict(lexicon.lexique['mange'].to_dict(), ortho='mangez'))
+        assert lexicon.aggregate(by='cgram')['VER']['count'] == before + 1
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the query cache of `pylexique`."""
+
+from sys import getsizeof
+from threading import Thread
+
+import pytest
+
+from pylexique import Lexique383, QueryCache
+from pylexique.cache import _MISSING
+
+
+class TestQueryCache:
+
+    def test_lru_eviction(self) -> None:
+        cache = QueryCache(maxsize=2, policy='lru')
+        cache.put('a', (1,))
+        cache.put('b', (2,))
+        assert cache.get('a') == (1,)
+        cache.put('c', (3,))
+        assert cache.keys() == ['a', 'c']
+        info = cache.info()
+        assert (info.hits, info.misses, info.evictions, info.currsize) == (1, 0, 1, 2)
+
+    def test_lfu_eviction(self) -> None:
+        cache = QueryCache(maxsize=2, policy='lfu')
+        cache.put('a', (1,))
+        cache.put('b', (2,))
+        for _ in range(3):
+            cache.get('b')
+        cache.get('a')
+        cache.put('c', (3,))
+        assert cache.keys() == ['c', 'b']
+        cache.put('d', (4,))
+        assert cache.keys() == ['d', 'b']
+        assert cache.info().evictions == 2
+
+    def test_memory_bound(self) -> None:
+        value = tuple(range(10))
+        cache = QueryCache(maxsize=None, max_bytes=getsizeof(value) * 2)
+        for key in range(5):
+            cache.put(key, value)
+        info = cache.info()
+        assert info.currsize == 2
+        assert info.currbytes <= info.max_bytes
+        assert info.evictions == 3
+        cache.put('too_big', tuple(range(1000)))
+        # A value larger than max_bytes is not cached.
+        assert cache.get('too_big') is _MISSING and 'too_big' not in cache.keys()
+        assert cache.info().currsize == 2
+
+    def test_invalid_arguments(self) -> None:
+        with pytest.raises(ValueError):
+            QueryCache(policy='fifo')
+        with pytest.raises(ValueError):
+            QueryCache(maxsize=-1)
+
+    def test_thread_safety(self) -> None:
+        cache = QueryCache(maxsize=8, policy='lfu')
+
+        def worker(offset: int) -> None:
+            for i in range(2000):
+                key = (i + offset) % 20
+                cache.get(key)
+                cache.put(key, (key,))
+
+        threads = [Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        info = cache.info()
+        assert info.currsize <= 8
+        assert info.hits + info.misses == 8000
+
+
+class TestLexiconCache:
+
+    def test_cached_queries(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        cached = Lexique383(small_lexique_path, cache=QueryCache(maxsize=16))
+        assert lexicon.cache_info() is None
+        for word in ('aimer', 'Aimer', 'aimer'):
+            assert list(cached.get_anagrams(word)) == lexicon.get_anagrams(word)
+        assert list(cached.get_all_forms('mange')) == lexicon.get_all_forms('mange')
+        first = cached.get_all_forms('mange')
+        assert isinstance(first, tuple)
+        assert cached.get_all_forms('MANGE') is first
+        info = cached.cache_info()
+        assert (info.hits, info.misses) == (4, 2)
+        assert info.hit_rate == pytest.approx(4 / 6)
+        cached.cache_clear()
+        assert cached.cache_info().currsize == 0
+
+    def test_missing_word_not_cached(self, small_lexique_path: str) -> None:
+        cached = Lexique383(small_lexique_path, cache=QueryCache(maxsize=16))
+        with pytest.raises(KeyError):
+            cached.get_anagrams('inexistant')
+        assert cached.cache_info().currsize == 0
+
+    def test_instances_are_independent(self, small_lexique_path: str) -> None:
+        first = Lexique383(small_lexique_path)
+        second = Lexique383(small_lexique_path)
+        assert first.lexique is not second.lexique
+        assert len(first) == len(second)
+        assert len(first.lexique['a']) == 2
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the row converter of `pylexique`."""
+
+from typing import get_type_hints
+
+import pytest
+
+from pylexique import LexiqueValidationError, ValidationReport
+from pylexique.converters import RowConverter, build_coercion_plan
+from pylexique.pylexique import LexEntryTypes
+
+from .conftest import SMALL_LEXIQUE_ROWS
+
+
+def _converter(mode: str = 'collect') -> RowConverter:
+    return RowConverter(get_type_hints(LexEntryTypes), ValidationReport(mode))
+
+
+class TestRowConverter:
+
+    def test_plan(self) -> None:
+        plan = build_coercion_plan(get_type_hints(LexEntryTypes))
+        fields = [field for _, field, _, _ in plan]
+        assert fields == ['freqlemfilms2', 'freqlemlivres', 'freqfilms2', 'freqlivres', 'nbhomogr', 'nbhomoph',
+                          'islem', 'nblettres', 'nbphons', 'voisorth', 'voisphon', 'puorth', 'puphon', 'nbsyll',
+                          'old20', 'pld20']
+
+    def test_convert(self) -> None:
+        row = SMALL_LEXIQUE_ROWS[2].split('\t')
+        converted = _converter().convert(row)
+        assert converted[:4] == ['manger', 'm@Ze', 'manger', 'VER']
+        assert converted[8] == 207.63
+        assert converted[11] == 1 and converted[13] is True
+        # Values without decimal comma and the uncoerced fields are kept as strings.
+        assert converted[29] == '100' and converted[34] == '1'
+        assert row[8] == '207,63'
+
+    def test_value_errors_match_field_by_field_conversion(self) -> None:
+        converter = _converter()
+        row = SMALL_LEXIQUE_ROWS[2].split('\t')
+        row[11], row[13] = 'x', ' 2 '
+        converted = converter.convert(row)
+        assert converted[11] == 'x' and converted[13] is False
+        row[13] = ' '
+        converted = converter.convert(row)
+        assert converted[13] == ''
+        assert converter.report.value_errors == [('manger', 'nbhomogr', 'x'), ('manger', 'nbhomogr', 'x'),
+                                                 ('manger', 'islem', '')]
+
+    def test_rejected_rows(self) -> None:
+        converter = _converter()
+        with pytest.raises(ValueError):
+            converter.convert(['tronque', 'tR§k'])
+        row = SMALL_LEXIQUE_ROWS[2].split('\t')
+        row[8] = '1,2,3'
+        with pytest.raises(ValueError):
+            converter.convert(row)
+        assert converter.report.length_errors == [['tronque', 'tR§k']]
+        assert converter.convert(row[:6] + [1.5] * 4 + SMALL_LEXIQUE_ROWS[2].split('\t')[10:] + ['extra'])[8] == 1.5
+
+    def test_strict(self) -> None:
+        row = SMALL_LEXIQUE_ROWS[2].split('\t')
+        row[11] = ''
+        with pytest.raises(LexiqueValidationError):
+            _converter('strict').convert(row)
@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the lazy imports of `pylexique`."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import pylexique
+
+_CHECK_SCRIPT = """
+import sys
+import pylexique
+eager = [module for module in ('pylexique.pylexique', 'pandas', 'pkg_resources') if module in sys.modules]
+from pylexique import Lexique383
+heavy = [module for module in ('pandas', 'numpy', 'pkg_resources') if module in sys.modules]
+print(','.join(eager) + ';' + ','.join(heavy))
+"""
+
+
+class TestImport:
+
+    def test_no_heavy_imports(self) -> None:
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.path.dirname(os.path.dirname(
+            pylexique.__file__)), os.environ.get('PYTHONPATH')])))
+        output = subprocess.run([sys.executable, '-c', _CHECK_SCRIPT], env=env, check=True, capture_output=True,
+                                text=True).stdout
+        assert output.strip() == ';'
+
+    def test_lazy_exports(self) -> None:
+        from pylexique.pylexique import Lexique383
+        assert pylexique.Lexique383 is Lexique383
+        assert set(pylexique.__all__) <= set(dir(pylexique))
+        assert pylexique._RESOURCE_PATH.endswith(os.path.join('Lexique383', 'Lexique383.txt'))
+        with pytest.raises(AttributeError):
+            pylexique.inexistant
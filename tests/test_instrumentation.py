@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the instrumentation of `pylexique`."""
+
+import gc
+import json
+import weakref
+
+from pylexique import Lexique383, Instrumentation
+from pylexique.instrumentation import LatencyHistogram
+
+
+class TestInstrumentation:
+
+    def test_load_phases(self, small_lexique_path: str, tmp_path) -> None:
+        published = {}
+        instrumentation = Instrumentation(on_phase=lambda name, stats: published.update({name: stats}))
+        lexicon = Lexique383(small_lexique_path, instrumentation=instrumentation,
+                             errors_path=str(tmp_path / 'errors.json'))
+        phases = instrumentation.phases
+        assert 'read' not in phases
+        for name in ('create_db', 'tokenize', 'convert', 'build', 'anagram_keys', 'index', 'save_errors'):
+            assert name in phases
+            assert phases[name].seconds >= 0
+        assert phases['tokenize'].rows == 23
+        assert phases['build'].rows == 22
+        assert phases['convert'].errors == 2
+        assert phases['create_db'].rows == len(lexicon)
+        assert phases['save_errors'].errors == 2
+        assert phases['create_db'].memory_delta is not None
+        # The file is read while the rows are tokenized.
+        assert phases['tokenize'].seconds > 0
+        assert published == phases
+        json.dumps(instrumentation.to_dict())
+
+    def test_lookup_latencies(self, small_lexique_path: str) -> None:
+        calls = []
+        instrumentation = Instrumentation(on_call=lambda method, seconds: calls.append(method), track_memory=False)
+        lexicon = Lexique383(small_lexique_path, instrumentation=instrumentation)
+        assert lexicon.get_lex('aimer')['aimer'].lemme == 'aimer'
+        lexicon.get_all_forms('mange')
+        lexicon.get_anagrams('aimer')
+        lexicon.get_anagrams('marie')
+        assert calls == ['get_lex', 'get_all_forms', 'get_anagrams', 'get_anagrams']
+        assert instrumentation.latencies['get_anagrams'].count == 2
+        assert instrumentation.phases['create_db'].memory_delta is None
+        # The wrappers stored on the instance do not keep it alive.
+        reference = weakref.ref(lexicon)
+        gc.disable()
+        try:
+            del lexicon
+            assert reference() is None
+        finally:
+            gc.enable()
+
+    def test_disabled(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        assert lexicon.instrumentation is None
+        assert 'get_lex' not in vars(lexicon)
+
+    def test_histogram(self) -> None:
+        histogram = LatencyHistogram()
+        for seconds in (1e-6, 2e-6, 3e-6, 1e-3):
+            histogram.record(seconds)
+        assert histogram.count == 4
+        assert histogram.min == 1e-6 and histogram.max == 1e-3
+        assert histogram.percentile(50) <= 4.1e-6
+        assert histogram.percentile(100) == 1e-3
+        assert sum(count for _, count in histogram.buckets()) == 4
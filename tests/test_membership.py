@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the membership filters of `pylexique`."""
+
+import os
+import pickle
+import random
+import string
+
+import pytest
+
+from pylexique import Lexique383
+from pylexique.membership import BloomFilter, PerfectHashSet, load_filter
+
+
+def _strings(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [''.join(rng.choice(string.ascii_lowercase + 'éèà') for _ in range(rng.randint(1, 12)))
+            for _ in range(count)]
+
+
+class TestMembership:
+
+    def test_perfect_hash_set(self, tmp_path: str) -> None:
+        keys = list(dict.fromkeys(_strings(5000)))
+        hash_set = PerfectHashSet(keys + keys[:10])
+        assert len(hash_set) == len(keys)
+        assert sorted(hash_set[key] for key in keys) == list(range(len(keys)))
+        assert all(key in hash_set for key in keys)
+        others = [other for other in _strings(20000, seed=1) if other not in set(keys)]
+        assert sum(other in hash_set for other in others) <= len(others) * 2 ** -16 * 10 + 1
+        assert hash_set.get('nothing at all', -1) in (-1, *range(len(keys)))
+        assert 3 not in hash_set
+        values = hash_set.arrange({key: len(key) for key in keys})
+        assert all(values[hash_set[key]] == len(key) for key in keys)
+        path = os.path.join(str(tmp_path), 'keys.bin')
+        hash_set.save(path)
+        for loaded in (PerfectHashSet.load(path), load_filter(path), pickle.loads(pickle.dumps(hash_set))):
+            assert isinstance(loaded, PerfectHashSet)
+            assert [loaded.get(key) for key in keys + others] == [hash_set.get(key) for key in keys + others]
+            assert loaded.nbytes == hash_set.nbytes < 4 * len(keys)
+        with pytest.raises(ValueError):
+            BloomFilter.load(path)
+        small = PerfectHashSet(keys[:100], fingerprint_bits=8)
+        assert sorted(small[key] for key in keys[:100]) == list(range(100))
+        empty = PerfectHashSet()
+        assert len(empty) == 0 and 'a' not in empty
+        with pytest.raises(KeyError):
+            empty['a']
+        with pytest.raises(ValueError):
+            PerfectHashSet(keys, fingerprint_bits=12)
+
+    def test_bloom_filter(self, tmp_path: str) -> None:
+        keys = _strings(5000)
+        bloom_filter = BloomFilter(keys, false_positive_rate=0.02)
+        assert all(key in bloom_filter for key in keys)
+        others = [other for other in _strings(20000, seed=1) if other not in set(keys)]
+        assert sum(other in bloom_filter for other in others) / len(others) < 0.03
+        assert bloom_filter.nbytes < 2 * len(set(keys))
+        path = os.path.join(str(tmp_path), 'keys.bin')
+        bloom_filter.save(path)
+        for loaded in (BloomFilter.load(path), load_filter(path), pickle.loads(pickle.dumps(bloom_filter))):
+            assert isinstance(loaded, BloomFilter)
+            assert [key in loaded for key in keys + others] == [key in bloom_filter for key in keys + others]
+        with pytest.raises(ValueError):
+            BloomFilter(keys, false_positive_rate=1.5)
+        with open(path, 'wb') as file:
+            file.write(b'not a filter at all')
+        with pytest.raises(ValueError):
+            load_filter(path)
+
+    def test_lexique(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        words = lexicon.to_membership_filter()
+        assert isinstance(words, PerfectHashSet)
+        assert len(words) == len(lexicon.lexique)
+        assert all(word in words for word in lexicon.lexique)
+        assert 'avoir' not in words
+        assert 'avoir' in lexicon.to_membership_filter(lemmas=True, kind='bloom')
+        with pytest.raises(ValueError):
+            lexicon.to_membership_filter(kind='xor')
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the derivational morphology index of `pylexique`."""
+
+import pytest
+
+from pylexique import Lexique383
+from pylexique.morphology import MorphologyIndex, segment_morphoder
+
+
+class TestMorphology:
+
+    def test_segment_morphoder(self) -> None:
+        assert segment_morphoder('{abaisser}{ment}') == ('abaisser', 'ment')
+        assert segment_morphoder('((abaiss)ement)') == ('abaiss', 'ement')
+        assert segment_morphoder('a posteriori') == ('a', 'posteriori')
+        assert segment_morphoder('') == ()
+        assert segment_morphoder(float('nan')) == ()
+
+    def test_queries(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        assert {item.ortho for item in lexicon.get_derivations('abaisser')} == {'abaisser', 'abaissement',
+                                                                                'rabaisser'}
+        assert {item.ortho for item in lexicon.get_affixed('ment')} == {'abaissement', 'changement', 'lentement'}
+        assert {item.ortho for item in lexicon.get_affixed('RE', position='prefix')} == {'rabaisser'}
+        assert lexicon.get_affixed('inconnu') == []
+        assert lexicon.get_derivations('inconnu') == []
+        with pytest.raises(ValueError):
+            lexicon.get_affixed('ment', position='infix')
+
+    def test_family(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        assert lexicon.get_morphological_family('manger') == {'manger', 'mangeable'}
+        # The inflected forms have the family of their lemma.
+        assert lexicon.get_morphological_family('mange') == {'manger', 'mangeable'}
+        assert lexicon.get_morphological_family('mangeons') == {'manger', 'mangeable'}
+        assert lexicon.get_morphological_family('lente') == lexicon.get_morphological_family('lent')
+        assert lexicon.get_morphological_family('lentement') == {'lent', 'lentement'}
+        assert len(lexicon.get_morphological_family('abaissement')) == 3
+        with pytest.raises(KeyError):
+            lexicon.get_morphological_family('inconnu')
+
+    def test_interning(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        index = lexicon.morphology
+        assert index is lexicon.morphology
+        assert isinstance(index, MorphologyIndex)
+        assert len(set(index.morphemes)) == len(index)
+        assert 'ment' in index and 'Ment' in index
+        assert index.segmentation(lexicon.lexique['lentement']) == ('lent', 'ment')
+        assert index.root(lexicon.lexique['lentement']) == 'lent'
+
+    def test_root(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        index = lexicon.morphology
+        assert index.root(lexicon.lexique['rabaisser']) == 'abaisser'
+        lation = lexicon.add_entry({'ortho': 'lation', 'lemme': 'lation', 'cgram': 'NOM', 'morphoder': '{la}{tion}'})
+        # Without any morpheme which is a word of the lexicon, the longest one is taken.
+        assert index.root(lation) == 'tion'
+        # The stem is a word of the lexicon, unlike the longer suffix.
+        la = lexicon.add_entry({'ortho': 'la', 'lemme': 'la', 'cgram': 'ART:def', 'morphoder': 'la'})
+        assert index.root(lation) == 'la'
+        assert lexicon.get_morphological_family('lation') == {'la', 'lation'}
+        # A suffix which is also a word is not taken as the root of a stem of the same length.
+        lexicon.add_entry({'ortho': 'ment', 'lemme': 'mentir', 'cgram': 'VER', 'morphoder': 'ment'})
+        assert index.root(lexicon.lexique['lentement']) == 'lent'
+        lexicon.remove_entries('la')
+        assert index.root(lation) == 'tion' and la not in index.derivations('la')
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the neighbourhood metrics of `pylexique`."""
+
+import math
+import random
+from typing import List
+
+import pytest
+
+from pylexique import Lexique383
+from pylexique.neighbourhood import NeighbourhoodIndex, levenshtein
+
+
+def _nearest(forms: List[str], query: str, n: int = 20) -> List[int]:
+    return sorted(distance for distance in (levenshtein(query, form) for form in set(forms)) if distance)[:n]
+
+
+def _random_forms(rng: random.Random, count: int, alphabet: str = 'abcde') -> List[str]:
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 9))) for _ in range(count)]
+
+
+class TestNeighbourhood:
+
+    def test_levenshtein(self) -> None:
+        assert levenshtein('chat', 'chien') == 3
+        assert levenshtein('', 'abc') == levenshtein('abc', '') == 3
+        assert levenshtein('maire', 'marie') == 2
+        assert levenshtein('manger', 'manger') == 0
+
+    def test_nearest_distances(self) -> None:
+        rng = random.Random(0)
+        forms = _random_forms(rng, 500)
+        index = NeighbourhoodIndex(forms + [''])
+        assert len(index) == len(set(forms))
+        queries = _random_forms(rng, 50, 'abcdef') + forms[:20] + ['', 'a' * 70, 'zzz']
+        for query in queries:
+            for n in (1, 20):
+                assert index.nearest_distances(query, n) == _nearest(forms, query, n), query
+            assert index.mean_distance(query, 5) == pytest.approx(sum(_nearest(forms, query, 5)) / 5)
+            neighbours = [form for form in set(forms) if len(form) == len(query) and levenshtein(form, query) == 1]
+            assert sorted(index.neighbours(query)) == sorted(neighbours)
+            assert index.neighbourhood_size(query) == len(neighbours)
+        small = NeighbourhoodIndex(['abc', 'abd'])
+        assert small.nearest_distances('abc') == [1]
+        assert math.isnan(NeighbourhoodIndex(['abc']).mean_distance('abc'))
+
+    def test_process_pool(self) -> None:
+        rng = random.Random(1)
+        index = NeighbourhoodIndex(_random_forms(rng, 300))
+        queries = _random_forms(rng, 300)
+        assert index.measure(queries, processes=2) == index.measure(queries)
+
+    def test_lexique_metrics(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        forms = list(lexicon.lexique)
+        phons = [item.phon for item in lexicon._iter_items()]
+        metrics = lexicon.get_neighbourhood_metrics(['Manger', 'marie', 'mangé'], phons=['m@Ze', 'maRi', 'm@Ze'], n=3)
+        assert [metric['old20'] for metric in metrics] == [
+            pytest.approx(sum(_nearest(forms, word, 3)) / 3) for word in ('manger', 'marie', 'mangé')]
+        assert [metric['pld20'] for metric in metrics] == [
+            pytest.approx(sum(_nearest(phons, phon, 3)) / 3) for phon in ('m@Ze', 'maRi', 'm@Ze')]
+        assert [metric['voisorth'] for metric in metrics] == [0, 0, 1]
+        assert lexicon.get_neighbours('mangé') == ['mange']
+        assert lexicon.get_neighbours('maRe', field='phon') == ['maRi']
+        assert set(lexicon.get_neighbourhood_metrics('lent')[0]) == {'old20', 'voisorth'}
+        with pytest.raises(ValueError):
+            lexicon.get_neighbourhood_metrics(['lent', 'lente'], phons=['l@'])
+        with pytest.raises(ValueError):
+            lexicon.neighbourhood('lemme')
+        lexicon.add_entry(dict(lexicon.lexique['mange'].to_dict(), ortho='mangé'))
+        assert lexicon.get_neighbours('mangé') == ['mange']
+        assert lexicon.get_neighbourhood_metrics('mangé', n=1)[0]['old20'] == 1
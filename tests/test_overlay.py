@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the incremental updates and the overlay lexicons of `pylexique`."""
+
+import gzip
+import json
+from collections import defaultdict
+
+import pytest
+
+from pylexique import Lexique383, QueryCache
+from pylexique.overlay import LayeredDict
+
+from .conftest import SMALL_LEXIQUE_ROWS
+
+
+class TestLayeredDict:
+
+    def test_copy_on_write(self) -> None:
+        base = {'a': 1, 'b': 2}
+        layer = LayeredDict(base)
+        layer['c'] = 3
+        layer['a'] = 10
+        del layer['b']
+        assert dict(layer) == {'a': 10, 'c': 3}
+        assert len(layer) == 2
+        assert 'b' not in layer and layer.get('b') is None
+        assert base == {'a': 1, 'b': 2}
+        with pytest.raises(KeyError):
+            layer['b']
+        with pytest.raises(KeyError):
+            del layer['b']
+        layer['b'] = 20
+        assert list(layer) == ['a', 'b', 'c']
+        lists = defaultdict(list, {'a': [1]})
+        with pytest.raises(KeyError):
+            LayeredDict(lists)['b']
+        assert dict(lists) == {'a': [1]}
+
+
+class TestOverlay:
+
+    def test_add_and_override(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        layer = lexicon.overlay()
+        assert layer.base is lexicon
+        added = layer.add_entry({'ortho': 'mangeur', 'lemme': 'mangeur', 'cgram': 'NOM', 'syll': 'm@-Z9R',
+                                 'cvcv': 'CVCCVVC', 'nbsyll': 2, 'morphoder': '{manger}{eur}'})
+        assert layer.lexique['mangeur'] is added
+        assert len(layer) == len(lexicon) + 1
+        assert 'mangeur' not in lexicon.lexique
+        corrected = layer.lexique['marie'].to_dict()
+        corrected['freqfilms2'] = 99.0
+        layer.add_entry(corrected)
+        assert layer.lexique['marie'].freqfilms2 == 99.0
+        assert lexicon.lexique['marie'].freqfilms2 == 23.4
+        assert [item.freqfilms2 for item in layer.get_anagrams('aimer') if item.ortho == 'marie'] == [99.0]
+        assert len(layer.lemmes['marie']) == 1
+
+    def test_remove_entries(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        layer = lexicon.overlay()
+        assert [item.cgram for item in layer.remove_entries('manger', cgram='NOM')] == ['NOM']
+        assert layer.lexique['manger'].cgram == 'VER'
+        assert len(lexicon.lexique['manger']) == 2
+        layer.remove_entries('ramie')
+        assert 'ramie' not in layer.lexique
+        assert {item.ortho for item in layer.get_anagrams('aimer')} == {'marie', 'maire'}
+        assert len(layer) == len(lexicon) - 1
+        with pytest.raises(KeyError):
+            layer.remove_entries('ramie')
+        with pytest.raises(ValueError):
+            layer.remove_entries('marie', inconnu=1)
+
+    def test_indexes_and_cache(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        layer = lexicon.overlay(cache=QueryCache())
+        assert len(layer.get_all_forms('chanter')) == 2
+        assert {item.ortho for item in layer.get_affixed('eur')} == {'chanteur'}
+        layer.add_entry({'ortho': 'chantons', 'lemme': 'chanter', 'cgram': 'VER', 'syll': 'S@-t§',
+                         'cv_cv': 'CV-CV', 'nbsyll': 2, 'morphoder': 'chanter'})
+        layer.add_entry({'ortho': 'mangeur', 'lemme': 'mangeur', 'cgram': 'NOM', 'morphoder': '{manger}{eur}'})
+        assert len(layer.get_all_forms('chanter')) == 3
+        assert {item.ortho for item in layer.get_affixed('eur')} == {'chanteur', 'mangeur'}
+        assert [item.ortho for item in layer.find_by_pattern(syll='S@-t§')] == ['chantons']
+        layer.remove_entries('chanteur')
+        assert {item.ortho for item in layer.get_affixed('eur')} == {'mangeur'}
+        assert len(lexicon.get_all_forms('chanter')) == 2
+        assert {item.ortho for item in lexicon.get_affixed('eur')} == {'chanteur'}
+
+    def test_base_changes(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        layer = lexicon.overlay(cache=QueryCache())
+        stacked = layer.overlay(cache=QueryCache())
+        for overlay in (layer, stacked):
+            assert len(overlay.get_all_forms('chanter')) == 2
+            assert {item.ortho for item in overlay.get_affixed('eur')} == {'chanteur'}
+            assert len(overlay.columns) == len(lexicon.columns)
+        lexicon.add_entry({'ortho': 'chantons', 'lemme': 'chanter', 'cgram': 'VER', 'nbsyll': 2,
+                           'morphoder': 'chanter'})
+        lexicon.add_entry({'ortho': 'mangeur', 'lemme': 'mangeur', 'cgram': 'NOM', 'morphoder': '{manger}{eur}'})
+        for overlay in (layer, stacked):
+            assert len(overlay.get_all_forms('chanter')) == 3
+            assert {item.ortho for item in overlay.get_affixed('eur')} == {'chanteur', 'mangeur'}
+            assert len(overlay.columns) == len(lexicon.columns)
+        lexicon.remove_entries('chanteur')
+        for overlay in (layer, stacked):
+            assert {item.ortho for item in overlay.get_affixed('eur')} == {'mangeur'}
+        assert 'inconnu' not in layer.lemmes and 'inconnu' not in lexicon.lemmes
+
+    def test_base_changes_shadowed(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        layer = lexicon.overlay(cache=QueryCache())
+        stacked = layer.overlay()
+        layer.add_entry({'ortho': 'chantons', 'lemme': 'chanter', 'cgram': 'VER'})
+        layer.add_entry({'ortho': 'ramei', 'lemme': 'ramei', 'cgram': 'NOM'})
+        morphology = layer.morphology
+        assert len(layer.get_all_forms('chanter')) == 3 and len(layer.get_anagrams('marie')) == 4
+        lexicon.add_entry({'ortho': 'chantez', 'lemme': 'chanter', 'cgram': 'VER', 'morphoder': 'chanter'})
+        lexicon.add_entry({'ortho': 'arime', 'lemme': 'arime', 'cgram': 'NOM'})
+        for overlay in (layer, stacked):
+            assert [item.ortho for item in overlay.get_all_forms('chantez')] == ['chanter', 'chante', 'chantons',
+                                                                                 'chantez']
+            anagrams = overlay.get_anagrams('marie')
+            assert [item.ortho for item in anagrams] == ['aimer', 'maire', 'ramie', 'ramei', 'arime']
+        assert layer.morphology is morphology
+        assert 'chantez' in {item.ortho for item in morphology.derivations('chanter')}
+        layer.add_entry({'ortho': 'lent', 'lemme': 'lent', 'cgram': 'ADJ', 'genre': 'm', 'nombre': 's',
+                         'freqfilms2': 1.0})
+        lexicon.remove_entries('lente')
+        for overlay in (layer, stacked):
+            assert [item.freqfilms2 for item in overlay.lemmes['lent']] == [1.0]
+        # A word changed by the overlay hides the entries the base adds for it.
+        lexicon.add_entry({'ortho': 'lent', 'lemme': 'lentir', 'cgram': 'VER'})
+        lexicon.add_entry({'ortho': 'chantons', 'lemme': 'chantonner', 'cgram': 'VER'})
+        for overlay in (layer, stacked):
+            assert [item.freqfilms2 for item in overlay.get_all_forms('lent')] == [1.0]
+            assert 'lentir' not in overlay.lemmes and 'chantonner' not in overlay.lemmes
+            assert len(overlay.get_all_forms('chantons')) == 4
+        assert 'lentir' in lexicon.lemmes and len(lexicon.get_all_forms('chantons')) == 1
+
+    def test_layer_files(self, small_lexique_path: str, tmp_path) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        tsv_path = tmp_path.joinpath('layer.tsv')
+        tsv_path.write_text('header\n' + SMALL_LEXIQUE_ROWS[12].replace('30,62', '1,5') + '\n', encoding='utf-8')
+        json_path = tmp_path.joinpath('layer.json')
+        json_path.write_text(json.dumps({'entries': [{'ortho': 'maïs', 'lemme': 'maïs', 'cgram': 'NOM'}],
+                                         'delete': [{'ortho': 'a', 'cgram': 'NOM'}, {'ortho': 'inconnu'}]}),
+                             encoding='utf-8')
+        first = lexicon.overlay(str(tsv_path))
+        second = first.overlay(str(json_path))
+        assert first.lexique['maire'].freqfilms2 == 1.5
+        assert second.lexique['maire'].freqfilms2 == 1.5
+        assert second.lexique['maïs'].cgram == 'NOM'
+        assert second.lexique['a'].cgram == 'AUX'
+        assert 'maïs' not in first.lexique and len(first.lexique['a']) == 2
+        # A tsv layer may be compressed and encoded like the lexique file.
+        compressed_path = tmp_path.joinpath('layer.tsv.gz')
+        compressed_path.write_bytes(gzip.compress(tsv_path.read_text(encoding='utf-8').encode('iso-8859-1')))
+        assert lexicon.overlay(str(compressed_path)).lexique['maire'].freqfilms2 == 1.5
+        bad_path = tmp_path.joinpath('bad.json')
+        bad_path.write_text(json.dumps({'entries': [{'lemme': 'sans ortho'}]}), encoding='utf-8')
+        with pytest.raises(ValueError):
+            lexicon.overlay(str(bad_path))
+
+    def test_in_place_update(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        forms = lexicon.get_all_forms('lent')
+        lexicon.add_entry({'ortho': 'lents', 'lemme': 'lent', 'cgram': 'ADJ', 'genre': 'm', 'nombre': 'p'})
+        assert len(lexicon.get_all_forms('lent')) == 3
+        assert len(forms) == 2
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the phonotactic pattern search of `pylexique`."""
+
+import types
+
+import pytest
+
+from pylexique import Lexique383
+from pylexique.patterns import compile_pattern, ipa_to_lexique
+
+
+class TestPatterns:
+
+    def test_compile_pattern(self) -> None:
+        assert compile_pattern('CV-*').fullmatch('CV-CCV')
+        assert not compile_pattern('CV-*').fullmatch('CV-CV-CV')
+        assert compile_pattern('CV-**').fullmatch('CV-CV-CV')
+        assert compile_pattern('?a-[RZ]e').fullmatch('ma-Ze')
+        assert not compile_pattern('?a-[RZ]e').fullmatch('ma-te')
+        assert compile_pattern('m@.') is compile_pattern('m@.')
+        assert not compile_pattern('m@.').fullmatch('m@Z')
+
+    def test_ipa_to_lexique(self) -> None:
+        assert ipa_to_lexique('*-ʁe') == '*-Re'
+        assert ipa_to_lexique('/ʃɑ̃/-t?') == 'S@-t?'
+
+    def test_find_by_pattern(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        results = lexicon.find_by_pattern(cvcv='CVCVV', syll='*-ʁi')
+        assert isinstance(results, types.GeneratorType)
+        assert [item.ortho for item in results] == ['marie']
+        assert {item.ortho for item in lexicon.find_by_pattern(cvcv='CVCVV')} == {'marie', 'ramie'}
+        assert [item.cgram for item in lexicon.find_by_pattern(syll='*-Ze', nbsyll=2)] == ['VER', 'NOM']
+        assert {item.ortho for item in lexicon.find_by_pattern(cv_cv='CV-CV')} == {
+            'manger', 'mangeons', 'marie', 'ramie', 'chanter'}
+        assert {item.ortho for item in lexicon.find_by_pattern(orthosyll='**-ment')} == {
+            'abaissement', 'changement', 'lentement'}
+        assert {item.ortho for item in lexicon.find_by_pattern(nbsyll=[3, 4])} == {
+            'abaisser', 'abaissement', 'rabaisser', 'changement', 'lentement'}
+        assert list(lexicon.find_by_pattern(p_cvcv='CVCV', nbsyll=3)) == []
+        assert list(lexicon.find_by_pattern(syll='inconnu')) == []
+
+    def test_invalid_queries(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        with pytest.raises(ValueError):
+            lexicon.find_by_pattern()
+        with pytest.raises(ValueError):
+            lexicon.phonotactics.search({'ortho': 'man*'})
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the pre-fork loading mode of `pylexique`."""
+
+import gc
+import json
+import os
+
+import pytest
+
+from pylexique import Lexique383
+from pylexique.prefork import deduplicate_values, memory_usage
+
+_HAS_SMAPS = os.path.exists('/proc/self/smaps')
+
+
+class TestPrefork:
+
+    def test_deduplicate_values(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        forms = lexicon.get_all_forms('manger')
+        assert forms[0].lemme is not forms[-1].lemme
+        assert deduplicate_values(lexicon._iter_items(), ('lemme',)) > 0
+        assert forms[0].lemme is forms[-1].lemme
+        assert deduplicate_values(lexicon._iter_items(), ('lemme',)) == 0
+
+    def test_prefork_load(self, small_lexique_path: str) -> None:
+        try:
+            lexicon = Lexique383(small_lexique_path, prefork=True)
+            assert gc.get_freeze_count() > 0
+        finally:
+            gc.unfreeze()
+        reference = Lexique383(small_lexique_path)
+        assert [item.to_dict() for item in lexicon._iter_items()] == [item.to_dict()
+                                                                      for item in reference._iter_items()]
+        forms = lexicon.get_all_forms('manger')
+        assert forms[0].lemme is forms[-1].lemme
+        assert lexicon.lexique['chanter'].cgramortho is lexicon.lexique['aimer'].cgramortho
+        assert reference.lexique['chanter'].cgramortho is not reference.lexique['aimer'].cgramortho
+
+    @pytest.mark.skipif(not _HAS_SMAPS or not hasattr(os, 'fork'), reason='requires fork and /proc/self/smaps')
+    def test_forked_worker(self, small_lexique_path: str) -> None:
+        assert set(memory_usage()) == {'rss', 'pss', 'shared', 'private', 'private_dirty', 'swap'}
+        lexicon = Lexique383(small_lexique_path)
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            try:
+                with os.fdopen(write_end, 'w') as pipe:
+                    json.dump({'forms': len(lexicon.get_all_forms('manger')), 'memory': memory_usage()}, pipe)
+            finally:
+                os._exit(0)
+        os.close(write_end)
+        with os.fdopen(read_end) as pipe:
+            report = json.load(pipe)
+        os.waitpid(pid, 0)
+        assert report['forms'] == 4
+        assert report['memory']['shared'] > 0
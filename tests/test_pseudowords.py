@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the sublexical statistics and the pseudoword generator of `pylexique`."""
+
+import json
+import os
+
+import pytest
+
+from pylexique import Lexique383
+from pylexique.pseudowords import PseudowordGenerator, SublexicalStatistics
+
+
+class TestPseudowords:
+
+    def test_statistics(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        statistics = lexicon.sublexical_statistics()
+        assert statistics is lexicon.sublexical_statistics()
+        distinct = set(lexicon.lexique)
+        assert statistics.letter_bigrams['an'] == sum('an' in form for form in distinct)
+        assert statistics.positional_letter_bigrams[0]['ma'] == sum(form.startswith('ma') for form in distinct)
+        assert statistics.phoneme_bigrams['@Z'] == 5
+        # 'manger' is counted once despite its two entries, and 'mangeable' has 3 orthographic syllables
+        # for 2 phonological syllables.
+        assert statistics.syllables['initial']['man\tm@'] == 2
+        assert statistics.syllables['final']['ger\tZe'] == 1
+        assert statistics.syllables['mono']['lent\tl@'] == 1
+        assert statistics.shapes[2, 5] == 3
+        assert statistics.bigram_frequency('ma') == statistics.letter_bigrams['ma']
+        assert statistics.bigram_frequency('mange') == pytest.approx(
+            sum(statistics.letter_bigrams[bigram] for bigram in ('ma', 'an', 'ng', 'ge')) / 4)
+        assert statistics.bigram_frequency('a') == 0.0
+        assert statistics.bigram_frequency('m@', phonological=True, positional=True) == 4
+
+    def test_generate(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        pseudowords = lexicon.generate_pseudowords(20, nbsyll=(2, 3), seed=0)
+        assert pseudowords == lexicon.generate_pseudowords(20, nbsyll=(2, 3), seed=0)
+        assert len({pseudoword.ortho for pseudoword in pseudowords}) == len(pseudowords) > 0
+        statistics = lexicon.sublexical_statistics()
+        for pseudoword in pseudowords:
+            assert pseudoword.ortho not in lexicon.lexique
+            assert pseudoword.orthosyll.replace('-', '') == pseudoword.ortho
+            assert pseudoword.syll.replace('-', '') == pseudoword.phon
+            assert pseudoword.nbsyll == pseudoword.syll.count('-') + 1 in (2, 3)
+            assert pseudoword.bigram_frequency == statistics.bigram_frequency(pseudoword.ortho)
+        constrained = lexicon.generate_pseudowords(5, length=(7, 9), bigram_frequency=(2, 100), seed=1)
+        assert constrained and all(7 <= len(pseudoword.ortho) <= 9 and pseudoword.bigram_frequency >= 2
+                                   for pseudoword in constrained)
+        homophones = {item.phon for item in lexicon._iter_items()}
+        assert all(pseudoword.phon not in homophones for pseudoword in
+                   lexicon.generate_pseudowords(10, reject_homophones=True, seed=2))
+        assert lexicon.generate_pseudowords(5, nbsyll=9) == []
+        generator = PseudowordGenerator(statistics, seed=3)
+        assert len(generator.generate(3, nbsyll=1, max_attempts=10)) <= 3
+        # The candidates are steered towards the band, so that few attempts are needed.
+        banded_generator = PseudowordGenerator(statistics, lexicon.lexique, seed=0)
+        banded = banded_generator.generate(20, bigram_frequency=(4, 6), max_attempts=200)
+        assert len(banded) == 20 and all(4 <= pseudoword.bigram_frequency <= 6 for pseudoword in banded)
+
+    def test_cache(self, small_lexique_path: str, tmp_path: str) -> None:
+        cache_path = os.path.join(str(tmp_path), 'statistics.json')
+        lexicon = Lexique383(small_lexique_path)
+        statistics = lexicon.sublexical_statistics(cache_path)
+        assert os.path.exists(cache_path)
+        loaded = SublexicalStatistics.load(cache_path)
+        assert loaded.to_dict() == json.loads(json.dumps(statistics.to_dict()))
+        assert Lexique383(small_lexique_path).sublexical_statistics(cache_path).fingerprint == statistics.fingerprint
+        # The memoized statistics are saved at a new cache path too.
+        other_path = os.path.join(str(tmp_path), 'other.json')
+        assert lexicon.sublexical_statistics(other_path) is statistics
+        assert SublexicalStatistics.load(other_path).fingerprint == statistics.fingerprint
+        lexicon.add_entry(dict(lexicon.lexique['mange'].to_dict(), ortho='mangez', phon='m@Ze', orthosyll='man-gez',
+                               syll='m@-Ze'))
+        updated = lexicon.sublexical_statistics(cache_path)
+        assert updated.fingerprint != statistics.fingerprint
+        assert updated.syllables['final']['gez\tZe'] == 1
+        assert SublexicalStatistics.load(cache_path).fingerprint == updated.fingerprint
+        with open(cache_path, 'w', encoding='utf-8') as file:
+            json.dump({'version': 0}, file)
+        with pytest.raises(ValueError):
+            SublexicalStatistics.load(cache_path)
+        assert Lexique383(small_lexique_path).sublexical_statistics(cache_path).fingerprint == statistics.fingerprint
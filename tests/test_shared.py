@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the shared memory lexicon of `pylexique`."""
+
+import multiprocessing
+import os
+import pickle
+import subprocess
+import sys
+from typing import List, Tuple
+
+import pytest
+
+from pylexique import Lexique383, SharedLexicon
+
+_HAS_FORK = 'fork' in multiprocessing.get_all_start_methods()
+
+
+def _count_forms(task: Tuple[SharedLexicon, str]) -> Tuple[int, List[str]]:
+    shared, word = task
+    return os.getpid(), sorted(item.cgram for item in shared.get_all_forms(word))
+
+
+class TestSharedLexicon:
+
+    def test_lookups(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        with lexicon.to_shared_memory() as shared:
+            assert shared.owner
+            assert len(shared) == len(lexicon.lexique)
+            assert shared.rows == sum(1 for _ in lexicon._iter_items())
+            assert set(shared) == set(lexicon.lexique)
+            assert 'manger' in shared and 'mangez' not in shared and 1 not in shared
+            for word in lexicon.lexique:
+                assert shared.get_lex(word) == lexicon.get_lex(word)
+                assert sorted(map(repr, shared.get_all_forms(word))) == sorted(map(repr,
+                                                                                   lexicon.get_all_forms(word)))
+                assert shared.get_anagrams(word) == lexicon.get_anagrams(word)
+            assert shared.get_lex(('Manger', 'a'))['a'] == lexicon.lexique['a']
+            assert [item.to_dict() for item in shared.items()] == [item.to_dict()
+                                                                   for item in lexicon._iter_items()]
+            with pytest.raises(KeyError):
+                shared.get_all_forms('mangez')
+            with pytest.raises(TypeError):
+                shared.get_lex(('manger', 1))
+
+    def test_pickles_as_name(self, small_lexique_path: str) -> None:
+        with Lexique383(small_lexique_path).to_shared_memory() as shared:
+            data = pickle.dumps(shared)
+            assert len(data) < 200
+            assert pickle.loads(data) is pickle.loads(data)
+            attached = pickle.loads(data)
+            assert not attached.owner and attached.name == shared.name
+            assert attached.get_anagrams('marie') == shared.get_anagrams('marie')
+            attached.close()
+            # The owner keeps the segment alive.
+            assert len(SharedLexicon.attach(shared.name)) == len(shared)
+        with pytest.raises(FileNotFoundError):
+            SharedLexicon.attach(shared.name)
+
+    @pytest.mark.skipif(not _HAS_FORK, reason='requires the fork start method')
+    def test_pool(self, small_lexique_path: str) -> None:
+        with Lexique383(small_lexique_path).to_shared_memory() as shared:
+            with multiprocessing.get_context('fork').Pool(2) as pool:
+                results = pool.map(_count_forms, [(shared, 'manger')] * 8, chunksize=1)
+            assert all(forms == ['NOM', 'VER', 'VER', 'VER'] for _, forms in results)
+            assert os.getpid() not in {pid for pid, _ in results}
+            # The workers detached without unlinking the segment.
+            assert SharedLexicon.attach(shared.name).get_all_forms('mange')
+
+    def test_unlinked_when_owner_exits(self, small_lexique_path: str) -> None:
+        script = ('import sys\nfrom pylexique import Lexique383\n'
+                  'shared = Lexique383(sys.argv[1]).to_shared_memory()\nprint(shared.name)\n')
+        name = subprocess.run([sys.executable, '-c', script, small_lexique_path], check=True, capture_output=True,
+                              text=True).stdout.strip()
+        assert name
+        with pytest.raises(FileNotFoundError):
+            SharedLexicon.attach(name)
+
+    def test_outlives_independent_process(self, small_lexique_path: str) -> None:
+        script = 'import sys\nfrom pylexique import SharedLexicon\nprint(len(SharedLexicon.attach(sys.argv[1])))\n'
+        with Lexique383(small_lexique_path).to_shared_memory() as shared:
+            output = subprocess.run([sys.executable, '-c', script, shared.name], check=True, capture_output=True,
+                                    text=True)
+            assert output.stdout.strip() == str(len(shared)) and not output.stderr
+            # The process did not unlink the segment it attached to when it exited.
+            assert SharedLexicon.attach(shared.name).get_all_forms('mange')
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the compressed and UTF-8 encoded sources of `pylexique`."""
+
+import bz2
+import gzip
+import logging
+import lzma
+import os
+import pathlib
+
+import pytest
+
+from pylexique import Lexique383
+from pylexique.sources import detect_compression, detect_encoding, open_lexique
+
+
+def _write(tmp_path: str, name: str, content: bytes) -> str:
+    path = os.path.join(str(tmp_path), name)
+    with open(path, 'wb') as file:
+        file.write(content)
+    return path
+
+
+class TestSources:
+
+    def test_formats(self, small_lexique_path: str, tmp_path: str, caplog: pytest.LogCaptureFixture) -> None:
+        with open(small_lexique_path, 'rb') as file:
+            raw = file.read()
+        text = raw.decode('iso-8859-1')
+        expected = Lexique383(small_lexique_path)
+        sources = {
+            'iso-8859-1': small_lexique_path,
+            'gzip': _write(tmp_path, 'Lexique.txt.gz', gzip.compress(raw)),
+            'bz2': _write(tmp_path, 'Lexique.txt.bz2', bz2.compress(raw)),
+            'xz': _write(tmp_path, 'Lexique.txt.xz', lzma.compress(raw)),
+            'utf-8': _write(tmp_path, 'Lexique_utf8.txt', text.encode('utf-8')),
+            'utf-8-sig': _write(tmp_path, 'Lexique_bom.txt', text.encode('utf-8-sig')),
+            'gzip utf-8': _write(tmp_path, 'Lexique_utf8', gzip.compress(text.encode('utf-8'))),
+        }
+        assert detect_compression(small_lexique_path) is None
+        assert detect_encoding(small_lexique_path) == 'iso-8859-1'
+        assert detect_compression(sources['xz']) == 'xz'
+        assert detect_compression(sources['gzip utf-8']) == 'gzip'
+        assert detect_encoding(sources['gzip utf-8']) == 'utf-8-sig'
+        assert detect_encoding(sources['utf-8-sig']) == 'utf-8-sig'
+        with open_lexique(sources['utf-8-sig']) as file:
+            assert file.readline().startswith('ortho\t')
+        for name, path in sources.items():
+            for parser_type in ('csv', 'pandas_csv'):
+                caplog.clear()
+                with caplog.at_level(logging.WARNING):
+                    lexicon = Lexique383(pathlib.Path(path), parser_type=parser_type)
+                # The pandas parser must not fall back on the csv parser.
+                assert not any('Trying again' in record.getMessage() for record in caplog.records), name
+                words = list(lexicon.lexique)
+                if parser_type == 'pandas_csv':
+                    # pandas pads the truncated row instead of reporting a length error.
+                    words = [word for word in words if word in expected.lexique]
+                assert words == list(expected.lexique), (name, parser_type)
+                assert all(lexicon.lexique[word] == item for word, item in expected.lexique.items())
+
+    def test_zstd(self, small_lexique_path: str, tmp_path: str) -> None:
+        # The zstd frame is only recognized by its magic number here.
+        path = _write(tmp_path, 'Lexique.txt.zst', b'\x28\xb5\x2f\xfd' + b'\x00' * 8)
+        assert detect_compression(path) == 'zstd'
+        zstandard = pytest.importorskip('zstandard')
+        with open(small_lexique_path, 'rb') as file:
+            path = _write(tmp_path, 'Lexique.txt.zst', zstandard.ZstdCompressor().compress(file.read()))
+        assert list(Lexique383(path).lexique) == list(Lexique383(small_lexique_path).lexique)
+
+    def test_zstd_missing(self, tmp_path: str) -> None:
+        try:
+            from compression import zstd  # noqa: F401
+            pytest.skip('compression.zstd is available')
+        except ImportError:
+            pass
+        try:
+            import zstandard  # noqa: F401
+            pytest.skip('zstandard is installed')
+        except ImportError:
+            pass
+        path = _write(tmp_path, 'Lexique.txt.zst', b'\x28\xb5\x2f\xfd' + b'\x00' * 8)
+        with pytest.raises(ImportError, match='zstandard'):
+            Lexique383(path)
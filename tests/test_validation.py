@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the validation modes of `pylexique`."""
+
+import json
+import os
+
+import pytest
+
+import pylexique
+from pylexique import Lexique383, LexiqueValidationError, ValidationReport
+
+
+class TestValidation:
+
+    def test_default_counts_errors(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path)
+        report = lexicon.validation_report
+        assert report.mode == 'count'
+        assert (report.value_error_count, report.length_error_count) == (1, 1)
+        assert report.value_errors == [] and report.length_errors == []
+        assert not os.path.exists(os.path.join(os.path.dirname(pylexique.__file__), 'errors'))
+
+    def test_off(self, small_lexique_path: str) -> None:
+        lexicon = Lexique383(small_lexique_path, validation='off')
+        assert not lexicon.validation_report
+        assert lexicon.lexique['bizarre'].islem == ''
+        assert 'tronque' not in lexicon.lexique
+
+    def test_collect(self, small_lexique_path: str, tmp_path) -> None:
+        errors_path = str(tmp_path / 'errors.json')
+        lexicon = Lexique383(small_lexique_path, validation='collect', errors_path=errors_path)
+        assert lexicon.value_errors == [('bizarre', 'islem', '')]
+        assert lexicon.length_errors == [['tronque', 'tR§k', 'tronquer']]
+        with open(errors_path, encoding='utf-8') as file:
+            saved = json.load(file)
+        assert saved['value_errors'] == [['bizarre', 'islem', '']]
+        assert saved['length_error_count'] == 1
+
+    def test_strict(self, small_lexique_path: str) -> None:
+        with pytest.raises(LexiqueValidationError, match='bizarre'):
+            Lexique383(small_lexique_path, validation='strict')
+
+    def test_invalid_mode(self, small_lexique_path: str) -> None:
+        with pytest.raises(ValueError):
+            Lexique383(small_lexique_path, validation='loud')
+        with pytest.raises(ValueError):
+            ValidationReport('loud')